@@ -23,7 +23,14 @@ executables = [
         base=base,
         icon="src/data/img/ea_icon.ico",
         target_name=target_name,
-    )
+    ),
+    Executable(
+        "src/cli.py",
+        copyright="Copyright (C) 2024-2026 Bartlomiej Duda",
+        base=None,  # console application
+        icon="src/data/img/ea_icon.ico",
+        target_name="ea-gfx.exe" if sys.platform == "win32" else "ea-gfx",
+    ),
 ]
 
 build_exe_options: dict = {
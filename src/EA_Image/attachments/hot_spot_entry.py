@@ -3,11 +3,13 @@ from src.EA_Image.constants import (
     NEW_SHAPE_ALLOWED_SIGNATURES,
     OLD_SHAPE_ALLOWED_SIGNATURES,
 )
-from src.EA_Image.data_read import get_uint8, get_uint24, get_uint32
+from src.EA_Image.data_read import get_struct_layouts, read_struct, split_uint8_uint24
 
 
 class HotSpotEntry(BinAttachmentEntry):
     header_size = 0
+    old_shape_header_layouts: dict = get_struct_layouts("2I")
+    new_shape_header_layouts: dict = get_struct_layouts("8I")
 
     def __init__(self, in_id, in_offset):
         super().__init__(in_id, in_offset)
@@ -20,18 +22,19 @@ class HotSpotEntry(BinAttachmentEntry):
 
     def set_entry_header(self, in_file, endianess, ea_image_sign: str):
         if ea_image_sign in OLD_SHAPE_ALLOWED_SIGNATURES:
-            self.h_record_id = get_uint8(in_file, endianess)
-            self.h_size_of_the_block = get_uint24(in_file, endianess)
-            self.num_of_pairs = get_uint32(in_file, endianess)
+            record_id_and_size, self.num_of_pairs = read_struct(in_file, self.old_shape_header_layouts, endianess)
+            self.h_record_id, self.h_size_of_the_block = split_uint8_uint24(record_id_and_size, endianess)
             self.header_size = 8
         elif ea_image_sign in NEW_SHAPE_ALLOWED_SIGNATURES:
-            self.h_record_id = get_uint8(in_file, endianess)
-            self.new_shape_flags = get_uint24(in_file, endianess)
-            self.h_size_of_the_block = get_uint32(in_file, endianess)
-            self.new_shape_data_offset = get_uint32(in_file, endianess)
-            self.new_shape_data_size = get_uint32(in_file, endianess)
-            self.new_shape_center_x = get_uint32(in_file, endianess)
-            self.new_shape_center_y = get_uint32(in_file, endianess)
-            self.new_shape_dimension = get_uint32(in_file, endianess)
-            self.num_of_pairs = get_uint32(in_file, endianess)
+            (
+                record_id_and_flags,
+                self.h_size_of_the_block,
+                self.new_shape_data_offset,
+                self.new_shape_data_size,
+                self.new_shape_center_x,
+                self.new_shape_center_y,
+                self.new_shape_dimension,
+                self.num_of_pairs,
+            ) = read_struct(in_file, self.new_shape_header_layouts, endianess)
+            self.h_record_id, self.new_shape_flags = split_uint8_uint24(record_id_and_flags, endianess)
             self.header_size = 32
@@ -3,23 +3,27 @@ from src.EA_Image.constants import (
     NEW_SHAPE_ALLOWED_SIGNATURES,
     OLD_SHAPE_ALLOWED_SIGNATURES,
 )
-from src.EA_Image.data_read import get_uint8, get_uint24, get_uint32
+from src.EA_Image.data_read import get_struct_layouts, read_struct, split_uint8_uint24
 
 
 class ImgNameEntry(BinAttachmentEntry):
     header_size = 0
+    old_shape_header_layouts: dict = get_struct_layouts("I")
+    new_shape_header_layouts: dict = get_struct_layouts("4I")
     new_shape_data_offset = None
     new_shape_data_size = None
 
     def set_entry_header(self, in_file, endianess, ea_image_sign: str):
         if ea_image_sign in OLD_SHAPE_ALLOWED_SIGNATURES:
-            self.h_record_id = get_uint8(in_file, endianess)
-            self.h_size_of_the_block = get_uint24(in_file, endianess)
+            (record_id_and_size,) = read_struct(in_file, self.old_shape_header_layouts, endianess)
+            self.h_record_id, self.h_size_of_the_block = split_uint8_uint24(record_id_and_size, endianess)
             self.header_size = 4
         elif ea_image_sign in NEW_SHAPE_ALLOWED_SIGNATURES:
-            self.h_record_id = get_uint8(in_file, endianess)
-            self.new_shape_flags = get_uint24(in_file, endianess)
-            self.h_size_of_the_block = get_uint32(in_file, endianess)
-            self.new_shape_data_offset = get_uint32(in_file, endianess)
-            self.new_shape_data_size = get_uint32(in_file, endianess)
+            (
+                record_id_and_flags,
+                self.h_size_of_the_block,
+                self.new_shape_data_offset,
+                self.new_shape_data_size,
+            ) = read_struct(in_file, self.new_shape_header_layouts, endianess)
+            self.h_record_id, self.new_shape_flags = split_uint8_uint24(record_id_and_flags, endianess)
             self.header_size = 16
@@ -3,17 +3,13 @@ from src.EA_Image.constants import (
     NEW_SHAPE_ALLOWED_SIGNATURES,
     OLD_SHAPE_ALLOWED_SIGNATURES,
 )
-from src.EA_Image.data_read import (
-    get_uint8,
-    get_uint16,
-    get_uint24,
-    get_uint32,
-    get_uint64,
-)
+from src.EA_Image.data_read import get_struct_layouts, read_struct, split_uint8_uint24
 
 
 class MetalBinEntry(BinAttachmentEntry):
     header_size = 8
+    old_shape_header_layouts: dict = get_struct_layouts("IHHQ")
+    new_shape_header_layouts: dict = get_struct_layouts("4I")
     new_shape_data_offset = None
     new_shape_data_size = None
 
@@ -25,16 +21,20 @@ class MetalBinEntry(BinAttachmentEntry):
 
     def set_entry_header(self, in_file, endianess, ea_image_sign: str):
         if ea_image_sign in OLD_SHAPE_ALLOWED_SIGNATURES:
-            self.h_record_id = get_uint8(in_file, endianess)
-            self.h_size_of_the_block = get_uint24(in_file, endianess)
-            self.h_data_size = get_uint16(in_file, endianess)
-            self.h_flags = get_uint16(in_file, endianess)
-            self.h_unknown = get_uint64(in_file, endianess)
+            (
+                record_id_and_size,
+                self.h_data_size,
+                self.h_flags,
+                self.h_unknown,
+            ) = read_struct(in_file, self.old_shape_header_layouts, endianess)
+            self.h_record_id, self.h_size_of_the_block = split_uint8_uint24(record_id_and_size, endianess)
             self.header_size = 16
         elif ea_image_sign in NEW_SHAPE_ALLOWED_SIGNATURES:
-            self.h_record_id = get_uint8(in_file, endianess)
-            self.new_shape_flags = get_uint24(in_file, endianess)
-            self.h_size_of_the_block = get_uint32(in_file, endianess)
-            self.new_shape_data_offset = get_uint32(in_file, endianess)
-            self.new_shape_data_size = get_uint32(in_file, endianess)
+            (
+                record_id_and_flags,
+                self.h_size_of_the_block,
+                self.new_shape_data_offset,
+                self.new_shape_data_size,
+            ) = read_struct(in_file, self.new_shape_header_layouts, endianess)
+            self.h_record_id, self.new_shape_flags = split_uint8_uint24(record_id_and_flags, endianess)
             self.header_size = 16
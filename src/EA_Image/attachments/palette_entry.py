@@ -3,11 +3,13 @@ from src.EA_Image.constants import (
     NEW_SHAPE_ALLOWED_SIGNATURES,
     OLD_SHAPE_ALLOWED_SIGNATURES,
 )
-from src.EA_Image.data_read import get_uint8, get_uint16, get_uint24, get_uint32
+from src.EA_Image.data_read import get_struct_layouts, read_struct, split_uint8_uint24
 
 
 class PaletteEntry(BinAttachmentEntry):
     header_size = 0
+    old_shape_header_layouts: dict = get_struct_layouts("I6H")
+    new_shape_header_layouts: dict = get_struct_layouts("8I")
 
     def __init__(self, in_id, in_offset):
         super().__init__(in_id, in_offset)
@@ -20,23 +22,27 @@ class PaletteEntry(BinAttachmentEntry):
 
     def set_entry_header(self, in_file, endianess, ea_image_sign: str):
         if ea_image_sign in OLD_SHAPE_ALLOWED_SIGNATURES:
-            self.h_record_id = get_uint8(in_file, endianess)
-            self.h_size_of_the_block = get_uint24(in_file, endianess)
-            self.h_width = get_uint16(in_file, endianess)
-            self.h_height = get_uint16(in_file, endianess)
-            self.h_center_x = get_uint16(in_file, endianess)
-            self.h_center_y = get_uint16(in_file, endianess)
-            self.h_default_x_position = get_uint16(in_file, endianess)  # shape X
-            self.h_default_y_position = get_uint16(in_file, endianess)  # shape Y
+            (
+                record_id_and_size,
+                self.h_width,
+                self.h_height,
+                self.h_center_x,
+                self.h_center_y,
+                self.h_default_x_position,  # shape X
+                self.h_default_y_position,  # shape Y
+            ) = read_struct(in_file, self.old_shape_header_layouts, endianess)
+            self.h_record_id, self.h_size_of_the_block = split_uint8_uint24(record_id_and_size, endianess)
             self.header_size = 16
         elif ea_image_sign in NEW_SHAPE_ALLOWED_SIGNATURES:
-            self.h_record_id = get_uint8(in_file, endianess)
-            self.new_shape_flags = get_uint24(in_file, endianess)
-            self.h_size_of_the_block = get_uint32(in_file, endianess)
-            self.new_shape_palette_offset = get_uint32(in_file, endianess)
-            self.new_shape_palette_data_size = get_uint32(in_file, endianess)
-            self.new_shape_reserved1 = get_uint32(in_file, endianess)
-            self.new_shape_reserved2 = get_uint32(in_file, endianess)
-            self.h_width = get_uint32(in_file, endianess)
-            self.h_height = get_uint32(in_file, endianess)
+            (
+                record_id_and_flags,
+                self.h_size_of_the_block,
+                self.new_shape_palette_offset,
+                self.new_shape_palette_data_size,
+                self.new_shape_reserved1,
+                self.new_shape_reserved2,
+                self.h_width,
+                self.h_height,
+            ) = read_struct(in_file, self.new_shape_header_layouts, endianess)
+            self.h_record_id, self.new_shape_flags = split_uint8_uint24(record_id_and_flags, endianess)
             self.header_size = 32
@@ -0,0 +1,172 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from reversebox.common.logger import get_logger
+from reversebox.image.pillow_wrapper import PillowWrapper
+
+from src.EA_Image.common import get_safe_file_name
+from src.EA_Image.constants import IMPORT_IMAGES_SUPPORTED_TYPES
+from src.EA_Image.dir_entry import DirEntry
+from src.EA_Image.dto import EncodeJobDTO, EncodeOptionsDTO, ImportResultDTO
+from src.EA_Image.ea_image_encoder import (
+    apply_encode_info,
+    encode_ea_image_job,
+    get_encode_job,
+)
+from src.EA_Image.ea_image_main import EAImage
+
+logger = get_logger(__name__)
+
+BATCH_IMPORT_FILE_EXTENSIONS: Tuple[str, ...] = (".dds", ".png", ".bmp")
+
+
+def get_import_mapping_from_directory(ea_img: EAImage, directory_path: str) -> List[Tuple[DirEntry, str]]:
+    """
+    Maps image files from directory to dir entries.
+    File names can be the same as the names of exported files ("<file_name>_<entry_number>_<tag>.png")
+    or just the tag of the entry (e.g. "img0.png"). Tags are matched case-insensitively.
+    """
+    exported_file_names: Dict[str, DirEntry] = {}
+    tag_file_names: Dict[str, List[DirEntry]] = {}
+    for entry_number, ea_dir in enumerate(ea_img.dir_entry_list):
+        exported_file_names[f"{ea_img.f_name}_{entry_number + 1}_{get_safe_file_name(ea_dir.tag)}".lower()] = ea_dir
+        tag_file_names.setdefault(get_safe_file_name(ea_dir.tag).lower(), []).append(ea_dir)
+
+    import_mapping: List[Tuple[DirEntry, str]] = []
+    mapped_entries: set = set()
+    for file_name in sorted(os.listdir(directory_path)):
+        file_path: str = os.path.join(directory_path, file_name)
+        file_stem, file_extension = os.path.splitext(file_name)
+        if file_extension.lower() not in BATCH_IMPORT_FILE_EXTENSIONS or not os.path.isfile(file_path):
+            continue
+
+        ea_dir: Optional[DirEntry] = exported_file_names.get(file_stem.lower())
+        if ea_dir is None:
+            # entries with duplicated tags are mapped in order
+            ea_dir = next(
+                (
+                    tag_entry
+                    for tag_entry in tag_file_names.get(file_stem.lower(), [])
+                    if tag_entry not in mapped_entries
+                ),
+                None,
+            )
+        if ea_dir is None:
+            logger.warning(f'No entry found for file "{file_name}"! Skipping!')
+            continue
+        if ea_dir in mapped_entries:
+            logger.warning(f'Entry "{ea_dir.tag}" already mapped! Skipping file "{file_name}"!')
+            continue
+
+        mapped_entries.add(ea_dir)
+        import_mapping.append((ea_dir, file_path))
+    return import_mapping
+
+
+def get_import_mapping_from_manifest(ea_img: EAImage, manifest_file_path: str) -> List[Tuple[DirEntry, str]]:
+    """
+    Maps image files to dir entries using JSON manifest, e.g. {"img0": "textures/img0.png"}.
+    Relative paths are resolved from the directory of the manifest.
+    """
+    with open(manifest_file_path, "rt", encoding="utf8") as manifest_file:
+        manifest: dict = json.load(manifest_file)
+    if not isinstance(manifest, dict):
+        raise Exception("Manifest should be a JSON object with entry tags and image paths!")
+
+    entries_by_tag: Dict[str, DirEntry] = {}
+    for ea_dir in ea_img.dir_entry_list:
+        entries_by_tag.setdefault(ea_dir.tag, ea_dir)
+
+    manifest_directory_path: str = os.path.dirname(os.path.abspath(manifest_file_path))
+    import_mapping: List[Tuple[DirEntry, str]] = []
+    for tag, image_file_path in manifest.items():
+        ea_dir: Optional[DirEntry] = entries_by_tag.get(tag)
+        if ea_dir is None:
+            logger.warning(f'No entry with tag "{tag}" in file "{ea_img.f_name}"! Skipping!')
+            continue
+        import_mapping.append((ea_dir, os.path.join(manifest_directory_path, image_file_path)))
+    return import_mapping
+
+
+def encode_image_file(image_file_path: str, encode_job: EncodeJobDTO) -> tuple:
+    """
+    Reads and encodes one image file.
+    Runs in worker process, so it returns plain tuple (encode_info_dto, error_message)
+    and never raises.
+    """
+    try:
+        rgba8888_data: bytes = PillowWrapper().get_pil_rgba_data_for_import(image_file_path)
+        if not rgba8888_data:
+            return None, "Can't read image file!"
+        image_size: int = encode_job.img_width * encode_job.img_height * 4
+        if len(rgba8888_data) != image_size:
+            return None, f"Wrong image size! Expected {encode_job.img_width}x{encode_job.img_height}."
+        return encode_ea_image_job(rgba8888_data, encode_job), ""
+    except Exception as error:
+        return None, str(error)
+
+
+def import_images(
+    ea_img: EAImage,
+    import_mapping: List[Tuple[DirEntry, str]],
+    encode_options: Optional[EncodeOptionsDTO] = None,
+    max_workers: int = 1,
+) -> List[ImportResultDTO]:
+    """
+    Encodes many images and replaces data of the mapped dir entries.
+    Images are encoded in worker processes if max_workers is bigger than 1.
+    Results are applied only after all images are encoded, so the file is never left half-imported
+    when encoding fails unexpectedly. Failed entries are reported and don't stop the batch.
+    """
+    encode_options = encode_options or EncodeOptionsDTO()
+    # results are returned in the same order as entries in import mapping
+    import_results: List[Optional[ImportResultDTO]] = [None] * len(import_mapping)
+    pending_indexes: List[int] = []
+    image_file_paths: List[str] = []
+    encode_jobs: List[EncodeJobDTO] = []
+    for mapping_index, (ea_dir, image_file_path) in enumerate(import_mapping):
+        if ea_dir.h_record_id not in IMPORT_IMAGES_SUPPORTED_TYPES:
+            import_results[mapping_index] = ImportResultDTO(
+                ea_dir.id,
+                ea_dir.tag,
+                image_file_path,
+                False,
+                f"Image type {ea_dir.h_record_id} is not supported for IMPORT!",
+            )
+            continue
+        pending_indexes.append(mapping_index)
+        image_file_paths.append(image_file_path)
+        encode_jobs.append(get_encode_job(ea_dir, ea_img, encode_options))
+
+    logger.info(f"Starting batch import of {len(encode_jobs)} images, max_workers={max_workers}...")
+    if max_workers > 1 and len(encode_jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(encode_jobs))) as executor:
+            encode_results: list = list(executor.map(encode_image_file, image_file_paths, encode_jobs))
+    else:
+        encode_results = list(map(encode_image_file, image_file_paths, encode_jobs))
+
+    for mapping_index, (encode_info_dto, error_message) in zip(pending_indexes, encode_results):
+        ea_dir, image_file_path = import_mapping[mapping_index]
+        if encode_info_dto is not None:
+            try:
+                apply_encode_info(ea_dir, ea_img, encode_info_dto, encode_options.allow_data_growth)
+            except Exception as error:
+                encode_info_dto, error_message = None, str(error)
+        if encode_info_dto is None:
+            logger.error(f'Failed to import image "{image_file_path}" to entry "{ea_dir.tag}"! Error: {error_message}')
+        import_results[mapping_index] = ImportResultDTO(
+            ea_dir.id, ea_dir.tag, image_file_path, encode_info_dto is not None, error_message
+        )
+
+    logger.info(
+        f"Finished batch import. Imported: {sum(result.is_imported for result in import_results)}, "
+        f"failed: {sum(not result.is_imported for result in import_results)}"
+    )
+    return import_results
@@ -0,0 +1,290 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import PIL.Image
+from reversebox.common.logger import get_logger
+from reversebox.image.image_formats import ImageFormats
+
+from src.EA_Image.constants import BC_ENCODE_BATCH_SIZE, DEFAULT_BC_ENCODE_PRESET
+from src.EA_Image.mipmaps import generate_mipmap_pyramid, get_mipmap_sizes
+
+logger = get_logger(__name__)
+
+BC_ENCODE_SUPPORTED_FORMATS: Tuple[ImageFormats, ...] = (
+    ImageFormats.BC1_DXT1,
+    ImageFormats.BC2_DXT3,
+    ImageFormats.BC3_DXT5,
+)
+
+# quality presets: (endpoints from principal axis instead of bounding box, number of least squares refinements)
+bc_encode_presets: Dict[str, Tuple[bool, int]] = {
+    "fast": (False, 0),
+    "normal": (True, 0),
+    "best": (True, 2),
+}
+
+# DXT color index -> weight of the second endpoint (4-color mode and 3-color mode)
+FOUR_COLOR_WEIGHTS: np.ndarray = np.array([0.0, 1.0, 1.0 / 3.0, 2.0 / 3.0], dtype=np.float32)
+THREE_COLOR_WEIGHTS: np.ndarray = np.array([0.0, 1.0, 0.5], dtype=np.float32)
+
+
+def get_bc_image_data_size(img_width: int, img_height: int, image_format: ImageFormats) -> int:
+    block_size: int = 8 if image_format == ImageFormats.BC1_DXT1 else 16
+    return max(1, (img_width + 3) // 4) * max(1, (img_height + 3) // 4) * block_size
+
+
+def get_pixel_blocks(rgba8888_data: bytes, img_width: int, img_height: int) -> np.ndarray:
+    """
+    Splits image into 4x4 blocks (edge pixels are repeated for sizes not divisible by 4).
+    Returns array of shape (blocks_count, 16, 4).
+    """
+    pixels: np.ndarray = np.frombuffer(rgba8888_data, dtype=np.uint8).reshape(img_height, img_width, 4)
+    blocks_x: int = max(1, (img_width + 3) // 4)
+    blocks_y: int = max(1, (img_height + 3) // 4)
+    pixels = np.pad(pixels, ((0, blocks_y * 4 - img_height), (0, blocks_x * 4 - img_width), (0, 0)), mode="edge")
+    return pixels.reshape(blocks_y, 4, blocks_x, 4, 4).transpose(0, 2, 1, 3, 4).reshape(-1, 16, 4)
+
+
+def _quantize_rgb565(colors: np.ndarray) -> np.ndarray:
+    red: np.ndarray = np.clip(np.rint(colors[..., 0] * (31 / 255)), 0, 31).astype(np.uint32)
+    green: np.ndarray = np.clip(np.rint(colors[..., 1] * (63 / 255)), 0, 63).astype(np.uint32)
+    blue: np.ndarray = np.clip(np.rint(colors[..., 2] * (31 / 255)), 0, 31).astype(np.uint32)
+    return (red << 11) | (green << 5) | blue
+
+
+def _expand_rgb565(values: np.ndarray) -> np.ndarray:
+    red: np.ndarray = (values >> 11) & 0x1F
+    green: np.ndarray = (values >> 5) & 0x3F
+    blue: np.ndarray = values & 0x1F
+    return np.stack([(red << 3) | (red >> 2), (green << 2) | (green >> 4), (blue << 3) | (blue >> 2)], axis=-1).astype(
+        np.float32
+    )
+
+
+def _get_initial_endpoints(colors: np.ndarray, weights: np.ndarray, use_principal_axis: bool) -> tuple:
+    # only pixels with weight > 0 are used for fitting (transparent pixels are skipped in BC1)
+    big_value: float = 1e9
+    mask: np.ndarray = weights[..., None] > 0
+    min_colors: np.ndarray = np.where(mask, colors, big_value).min(axis=1)
+    max_colors: np.ndarray = np.where(mask, colors, -big_value).max(axis=1)
+    weight_sums: np.ndarray = np.maximum(weights.sum(axis=1), 1e-6)[:, None]
+    mean_colors: np.ndarray = (colors * weights[..., None]).sum(axis=1) / weight_sums
+    centered_colors: np.ndarray = (colors - mean_colors[:, None, :]) * mask
+    covariances: np.ndarray = np.einsum("nki,nkj->nij", centered_colors * weights[..., None], centered_colors)
+    if not use_principal_axis:
+        # bounding box diagonal, channels inversely correlated with the widest channel are flipped
+        widest_channels: np.ndarray = (max_colors - min_colors).argmax(axis=1)
+        is_flipped: np.ndarray = np.take_along_axis(covariances, widest_channels[:, None, None], axis=1)[:, 0] < 0
+        first_colors: np.ndarray = np.where(is_flipped, min_colors, max_colors)
+        second_colors: np.ndarray = np.where(is_flipped, max_colors, min_colors)
+        inset: np.ndarray = (first_colors - second_colors) / 16
+        return first_colors - inset, second_colors + inset
+
+    # principal axis by power iteration, starting from bounding box diagonal
+    axes: np.ndarray = max_colors - min_colors + 1e-3
+    for _ in range(4):
+        axes = np.einsum("nij,nj->ni", covariances, axes)
+        axes /= np.maximum(np.linalg.norm(axes, axis=1, keepdims=True), 1e-12)
+
+    projections: np.ndarray = np.einsum("nki,ni->nk", centered_colors, axes)
+    min_projections: np.ndarray = np.where(mask[..., 0], projections, big_value).min(axis=1)
+    max_projections: np.ndarray = np.where(mask[..., 0], projections, -big_value).max(axis=1)
+    inset_projections: np.ndarray = (max_projections - min_projections) / 16
+    max_projections -= inset_projections
+    min_projections += inset_projections
+    return (
+        np.clip(mean_colors + axes * max_projections[:, None], 0, 255),
+        np.clip(mean_colors + axes * min_projections[:, None], 0, 255),
+    )
+
+
+def _get_color_palettes(first_colors: np.ndarray, second_colors: np.ndarray, index_weights: np.ndarray) -> np.ndarray:
+    return first_colors[:, None, :] + (second_colors - first_colors)[:, None, :] * index_weights[None, :, None]
+
+
+def _get_nearest_indices(colors: np.ndarray, palettes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    distances: np.ndarray = ((colors[:, :, None, :] - palettes[:, None, :, :]) ** 2).sum(axis=-1)
+    indices: np.ndarray = distances.argmin(axis=2)
+    return indices, np.take_along_axis(distances, indices[..., None], axis=2)[..., 0]
+
+
+def _refine_endpoints(colors: np.ndarray, weights: np.ndarray, index_weights: np.ndarray, indices: np.ndarray) -> tuple:
+    # least squares fit of both endpoints for the current indices
+    second_weights: np.ndarray = index_weights[indices] * (weights > 0)
+    first_weights: np.ndarray = (1.0 - index_weights[indices]) * (weights > 0)
+    aa: np.ndarray = (first_weights * first_weights).sum(axis=1)
+    bb: np.ndarray = (second_weights * second_weights).sum(axis=1)
+    ab: np.ndarray = (first_weights * second_weights).sum(axis=1)
+    ax: np.ndarray = (first_weights[..., None] * colors).sum(axis=1)
+    bx: np.ndarray = (second_weights[..., None] * colors).sum(axis=1)
+    determinants: np.ndarray = aa * bb - ab * ab
+    is_solvable: np.ndarray = np.abs(determinants) > 1e-6
+    determinants = np.where(is_solvable, determinants, 1.0)
+    first_colors: np.ndarray = (ax * bb[:, None] - bx * ab[:, None]) / determinants[:, None]
+    second_colors: np.ndarray = (bx * aa[:, None] - ax * ab[:, None]) / determinants[:, None]
+    return np.clip(first_colors, 0, 255), np.clip(second_colors, 0, 255), is_solvable
+
+
+def encode_color_blocks(pixel_blocks: np.ndarray, preset: str, is_bc1: bool) -> np.ndarray:
+    """
+    Encodes color part of DXT blocks. Returns array of (blocks_count, 2) uint32 values (endpoints, indices).
+    In BC1, blocks with transparent pixels (alpha < 128) use 3-color mode with transparent index.
+    """
+    use_principal_axis, refinements_count = bc_encode_presets[preset]
+    colors: np.ndarray = pixel_blocks[..., :3].astype(np.float32)
+    is_transparent: np.ndarray = pixel_blocks[..., 3] < 128 if is_bc1 else np.zeros(pixel_blocks.shape[:2], dtype=bool)
+    weights: np.ndarray = (~is_transparent).astype(np.float32)
+    is_three_color_mode: np.ndarray = is_transparent.any(axis=1)
+    index_weights: np.ndarray = FOUR_COLOR_WEIGHTS
+
+    first_colors, second_colors = _get_initial_endpoints(colors, weights, use_principal_axis)
+    best_endpoints: Optional[tuple] = None
+    best_errors: Optional[np.ndarray] = None
+    for refinement_number in range(refinements_count + 1):
+        first_values: np.ndarray = _quantize_rgb565(first_colors)
+        second_values: np.ndarray = _quantize_rgb565(second_colors)
+        # 4-color mode needs first endpoint bigger than second, 3-color mode needs the opposite
+        is_swap_needed: np.ndarray = np.where(
+            is_three_color_mode, first_values > second_values, first_values < second_values
+        )
+        first_values, second_values = (
+            np.where(is_swap_needed, second_values, first_values),
+            np.where(is_swap_needed, first_values, second_values),
+        )
+        first_expanded: np.ndarray = _expand_rgb565(first_values)
+        second_expanded: np.ndarray = _expand_rgb565(second_values)
+
+        indices, distances = _get_nearest_indices(
+            colors, _get_color_palettes(first_expanded, second_expanded, index_weights)
+        )
+        if is_three_color_mode.any():
+            three_color_indices, three_color_distances = _get_nearest_indices(
+                colors, _get_color_palettes(first_expanded, second_expanded, THREE_COLOR_WEIGHTS)
+            )
+            three_color_indices = np.where(is_transparent, 3, three_color_indices)
+            indices = np.where(is_three_color_mode[:, None], three_color_indices, indices)
+            distances = np.where(is_three_color_mode[:, None], three_color_distances, distances)
+        indices = np.where((first_values == second_values)[:, None] & ~is_transparent, 0, indices)
+        errors: np.ndarray = (distances * weights).sum(axis=1)
+
+        endpoints: tuple = (first_values, second_values, indices)
+        if best_errors is None:
+            best_endpoints, best_errors = endpoints, errors
+        else:
+            is_better: np.ndarray = errors < best_errors
+            best_endpoints = tuple(
+                np.where(is_better.reshape((-1,) + (1,) * (new.ndim - 1)), new, old)
+                for new, old in zip(endpoints, best_endpoints)
+            )
+            best_errors = np.minimum(errors, best_errors)
+
+        if refinement_number < refinements_count:
+            # refined endpoints are used only for 4-color blocks, 3-color blocks keep the initial ones
+            refined_first, refined_second, is_solvable = _refine_endpoints(colors, weights, index_weights, indices)
+            use_refined: np.ndarray = (is_solvable & ~is_three_color_mode)[:, None]
+            first_colors = np.where(use_refined, refined_first, first_colors)
+            second_colors = np.where(use_refined, refined_second, second_colors)
+
+    first_values, second_values, indices = best_endpoints
+    index_shifts: np.ndarray = np.arange(16, dtype=np.uint32) * 2
+    packed_indices: np.ndarray = (indices.astype(np.uint32) << index_shifts).sum(axis=1, dtype=np.uint32)
+    return np.stack([first_values | (second_values << 16), packed_indices], axis=1).astype("<u4")
+
+
+def encode_explicit_alpha_blocks(pixel_blocks: np.ndarray) -> np.ndarray:
+    # BC2 - 4 bits of alpha for each pixel
+    alpha_values: np.ndarray = np.rint(pixel_blocks[..., 3] * (15 / 255)).astype(np.uint64)
+    alpha_shifts: np.ndarray = np.arange(16, dtype=np.uint64) * np.uint64(4)
+    return (alpha_values << alpha_shifts).sum(axis=1, dtype=np.uint64).astype("<u8")
+
+
+def encode_interpolated_alpha_blocks(pixel_blocks: np.ndarray) -> np.ndarray:
+    # BC3 - two alpha endpoints and 3-bit index for each pixel (8-alpha mode)
+    alpha_values: np.ndarray = pixel_blocks[..., 3].astype(np.float32)
+    first_alphas: np.ndarray = alpha_values.max(axis=1)
+    second_alphas: np.ndarray = alpha_values.min(axis=1)
+    alpha_weights: np.ndarray = np.array([0, 7, 1, 2, 3, 4, 5, 6], dtype=np.float32) / 7  # index -> weight
+    alpha_palettes: np.ndarray = (
+        first_alphas[:, None] + (second_alphas - first_alphas)[:, None] * alpha_weights[None, :]
+    )
+    alpha_indices: np.ndarray = np.abs(alpha_values[:, :, None] - alpha_palettes[:, None, :]).argmin(axis=2)
+    alpha_indices = np.where((first_alphas == second_alphas)[:, None], 0, alpha_indices)
+
+    index_shifts: np.ndarray = np.arange(16, dtype=np.uint64) * np.uint64(3) + np.uint64(16)
+    packed_blocks: np.ndarray = (alpha_indices.astype(np.uint64) << index_shifts).sum(axis=1, dtype=np.uint64)
+    packed_blocks |= first_alphas.astype(np.uint64) | (second_alphas.astype(np.uint64) << np.uint64(8))
+    return packed_blocks.astype("<u8")
+
+
+def _encode_block_batch(pixel_blocks: np.ndarray, image_format: ImageFormats, preset: str) -> np.ndarray:
+    color_blocks: np.ndarray = encode_color_blocks(pixel_blocks, preset, image_format == ImageFormats.BC1_DXT1)
+    if image_format == ImageFormats.BC1_DXT1:
+        return color_blocks.view(np.uint8).reshape(-1, 8)
+    if image_format == ImageFormats.BC2_DXT3:
+        alpha_blocks: np.ndarray = encode_explicit_alpha_blocks(pixel_blocks)
+    else:
+        alpha_blocks = encode_interpolated_alpha_blocks(pixel_blocks)
+    return np.concatenate([alpha_blocks.view(np.uint8).reshape(-1, 8), color_blocks.view(np.uint8).reshape(-1, 8)], 1)
+
+
+def encode_bc_image_level(
+    rgba8888_data: bytes,
+    img_width: int,
+    img_height: int,
+    image_format: ImageFormats,
+    preset: str = DEFAULT_BC_ENCODE_PRESET,
+    max_workers: Optional[int] = None,
+) -> bytes:
+    """
+    Encodes one image (or mipmap) to BC1/BC2/BC3. Blocks are encoded in batches, batches run in threads
+    (NumPy releases GIL, so threads are enough here).
+    """
+    if image_format not in BC_ENCODE_SUPPORTED_FORMATS:
+        raise Exception(f"Image format {image_format} not supported by BC encoder!")
+    if preset not in bc_encode_presets:
+        raise Exception(f"Unknown BC encode preset: {preset}")
+
+    pixel_blocks: np.ndarray = get_pixel_blocks(rgba8888_data, img_width, img_height)
+    batches: List[np.ndarray] = np.array_split(
+        pixel_blocks, range(BC_ENCODE_BATCH_SIZE, len(pixel_blocks), BC_ENCODE_BATCH_SIZE)
+    )
+    max_workers = min(max_workers or os.cpu_count() or 1, len(batches))
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            encoded_batches: List[np.ndarray] = list(
+                executor.map(lambda batch: _encode_block_batch(batch, image_format, preset), batches)
+            )
+    else:
+        encoded_batches = [_encode_block_batch(batch, image_format, preset) for batch in batches]
+    return np.concatenate(encoded_batches).tobytes()
+
+
+def encode_bc_image(
+    rgba8888_data: bytes,
+    img_width: int,
+    img_height: int,
+    image_format: ImageFormats,
+    number_of_mipmaps: int = 0,
+    mipmaps_resampling_type: PIL.Image.Resampling = PIL.Image.Resampling.NEAREST,
+    preset: str = DEFAULT_BC_ENCODE_PRESET,
+    max_workers: Optional[int] = None,
+) -> bytes:
+    """
+    Encodes RGBA8888 image with all mipmaps to BC1 (DXT1), BC2 (DXT3) or BC3 (DXT5).
+    """
+    mipmap_sizes: List[Tuple[int, int]] = get_mipmap_sizes(img_width, img_height, number_of_mipmaps)
+    mipmaps_data: list = [rgba8888_data] + generate_mipmap_pyramid(
+        rgba8888_data, img_width, img_height, number_of_mipmaps, mipmaps_resampling_type
+    )
+    return b"".join(
+        encode_bc_image_level(bytes(mip_rgba8888_data), mip_width, mip_height, image_format, preset, max_workers)
+        for mip_rgba8888_data, (mip_width, mip_height) in zip(mipmaps_data, mipmap_sizes)
+        if mip_width > 0 and mip_height > 0
+    )
@@ -0,0 +1,157 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from reversebox.image.image_formats import ImageFormats
+
+# Registry of all image types (record IDs) supported by the decoder and encoder.
+# Decoder, encoder and lists of supported types are driven by this table,
+# so new image type can be added with one "register_codec" call.
+
+# fmt: off
+
+# decode kinds
+DECODE_RAW = "raw"  # data is already RGBA8888
+DECODE_PIXEL = "pixel"
+DECODE_INDEXED = "indexed"  # palette stored in binary attachment
+DECODE_INLINE_PALETTE = "inline_palette"  # palette stored before image data
+DECODE_GST = "gst"
+DECODE_N64 = "n64"
+DECODE_PSP_DXT = "psp_dxt"
+DECODE_COMPRESSED = "compressed"
+DECODE_YUV = "yuv"
+
+# encode kinds
+ENCODE_RAW = "raw"
+ENCODE_PIXEL = "pixel"
+ENCODE_INDEXED = "indexed"
+ENCODE_INLINE_PALETTE = "inline_palette"
+ENCODE_N64 = "n64"
+ENCODE_COMPRESSED = "compressed"
+
+
+@dataclass
+class CodecInfo:
+    entry_type: int
+    bpp: int
+    decode_kind: str
+    image_format: Optional[ImageFormats] = None  # for indexed types it's calculated from bpp
+    image_endianess: str = "little"
+    palette_endianess: str = "little"
+    encode_kind: Optional[str] = None  # None if import is not supported
+    encode_image_endianess: Optional[str] = None  # if different than "image_endianess"
+    supports_mipmaps: bool = True  # mipmaps are generated on encode
+    is_swizzle_handled_by_codec: bool = False  # skip generic swizzling logic
+    supports_compressed_convert: bool = False  # refpack compressed variant (entry_type | 0x80) can be converted
+    supports_compressed_import: bool = False  # refpack compressed variant (entry_type | 0x80) can be imported
+
+    @property
+    def palette_color_count(self) -> int:
+        return 1 << self.bpp if self.bpp <= 8 else 0
+
+    @property
+    def inline_palette_size(self) -> int:
+        return self.palette_color_count * 4  # RGBA8888 palette
+
+
+codec_registry: Dict[int, CodecInfo] = {}
+CONVERT_IMAGES_SUPPORTED_TYPES: List[int] = []
+IMPORT_IMAGES_SUPPORTED_TYPES: List[int] = []
+
+
+def _insert_type(supported_types: List[int], entry_type: int) -> None:
+    if entry_type not in supported_types:
+        supported_types.append(entry_type)
+        supported_types.sort()
+
+
+def register_codec(codec_info: CodecInfo) -> None:
+    """
+    Adds (or replaces) codec for image type. Lists of supported types are updated in place,
+    so modules which imported them see the change too.
+    """
+    codec_registry[codec_info.entry_type] = codec_info
+    _insert_type(CONVERT_IMAGES_SUPPORTED_TYPES, codec_info.entry_type)
+    if codec_info.supports_compressed_convert:
+        _insert_type(CONVERT_IMAGES_SUPPORTED_TYPES, codec_info.entry_type | 0x80)
+    if codec_info.encode_kind:
+        _insert_type(IMPORT_IMAGES_SUPPORTED_TYPES, codec_info.entry_type)
+        if codec_info.supports_compressed_import:
+            _insert_type(IMPORT_IMAGES_SUPPORTED_TYPES, codec_info.entry_type | 0x80)
+
+
+def get_codec_info(entry_type: int) -> Optional[CodecInfo]:
+    return codec_registry.get(entry_type)
+
+
+def is_swizzle_handled_by_codec(entry_type: int) -> bool:
+    codec_info: Optional[CodecInfo] = codec_registry.get(entry_type)
+    return codec_info is not None and codec_info.is_swizzle_handled_by_codec
+
+
+def _register_default_codecs() -> None:
+    for codec_info in (
+        CodecInfo(1, 4, DECODE_INDEXED, encode_kind=ENCODE_INDEXED),
+        CodecInfo(2, 8, DECODE_INDEXED, encode_kind=ENCODE_INDEXED, supports_compressed_convert=True, supports_compressed_import=True),
+        CodecInfo(3, 15, DECODE_PIXEL, ImageFormats.RGBA5551, encode_kind=ENCODE_PIXEL, supports_compressed_convert=True, supports_compressed_import=True),
+        CodecInfo(4, 24, DECODE_PIXEL, ImageFormats.RGB888, encode_kind=ENCODE_PIXEL),
+        CodecInfo(5, 32, DECODE_RAW, encode_kind=ENCODE_RAW),
+        CodecInfo(8, 8, DECODE_GST, ImageFormats.GST121, is_swizzle_handled_by_codec=True),
+        CodecInfo(9, 8, DECODE_GST, ImageFormats.GST221, is_swizzle_handled_by_codec=True),
+        CodecInfo(10, 8, DECODE_GST, ImageFormats.GST421, is_swizzle_handled_by_codec=True),
+        CodecInfo(11, 8, DECODE_GST, ImageFormats.GST821, is_swizzle_handled_by_codec=True),
+        CodecInfo(12, 8, DECODE_GST, ImageFormats.GST122, is_swizzle_handled_by_codec=True),
+        CodecInfo(13, 8, DECODE_GST, ImageFormats.GST222, is_swizzle_handled_by_codec=True),
+        CodecInfo(14, 8, DECODE_GST, ImageFormats.GST422, is_swizzle_handled_by_codec=True),
+        CodecInfo(15, 8, DECODE_GST, ImageFormats.GST822, is_swizzle_handled_by_codec=True),
+        CodecInfo(20, 16, DECODE_PIXEL, ImageFormats.RGB565, image_endianess="big"),
+        CodecInfo(21, 15, DECODE_PIXEL, ImageFormats.N64_BGR5A3, image_endianess="big", encode_kind=ENCODE_PIXEL),
+        CodecInfo(22, 32, DECODE_PIXEL, ImageFormats.ARGB8888, encode_kind=ENCODE_PIXEL),
+        CodecInfo(24, 4, DECODE_INDEXED, image_endianess="big", palette_endianess="big", encode_kind=ENCODE_INDEXED, encode_image_endianess="big"),
+        CodecInfo(25, 8, DECODE_INDEXED, image_endianess="big", palette_endianess="big", encode_kind=ENCODE_INDEXED, encode_image_endianess="big"),
+        CodecInfo(30, 4, DECODE_N64, ImageFormats.N64_CMPR, encode_kind=ENCODE_N64, supports_mipmaps=False, is_swizzle_handled_by_codec=True),
+        CodecInfo(33, 32, DECODE_RAW),  # palette
+        CodecInfo(34, 24, DECODE_PIXEL, ImageFormats.XRGB1555),  # palette
+        CodecInfo(35, 16, DECODE_PIXEL, ImageFormats.XRGB1555),  # palette
+        CodecInfo(36, 24, DECODE_PIXEL, ImageFormats.RGB888),  # palette
+        CodecInfo(42, 32, DECODE_PIXEL, ImageFormats.RGBA8888),  # palette
+        CodecInfo(59, 32, DECODE_PIXEL, ImageFormats.XRGB1555),  # palette
+        CodecInfo(64, 4, DECODE_INDEXED, encode_kind=ENCODE_INDEXED, supports_compressed_convert=True, supports_compressed_import=True),
+        CodecInfo(65, 8, DECODE_INDEXED, encode_kind=ENCODE_INDEXED, supports_compressed_convert=True, supports_compressed_import=True),
+        CodecInfo(66, 16, DECODE_PIXEL, ImageFormats.RGBT5551, encode_kind=ENCODE_PIXEL, supports_compressed_convert=True, supports_compressed_import=True),
+        CodecInfo(67, 24, DECODE_PIXEL, ImageFormats.RGB888),
+        CodecInfo(69, 8, DECODE_PSP_DXT, ImageFormats.PSP_DXT1),
+        CodecInfo(70, 8, DECODE_PSP_DXT, ImageFormats.PSP_DXT3),
+        CodecInfo(71, 8, DECODE_PSP_DXT, ImageFormats.PSP_DXT5),
+        CodecInfo(88, 16, DECODE_PIXEL, ImageFormats.RGB565, encode_kind=ENCODE_PIXEL),
+        CodecInfo(89, 15, DECODE_PIXEL, ImageFormats.RGB565, encode_kind=ENCODE_PIXEL),
+        CodecInfo(90, 16, DECODE_PIXEL, ImageFormats.RGBX4444, encode_kind=ENCODE_PIXEL),
+        CodecInfo(91, 32, DECODE_RAW, encode_kind=ENCODE_RAW),
+        CodecInfo(92, 4, DECODE_INDEXED, encode_kind=ENCODE_INDEXED),
+        CodecInfo(93, 8, DECODE_INDEXED, encode_kind=ENCODE_INDEXED),
+        CodecInfo(96, 4, DECODE_COMPRESSED, ImageFormats.BC1_DXT1, encode_kind=ENCODE_COMPRESSED),
+        CodecInfo(97, 8, DECODE_COMPRESSED, ImageFormats.BC2_DXT3, encode_kind=ENCODE_COMPRESSED),
+        CodecInfo(98, 8, DECODE_COMPRESSED, ImageFormats.BC3_DXT5, encode_kind=ENCODE_COMPRESSED),
+        CodecInfo(100, 8, DECODE_PIXEL, ImageFormats.GRAY8),
+        CodecInfo(101, 16, DECODE_N64, ImageFormats.N64_IA8),
+        CodecInfo(104, 16, DECODE_YUV, ImageFormats.YUV422_YUY2),
+        CodecInfo(109, 16, DECODE_PIXEL, ImageFormats.BGRA4444, encode_kind=ENCODE_PIXEL, supports_compressed_convert=True, supports_compressed_import=True),
+        CodecInfo(115, 8, DECODE_INLINE_PALETTE, ImageFormats.PAL8, image_endianess="big", encode_kind=ENCODE_INLINE_PALETTE, encode_image_endianess="little"),
+        # TODO - type 119 should be encoded with "big" endianess, but it doesn't work
+        CodecInfo(119, 4, DECODE_INLINE_PALETTE, ImageFormats.PAL4, image_endianess="big", encode_kind=ENCODE_INLINE_PALETTE, encode_image_endianess="little"),
+        CodecInfo(120, 16, DECODE_PIXEL, ImageFormats.BGR565, encode_kind=ENCODE_PIXEL, supports_compressed_convert=True, supports_compressed_import=True),
+        CodecInfo(121, 4, DECODE_INDEXED, encode_kind=ENCODE_INDEXED),
+        CodecInfo(122, 4, DECODE_INDEXED, image_endianess="big"),
+        CodecInfo(123, 8, DECODE_INDEXED, encode_kind=ENCODE_INDEXED, supports_compressed_convert=True, supports_compressed_import=True),
+        CodecInfo(125, 32, DECODE_PIXEL, ImageFormats.BGRA8888, encode_kind=ENCODE_PIXEL),
+        CodecInfo(126, 15, DECODE_PIXEL, ImageFormats.BGRA5551, encode_kind=ENCODE_PIXEL),
+        CodecInfo(127, 24, DECODE_PIXEL, ImageFormats.BGR888, encode_kind=ENCODE_PIXEL, supports_compressed_import=True),
+    ):
+        register_codec(codec_info)
+
+
+_register_default_codecs()
@@ -3,34 +3,41 @@ Copyright © 2024-2025  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+import re
+from typing import Optional
+
 from reversebox.common.logger import get_logger
 from reversebox.image.image_formats import ImageFormats
 
+from src.EA_Image.codec_registry import CodecInfo, get_codec_info
+
 # fmt: off
 
 logger = get_logger(__name__)
 
 
+# bpp of image types which don't have codec in registry yet
+image_type_bpp_fallback_mapping: dict = {
+    **dict.fromkeys((0x44,), 1),
+    **dict.fromkeys((0x10, 0x63), 4),
+    **dict.fromkeys((0x11, 0x12), 8),
+    **dict.fromkeys((0x1C, 0x6C), 12),
+    **dict.fromkeys((0x20, 0x32, 0x39), 15),
+    **dict.fromkeys((0x13, 0x1A, 0x27, 0x28, 0x29, 0x2D, 0x30, 0x31, 0x38, 0x3A, 0x67), 16),
+    **dict.fromkeys((0x66,), 24),
+    **dict.fromkeys((0x2C, 0x2E, 0x6A), 32),
+}
+
+
 def get_bpp_for_image_type(ea_img_type: int) -> int:
-    if ea_img_type == 0x44:
-        return 1
-    elif ea_img_type in (0x01, 0x10, 0x18, 0x1E, 0x40, 0x5C, 0x60, 0x63, 0x77, 0x79, 0x7A):
-        return 4
-    elif ea_img_type in (0x02, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F, 0x11, 0x12, 0x19, 0x41, 0x5D, 0x61, 0x62, 0x64, 0x73, 0x7B):
-        return 8
-    elif ea_img_type in (0x1C, 0x6C):
-        return 12
-    elif ea_img_type in (0x03, 0x15, 0x20, 0x32, 0x39, 0x59, 0x7E):
-        return 15
-    elif ea_img_type in (0x13, 0x14, 0x1A, 0x23, 0x27, 0x28, 0x29, 0x2D, 0x30, 0x31, 0x38, 0x3A, 0x42, 0x58, 0x5A, 0x65, 0x67, 0x68, 0x6D, 0x78):
-        return 16
-    elif ea_img_type in (0x04, 0x22, 0x24, 0x43, 0x66, 0x7F):
-        return 24
-    elif ea_img_type in (0x05, 0x16, 0x21, 0x2A, 0x2C, 0x2E, 0x3B, 0x5B, 0x6A, 0x7D):
-        return 32
-    else:
+    codec_info: Optional[CodecInfo] = get_codec_info(ea_img_type)
+    if codec_info:
+        return codec_info.bpp
+    bpp: Optional[int] = image_type_bpp_fallback_mapping.get(ea_img_type)
+    if bpp is None:
         logger.warning(f"Image type {str(ea_img_type)} not supported! Can't get bpp info!")
         return 8  # default bpp
+    return bpp
 
 
 def get_indexed_image_format(bpp: int) -> ImageFormats:
@@ -76,3 +83,7 @@ def get_indexed_palette_format(palette_entry_id: int, palette_size: int) -> Imag
 
     logger.warning(f"Palette format has not been found for palette_id={palette_entry_id}")
     return ImageFormats.RGB565  # default
+
+
+def get_safe_file_name(in_name: str) -> str:
+    return re.sub(r'[<>:"/\\|?*\x00-\x1F]', "_", in_name).strip() or "noname"
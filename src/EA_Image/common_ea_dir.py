@@ -4,70 +4,59 @@ License: GPL-3.0 License
 """
 
 import traceback
+from typing import Optional
 
 from reversebox.common.logger import get_logger
-from reversebox.image.swizzling.swizzle_gamecube import (
-    swizzle_gamecube,
-    unswizzle_gamecube,
-)
-from reversebox.image.swizzling.swizzle_morton import swizzle_morton, unswizzle_morton
-from reversebox.image.swizzling.swizzle_ps2 import (
-    swizzle_ps2,
-    unswizzle_ps2,
-    unswizzle_ps2_palette,
-)
-from reversebox.image.swizzling.swizzle_psp import swizzle_psp, unswizzle_psp
+from reversebox.image.swizzling.swizzle_ps2 import unswizzle_ps2_palette
 
 from src.EA_Image.attachments.palette_entry import PaletteEntry
+from src.EA_Image.codec_registry import is_swizzle_handled_by_codec
 from src.EA_Image.common import get_bpp_for_image_type
 from src.EA_Image.constants import PALETTE_TYPES
 from src.EA_Image.dir_entry import DirEntry
 from src.EA_Image.dto import PaletteInfoDTO
-from src.EA_Image.ea_default_palette import ea_default_palette_data
+from src.EA_Image.ea_default_palette import ea_default_palette_bytes
+from src.EA_Image.swizzle_plan import convert_swizzle
 
 logger = get_logger(__name__)
 
 
+def get_palette_info_dto_from_palette_entry(palette_entry) -> PaletteInfoDTO:
+    # palette entry can be binary attachment or dir entry
+    palette_data: bytes = bytes(palette_entry.raw_data)
+    if palette_entry.h_record_id in (33, 59) and palette_entry.h_default_x_position & 0x2000:  # palette swizzle flag
+        return PaletteInfoDTO(
+            entry_id=palette_entry.h_record_id, data=unswizzle_ps2_palette(palette_data), swizzle_flag=True
+        )
+    return PaletteInfoDTO(entry_id=palette_entry.h_record_id, data=palette_data, swizzle_flag=False)
+
+
+def get_shared_palette_info_dto(dir_entry_list: list) -> Optional[PaletteInfoDTO]:
+    # palette stored as separate dir entry, used by all images without palette attachment
+    for ea_dir_entry in dir_entry_list:
+        if ea_dir_entry.h_record_id in PALETTE_TYPES:
+            return get_palette_info_dto_from_palette_entry(ea_dir_entry)
+    return None
+
+
 def get_palette_info_dto_from_dir_entry(_ea_dir_entry: DirEntry, ea_image) -> PaletteInfoDTO:
     # try to get palette from binary attachment first
-    _palette_data: bytes = b""
     _entry_id: int = 33  # default palette
-    _h_default_x_position = -1
     for attachment in _ea_dir_entry.bin_attachments_list:
         if isinstance(attachment, PaletteEntry):
-            _palette_data = attachment.raw_data
+            if attachment.raw_data is not None and len(attachment.raw_data) > 0:
+                return get_palette_info_dto_from_palette_entry(attachment)  # return palette from binary attachment
             _entry_id = attachment.h_record_id
-            _h_default_x_position = attachment.h_default_x_position
             break
 
-    if _palette_data and len(_palette_data) > 0:
-        if _entry_id in (33, 59) and _h_default_x_position & 0x2000:  # check for palette swizzle flag
-            return PaletteInfoDTO(entry_id=_entry_id, data=unswizzle_ps2_palette(_palette_data), swizzle_flag=True)
-
-        return PaletteInfoDTO(
-            entry_id=_entry_id, data=_palette_data, swizzle_flag=False
-        )  # return palette from binary attachment
-
     # try to get palette from other dir entry
-    for i in range(ea_image.num_of_entries):
-        ea_dir_entry = ea_image.dir_entry_list[i]
-        if ea_dir_entry.h_record_id in PALETTE_TYPES:
-            if (
-                ea_dir_entry.h_record_id in (33, 59) and ea_dir_entry.h_default_x_position & 0x2000
-            ):  # check for palette swizzle flag
-                return PaletteInfoDTO(
-                    entry_id=ea_dir_entry.h_record_id,
-                    data=unswizzle_ps2_palette(ea_dir_entry.raw_data),
-                    swizzle_flag=True,
-                )
-
-            return PaletteInfoDTO(
-                entry_id=ea_dir_entry.h_record_id, data=ea_dir_entry.raw_data, swizzle_flag=False
-            )  # return palette from other dir entry
-
-    logger.warn("Warning! Couldn't find palette data!")
+    shared_palette_info_dto: Optional[PaletteInfoDTO] = ea_image.get_shared_palette_info_dto()
+    if shared_palette_info_dto:
+        return shared_palette_info_dto  # return palette from other dir entry
+
+    logger.warning("Warning! Couldn't find palette data!")
     return PaletteInfoDTO(
-        entry_id=_entry_id, data=bytes(ea_default_palette_data), swizzle_flag=False
+        entry_id=_entry_id, data=ea_default_palette_bytes, swizzle_flag=False
     )  # return default palette if no palette has been found
 
 
@@ -88,36 +77,26 @@ def handle_image_swizzle_logic(
     image_data: bytes, entry_type: int, img_width: int, img_height: int, ea_img_signature: str, swizzle_flag: bool
 ) -> bytes:
     try:
-        if entry_type >= 8 and entry_type <= 15:  # for PS2 games (GST textures)
-            pass  # swizzling handled by GST decoder
-        elif entry_type == 30:  # for WII games (DXT1/CMPR textures)
-            pass  # swizzling handled by N64 decoder
+        if is_swizzle_handled_by_codec(entry_type):
+            pass  # e.g. GST textures (PS2) or CMPR textures (WII) are unswizzled by their decoders
         elif ea_img_signature in ("SHPX", "ShpX", "SHPI", "ShpF"):  # for XBOX and PC games
-            if not swizzle_flag:
-                image_data = unswizzle_morton(image_data, img_width, img_height, get_bpp_for_image_type(entry_type))
-            else:
-                image_data = swizzle_morton(image_data, img_width, img_height, get_bpp_for_image_type(entry_type))
+            image_data = convert_swizzle(
+                image_data, "morton", img_width, img_height, get_bpp_for_image_type(entry_type), swizzle_flag
+            )
         elif ea_img_signature in ("SHPM", "ShpM"):  # for PSP games
-            if not swizzle_flag:
-                image_data = unswizzle_psp(image_data, img_width, img_height, get_bpp_for_image_type(entry_type))
-            else:
-                image_data = swizzle_psp(image_data, img_width, img_height, get_bpp_for_image_type(entry_type))
-        elif ea_img_signature in ("SHPS", "ShpS") and (
-            entry_type < 8 or entry_type > 15
-        ):  # for PS2 games (standard textures)
+            image_data = convert_swizzle(
+                image_data, "psp", img_width, img_height, get_bpp_for_image_type(entry_type), swizzle_flag
+            )
+        elif ea_img_signature in ("SHPS", "ShpS"):  # for PS2 games (standard textures)
             bpp = get_bpp_for_image_type(entry_type)
             if bpp in (4, 8, 15, 16):
-                if not swizzle_flag:
-                    image_data = unswizzle_ps2(image_data, img_width, img_height, bpp, swizzle_type=1)
-                else:
-                    image_data = swizzle_ps2(image_data, img_width, img_height, bpp, swizzle_type=1)
+                image_data = convert_swizzle(image_data, "ps2", img_width, img_height, bpp, swizzle_flag)
             else:
                 logger.warning(f"PS2 unswizzle for bpp {bpp} is not supported yet!")
         elif ea_img_signature in ("SHPG", "ShpG"):  # for WII/GameCube games
-            if not swizzle_flag:
-                image_data = unswizzle_gamecube(image_data, img_width, img_height, get_bpp_for_image_type(entry_type))
-            else:
-                image_data = swizzle_gamecube(image_data, img_width, img_height, get_bpp_for_image_type(entry_type))
+            image_data = convert_swizzle(
+                image_data, "gamecube", img_width, img_height, get_bpp_for_image_type(entry_type), swizzle_flag
+            )
         else:
             logger.warning(f"Swizzling for signature {ea_img_signature} is not supported yet!")
     except Exception as error:
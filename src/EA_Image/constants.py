@@ -5,14 +5,13 @@ License: GPL-3.0 License
 
 import PIL.Image
 
+from src.EA_Image import codec_registry
+
 # fmt: off
 PALETTE_TYPES = (33, 34, 35, 36, 41, 42, 44, 45, 46, 47, 48, 49, 50, 51, 58, 59)
-CONVERT_IMAGES_SUPPORTED_TYPES = [1, 2, 3, 4, 5, 8, 9, 10, 11, 12, 13, 14, 15, 20, 21, 22, 24, 25, 30, 33, 34, 35, 36, 42, 59, 64,
-                                  65, 66, 67, 69, 70, 71, 88, 89, 90, 91, 92, 93, 96, 97, 98, 100, 101, 104, 109, 115, 119, 120,
-                                  121, 122, 123, 125, 126, 127, 130, 131, 192, 193, 194, 237, 248, 251]
-
-IMPORT_IMAGES_SUPPORTED_TYPES = [1, 2, 3, 4, 5, 21, 22, 24, 25, 30, 64, 65, 66, 88, 89, 90, 91, 92, 93, 96, 97, 98,
-                                 109, 115, 119, 120, 121, 123, 125, 126, 127, 130, 131, 192, 193, 194, 237, 248, 251, 255]
+# supported types are generated from codec registry
+CONVERT_IMAGES_SUPPORTED_TYPES = codec_registry.CONVERT_IMAGES_SUPPORTED_TYPES
+IMPORT_IMAGES_SUPPORTED_TYPES = codec_registry.IMPORT_IMAGES_SUPPORTED_TYPES
 
 OLD_SHAPE_ALLOWED_SIGNATURES = (
     "SHPI",  # PC games
@@ -33,6 +32,18 @@ NEW_SHAPE_ALLOWED_SIGNATURES = (
     "ShpA",  # Game Boy Advance games
 )
 
+DEFAULT_DECODE_CACHE_BYTE_BUDGET = 256 * 1024 * 1024  # 256 MB for decoded RGBA data of all opened files
+DEFAULT_DISK_CACHE_BYTE_BUDGET = 2 * 1024 * 1024 * 1024  # 2 GB of compressed RGBA data in cache directory
+REFPACK_TEMP_FILE_OUTPUT_THRESHOLD = 512 * 1024 * 1024  # bigger decompressed files are kept in temporary file
+REBUILD_MAX_ENTRY_ALIGNMENT = 128  # entries moved by rebuild keep their alignment (up to this value)
+PALETTE_CACHE_MAX_ENTRIES = 32  # quantized palettes of recently imported images
+BC_ENCODE_BATCH_SIZE = 4096  # number of 4x4 blocks encoded at once by one thread of BC encoder
+DEFAULT_BC_ENCODE_PRESET = "normal"  # BC encoder quality preset (fast, normal or best)
+REFPACK_COMPRESSION_CHUNK_SIZE = 1024 * 1024  # refpack encoder finds matches for this much data at once
+DEFAULT_REFPACK_COMPRESSION_LEVEL = "normal"  # refpack compression level (fast, normal or best)
+SWIZZLE_PLAN_CACHE_BYTE_BUDGET = 64 * 1024 * 1024  # index arrays of recently used swizzle plans
+DISK_CACHE_FORMAT_VERSION = 1  # increase when decoding logic changes, so old cache files are invalidated
+
 mipmaps_resampling_mapping: dict = {
     "nearest": PIL.Image.Resampling.NEAREST,
     "box": PIL.Image.Resampling.BOX,
@@ -5,19 +5,70 @@ License: GPL-3.0 License
 
 import struct
 
+from src.EA_Image.memory_file import MemoryFile
+
 
 def get_string(in_file, str_length: int, encoding="utf8") -> str:
-    result = in_file.read(str_length).decode(encoding)
+    result = bytes(in_file.read(str_length)).decode(encoding)
     return result
 
 
-def get_null_terminated_string(in_file, encoding="utf8") -> str:
-    binary_str: bytearray = bytearray()
+def get_null_terminated_string(in_file, encoding="utf8", chunk_size: int = 64) -> str:
+    # string is read in chunks and terminator is located with find()
+    # file position is set right after the terminator
+    start_offset: int = in_file.tell()
+    binary_str: bytes = b""
     while True:
-        c = in_file.read(1)
-        if c == b"\x00":
+        chunk: bytes = bytes(in_file.read(chunk_size))
+        terminator_index: int = chunk.find(b"\x00")
+        if terminator_index >= 0:
+            binary_str += chunk[:terminator_index]
+            in_file.seek(start_offset + len(binary_str) + 1)
             return binary_str.decode(encoding)
-        binary_str += c
+        binary_str += chunk
+        if len(chunk) < chunk_size:
+            return binary_str.decode(encoding)  # end of data, no terminator
+
+
+def get_struct_layouts(struct_format: str) -> dict:
+    """
+    Precompiles struct layout for both endianess types.
+    Returns dict with "<" (little endian) and ">" (big endian) keys.
+    """
+    return {"<": struct.Struct("<" + struct_format), ">": struct.Struct(">" + struct_format)}
+
+
+def read_struct(in_file, struct_layouts: dict, endianess: str) -> tuple:
+    """
+    Reads and unpacks whole structure (e.g. entry header) at once.
+    """
+    struct_layout: struct.Struct = struct_layouts[endianess]
+    if isinstance(in_file, MemoryFile):
+        return in_file.unpack(struct_layout)  # no intermediate slice
+    return struct_layout.unpack(in_file.read(struct_layout.size))
+
+
+def split_uint8_uint24(uint32_value: int, endianess: str) -> tuple:
+    # "uint8 + uint24" pair read as one uint32 value
+    if endianess == "<":
+        return uint32_value & 0xFF, uint32_value >> 8
+    return uint32_value >> 24, uint32_value & 0xFFFFFF
+
+
+def split_uint12_and_flags(uint16_value: int) -> tuple:
+    # returns (uint12, flag1, flag2, flag3, flag4)
+    return (
+        uint16_value & 0x0FFF,
+        (uint16_value >> 12) & 1,
+        (uint16_value >> 13) & 1,
+        (uint16_value >> 14) & 1,
+        (uint16_value >> 15) & 1,
+    )
+
+
+def split_uint12_uint4(uint16_value: int) -> tuple:
+    # returns (uint12, uint4)
+    return uint16_value & 0x0FFF, uint16_value >> 12
 
 
 def get_uint8(in_file, endianess):
@@ -37,69 +88,30 @@ def get_int16(in_file, endianess):
 
 
 def get_uint12_and_flags(in_file, endianess) -> list:
-    bytes2 = in_file.read(2)
-    val_int = struct.unpack(endianess + "H", bytes2)[0]
-    val_str = bin(val_int).lstrip("0b").zfill(16)
-
-    flag4_str = val_str[0:1]
-    flag4_int = int(flag4_str, 2)
-
-    flag3_str = val_str[1:2]
-    flag3_int = int(flag3_str, 2)
-
-    flag2_str = val_str[2:3]
-    flag2_int = int(flag2_str, 2)
-
-    flag1_str = val_str[3:4]
-    flag1_int = int(flag1_str, 2)
-
-    uint12_str = val_str[4:16]
-    uint12_int = int(uint12_str, 2)
-
-    out_list = [uint12_int, flag1_int, flag2_int, flag3_int, flag4_int]
-    return out_list
+    val_int = struct.unpack(endianess + "H", in_file.read(2))[0]
+    return list(split_uint12_and_flags(val_int))
 
 
 def get_new_shape_uint24_flags(uint24_flags_value: int) -> list:
-    val_int: int = uint24_flags_value
-    val_str = bin(val_int).lstrip("0b").zfill(24)
-
-    flag_new_format_str = val_str[23:24]
-    flag_new_format_int = int(flag_new_format_str, 2)
-
-    flag_compressed_str = val_str[22:23]
-    flag_compressed_int = int(flag_compressed_str, 2)
-
-    flag_swizzled_str = val_str[9:10]
-    flag_swizzled_int = int(flag_swizzled_str, 2)
-
-    number_of_mipmaps_str = val_str[0:4]
-    number_of_mipmaps_int = int(number_of_mipmaps_str, 2)
+    flag_new_format_int: int = uint24_flags_value & 1
+    flag_compressed_int: int = (uint24_flags_value >> 1) & 1
+    flag_swizzled_int: int = (uint24_flags_value >> 14) & 1
+    number_of_mipmaps_int: int = (uint24_flags_value >> 20) & 0x0F
 
     out_list = [flag_new_format_int, flag_compressed_int, flag_swizzled_int, number_of_mipmaps_int]
     return out_list
 
 
 def get_uint12_uint4(in_file, endianess) -> list:
-    bytes2 = in_file.read(2)
-    val_int = struct.unpack(endianess + "H", bytes2)[0]
-    val_str = bin(val_int).lstrip("0b").zfill(16)
-
-    uint4_str = val_str[0:4]
-    uint4_int = int(uint4_str, 2)
-
-    uint12_str = val_str[4:16]
-    uint12_int = int(uint12_str, 2)
-
-    out_list = [uint12_int, uint4_int]
-    return out_list
+    val_int = struct.unpack(endianess + "H", in_file.read(2))[0]
+    return list(split_uint12_uint4(val_int))
 
 
 def get_uint24(in_file, endianess):
     if endianess == "<":
-        result = struct.unpack(endianess + "I", in_file.read(3) + b"\x00")[0]
+        result = struct.unpack(endianess + "I", bytes(in_file.read(3)) + b"\x00")[0]
     else:
-        result = struct.unpack(endianess + "I", b"\x00" + in_file.read(3))[0]
+        result = struct.unpack(endianess + "I", b"\x00" + bytes(in_file.read(3)))[0]
     return result
 
 
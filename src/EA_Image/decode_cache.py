@@ -0,0 +1,73 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from reversebox.common.logger import get_logger
+
+from src.EA_Image.constants import DEFAULT_DECODE_CACHE_BYTE_BUDGET
+
+logger = get_logger(__name__)
+
+
+class DecodeCache:
+    """
+    LRU cache for decoded (RGBA8888) image data.
+    Total size of all cached buffers is limited by byte budget.
+    Entries that were not used recently are evicted first.
+    """
+
+    def __init__(self, byte_budget: int = DEFAULT_DECODE_CACHE_BYTE_BUDGET):
+        self.byte_budget: int = byte_budget
+        self.current_size: int = 0
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self.lock:
+            data: Optional[bytes] = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key)  # mark as recently used
+            return data
+
+    def put(self, key: Hashable, data: bytes) -> None:
+        with self.lock:
+            self._remove(key)
+            if len(data) > self.byte_budget:
+                logger.debug(f"Decoded data is bigger than cache budget ({len(data)} bytes). Not caching.")
+                return
+            self.entries[key] = data
+            self.current_size += len(data)
+            self._evict()
+
+    def invalidate(self, key: Hashable) -> None:
+        with self.lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.current_size = 0
+
+    def set_byte_budget(self, byte_budget: int) -> None:
+        with self.lock:
+            self.byte_budget = byte_budget
+            self._evict()
+
+    def _remove(self, key: Hashable) -> None:
+        data: Optional[bytes] = self.entries.pop(key, None)
+        if data is not None:
+            self.current_size -= len(data)
+
+    def _evict(self) -> None:
+        while self.current_size > self.byte_budget and self.entries:
+            _, data = self.entries.popitem(last=False)  # least recently used
+            self.current_size -= len(data)
+
+
+# one cache shared by all opened files, so memory stays bounded
+decode_cache = DecodeCache()
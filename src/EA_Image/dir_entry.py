@@ -3,7 +3,7 @@ Copyright © 2023-2025  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
-from typing import Optional
+from typing import List, Optional
 
 from reversebox.common.common import convert_int_to_hex_string
 
@@ -13,20 +13,24 @@ from src.EA_Image.constants import (
     OLD_SHAPE_ALLOWED_SIGNATURES,
 )
 from src.EA_Image.data_read import (
-    get_int16,
     get_new_shape_uint24_flags,
-    get_uint8,
-    get_uint12_and_flags,
-    get_uint12_uint4,
-    get_uint16,
-    get_uint24,
-    get_uint32,
+    get_struct_layouts,
+    read_struct,
+    split_uint8_uint24,
+    split_uint12_and_flags,
+    split_uint12_uint4,
 )
+from src.EA_Image.dto import MipLevelDTO
+from src.EA_Image.mip_levels import get_mip_level_layout
 
 
 class DirEntry:
     header_size: int = 0
 
+    # precompiled entry header layouts
+    old_shape_header_layouts: dict = get_struct_layouts("IHHhhHH")  # 16 bytes
+    new_shape_header_layouts: dict = get_struct_layouts("8I")  # 32 bytes
+
     entry_types = {
         1: "1 | 0x01 | PAL4",
         2: "2 | 0x02 | PAL8",
@@ -146,6 +150,7 @@ class DirEntry:
         self.if_next_entry_exist_flag = None
         self.is_img_convert_supported: bool = False
         self.img_convert_data: Optional[bytes] = None
+        self.index_plane: Optional[bytes] = None  # palette indices of indexed images (if retained)
         self.entry_import_flag: bool = False
 
         # new shape fields
@@ -155,40 +160,48 @@ class DirEntry:
         self.new_shape_flag_compressed = None
         self.new_shape_flag_swizzled = None
         self.new_shape_number_of_mipmaps = None
+        self.toc_entry_size = None  # entry size from TOC
 
     def set_entry_header(self, in_file, endianess: str, ea_image_sign: str) -> bool:
         if ea_image_sign in OLD_SHAPE_ALLOWED_SIGNATURES:
             self.header_size = 16
             self.h_entry_header_offset = in_file.tell()
-            self.h_record_id = get_uint8(in_file, endianess)
+            (
+                record_id_and_size,
+                self.h_width,
+                self.h_height,
+                self.h_center_x,
+                self.h_center_y,
+                default_x_position_and_flags,
+                default_y_position_and_mipmaps,
+            ) = read_struct(in_file, self.old_shape_header_layouts, endianess)
+            self.h_record_id, self.h_size_of_the_block = split_uint8_uint24(record_id_and_size, endianess)
             self.h_record_id_masked = self.h_record_id & 0x7F
-            self.h_size_of_the_block = get_uint24(in_file, endianess)
-            self.h_width = get_uint16(in_file, endianess)
-            self.h_height = get_uint16(in_file, endianess)
-            self.h_center_x = get_int16(in_file, endianess)
-            self.h_center_y = get_int16(in_file, endianess)
             (
                 self.h_default_x_position,
                 self.h_flag1_referenced,
                 self.h_flag2_swizzled,
                 self.h_flag3_transposed,
                 self.h_flag4_reserved,
-            ) = get_uint12_and_flags(in_file, endianess)
-            self.h_default_y_position, self.h_mipmaps_count = get_uint12_uint4(in_file, endianess)
+            ) = split_uint12_and_flags(default_x_position_and_flags)
+            self.h_default_y_position, self.h_mipmaps_count = split_uint12_uint4(default_y_position_and_mipmaps)
             self.h_image_bpp = get_bpp_for_image_type(self.h_record_id_masked)
         elif ea_image_sign in NEW_SHAPE_ALLOWED_SIGNATURES:
             self.header_size = 32
             self.h_entry_header_offset = in_file.tell()
-            self.h_record_id = get_uint8(in_file, endianess)
-            self.new_shape_flags = get_uint24(in_file, endianess)
+            (
+                record_id_and_flags,
+                self.h_size_of_the_block,
+                relative_raw_data_offset,
+                self.raw_data_size,
+                self.h_default_x_position,
+                self.h_default_y_position,
+                self.h_width,
+                self.h_height,
+            ) = read_struct(in_file, self.new_shape_header_layouts, endianess)
+            self.h_record_id, self.new_shape_flags = split_uint8_uint24(record_id_and_flags, endianess)
             self.new_shape_flags_hex_str = convert_int_to_hex_string(self.new_shape_flags)
-            self.h_size_of_the_block = get_uint32(in_file, endianess)
-            self.raw_data_offset = self.h_entry_header_offset + get_uint32(in_file, endianess)
-            self.raw_data_size = get_uint32(in_file, endianess)
-            self.h_default_x_position = get_uint32(in_file, endianess)
-            self.h_default_y_position = get_uint32(in_file, endianess)
-            self.h_width = get_uint32(in_file, endianess)
-            self.h_height = get_uint32(in_file, endianess)
+            self.raw_data_offset = self.h_entry_header_offset + relative_raw_data_offset
             self.h_image_bpp = get_bpp_for_image_type(self.h_record_id)
             (
                 self.new_shape_flag_new_format,
@@ -226,7 +239,7 @@ class DirEntry:
     def set_is_image_compressed_masked(self, in_file) -> bool:
         current_offset = in_file.tell()
         in_file.seek(self.raw_data_offset)
-        self.h_file_data_first_2_bytes = in_file.read(2)
+        self.h_file_data_first_2_bytes = bytes(in_file.read(2))
         in_file.seek(current_offset)
 
         is_image_compressed_masked: int = self.h_record_id & 0x80  # 0 - not compressed / 128 - compressed
@@ -254,3 +267,21 @@ class DirEntry:
             str(self.h_record_id) + " | " + "0x%02X" % int(self.h_record_id) + " | UNKNOWN_TYPE",
         )
         return result
+
+    def get_mipmaps_count(self) -> int:
+        if isinstance(self.h_mipmaps_count, int):
+            return self.h_mipmaps_count
+        return self.new_shape_number_of_mipmaps or 0
+
+    def get_mip_levels(self, ea_img_signature: str) -> List[MipLevelDTO]:
+        """
+        Returns byte ranges of main image and all mipmaps in decompressed image data (nothing is decoded here).
+        """
+        return get_mip_level_layout(
+            self.h_record_id,
+            self.h_width,
+            self.h_height,
+            self.get_mipmaps_count(),
+            ea_img_signature,
+            bool(self.h_flag2_swizzled or self.new_shape_flag_swizzled),
+        )
@@ -0,0 +1,192 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from importlib import metadata
+from typing import Dict, Optional
+
+from reversebox.common.logger import get_logger
+
+from src.EA_Image.constants import (
+    DEFAULT_DISK_CACHE_BYTE_BUDGET,
+    DISK_CACHE_FORMAT_VERSION,
+)
+from src.EA_Image.dto import DecodeJobDTO
+
+logger = get_logger(__name__)
+
+
+def get_disk_cache_version_stamp() -> str:
+    # cached data must be invalidated when cache format or decoders (ReverseBox) change
+    try:
+        reversebox_version: str = metadata.version("ReverseBox")
+    except metadata.PackageNotFoundError:
+        reversebox_version = "unknown"
+    return f"{DISK_CACHE_FORMAT_VERSION}-reversebox-{reversebox_version}"
+
+
+class DiskDecodeCache:
+    """
+    Persistent cache for decoded (RGBA8888) image data.
+    Key is a hash of everything that affects decoding (raw data, entry type, dimensions,
+    swizzle flag, platform signature and resolved palette), so the same texture
+    is found again even if it's stored in different files.
+    Data is compressed with zlib. Total size of the cache directory is limited by byte budget,
+    files that were not used recently are removed first (modification time is updated on each hit).
+    """
+
+    cache_file_extension: str = ".rgba.z"
+    version_file_name: str = "version.txt"
+
+    def __init__(self, cache_directory_path: str, byte_budget: int = DEFAULT_DISK_CACHE_BYTE_BUDGET):
+        self.cache_directory_path: str = cache_directory_path
+        self.byte_budget: int = byte_budget
+        self.version_stamp: str = get_disk_cache_version_stamp()
+        self.current_size: Optional[int] = None  # calculated on first write
+        self.lock = threading.Lock()
+        self._check_version()
+
+    def _check_version(self) -> None:
+        version_file_path: str = os.path.join(self.cache_directory_path, self.version_file_name)
+        try:
+            with open(version_file_path, "rt") as version_file:
+                if version_file.read().strip() == self.version_stamp:
+                    return
+        except OSError:
+            pass
+
+        # no cache yet or cache created by different version
+        logger.info(f"Initializing disk decode cache in {self.cache_directory_path}")
+        self.clear()
+        try:
+            os.makedirs(self.cache_directory_path, exist_ok=True)
+            with open(version_file_path, "wt") as version_file:
+                version_file.write(self.version_stamp)
+        except OSError as error:
+            logger.error(f"Can't initialize disk decode cache! Error: {error}")
+
+    def get_key(self, decode_job: DecodeJobDTO) -> str:
+        key_hash = hashlib.blake2b(digest_size=20)
+        key_hash.update(self.version_stamp.encode("utf8"))
+        key_hash.update(
+            struct.pack(
+                "<IIIIB",
+                decode_job.entry_type,
+                decode_job.img_width,
+                decode_job.img_height,
+                decode_job.img_bpp,
+                decode_job.is_swizzled,
+            )
+        )
+        key_hash.update(str(decode_job.ea_img_signature).encode("utf8"))
+        palette_info_dto = decode_job.palette_info_dto
+        key_hash.update(struct.pack("<iB", palette_info_dto.entry_id, palette_info_dto.swizzle_flag))
+        key_hash.update(struct.pack("<Q", len(palette_info_dto.data)))
+        key_hash.update(palette_info_dto.data)
+        key_hash.update(decode_job.image_data)
+        return key_hash.hexdigest()
+
+    def _get_cache_file_path(self, key: str) -> str:
+        return os.path.join(self.cache_directory_path, key[:2], key + self.cache_file_extension)
+
+    def get(self, key: str) -> Optional[bytes]:
+        cache_file_path: str = self._get_cache_file_path(key)
+        try:
+            with open(cache_file_path, "rb") as cache_file:
+                data: bytes = zlib.decompress(cache_file.read())
+            os.utime(cache_file_path)  # mark as recently used
+            return data
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error) as error:
+            logger.warning(f"Broken disk cache file {cache_file_path}. Error: {error}")
+            self._remove_file(cache_file_path)
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        compressed_data: bytes = zlib.compress(data, 1)
+        if len(compressed_data) > self.byte_budget:
+            return
+        cache_file_path: str = self._get_cache_file_path(key)
+        try:
+            os.makedirs(os.path.dirname(cache_file_path), exist_ok=True)
+            # write to temporary file first, so other processes never see partially written data
+            temp_file_handle, temp_file_path = tempfile.mkstemp(dir=os.path.dirname(cache_file_path), suffix=".tmp")
+            with os.fdopen(temp_file_handle, "wb") as temp_file:
+                temp_file.write(compressed_data)
+            os.replace(temp_file_path, cache_file_path)
+        except OSError as error:
+            logger.error(f"Can't write disk cache file {cache_file_path}. Error: {error}")
+            return
+
+        with self.lock:
+            if self.current_size is None:
+                self.current_size = self._get_directory_size()
+            else:
+                self.current_size += len(compressed_data)
+            if self.current_size > self.byte_budget:
+                self._evict()
+
+    def clear(self) -> None:
+        # only cache files are removed, in case cache directory contains anything else
+        with self.lock:
+            for _, _, cache_file_path in self._get_cache_files():
+                self._remove_file(cache_file_path)
+            self.current_size = 0
+
+    def _get_cache_files(self) -> list:
+        cache_files: list = []
+        for directory_path, _, file_names in os.walk(self.cache_directory_path):
+            for file_name in file_names:
+                if not file_name.endswith(self.cache_file_extension):
+                    continue
+                try:
+                    file_stat = os.stat(os.path.join(directory_path, file_name))
+                except OSError:
+                    continue  # removed by other process
+                cache_files.append((file_stat.st_mtime, file_stat.st_size, os.path.join(directory_path, file_name)))
+        return cache_files
+
+    def _get_directory_size(self) -> int:
+        return sum(file_size for _, file_size, _ in self._get_cache_files())
+
+    def _evict(self) -> None:
+        # cache is trimmed a bit below the budget, so directory isn't scanned again on every write
+        target_size: int = int(self.byte_budget * 0.9)
+        cache_files: list = sorted(self._get_cache_files())  # least recently used first
+        self.current_size = sum(file_size for _, file_size, _ in cache_files)
+        for _, file_size, cache_file_path in cache_files:
+            if self.current_size <= target_size:
+                break
+            if self._remove_file(cache_file_path):
+                self.current_size -= file_size
+
+    @staticmethod
+    def _remove_file(file_path: str) -> bool:
+        try:
+            os.remove(file_path)
+            return True
+        except OSError:
+            return False
+
+
+# one cache instance per directory in each process, so the cache directory is scanned (for its size) only once
+disk_decode_caches: Dict[str, DiskDecodeCache] = {}
+disk_decode_caches_lock = threading.Lock()
+
+
+def get_disk_decode_cache(cache_directory_path: str) -> DiskDecodeCache:
+    cache_key: str = os.path.abspath(cache_directory_path)
+    with disk_decode_caches_lock:
+        disk_cache: Optional[DiskDecodeCache] = disk_decode_caches.get(cache_key)
+        if disk_cache is None:
+            disk_cache = DiskDecodeCache(cache_directory_path)
+            disk_decode_caches[cache_key] = disk_cache
+        return disk_cache
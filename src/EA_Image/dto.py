@@ -3,7 +3,12 @@ Copyright © 2025  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from src.EA_Image.constants import (
+    DEFAULT_BC_ENCODE_PRESET,
+    DEFAULT_REFPACK_COMPRESSION_LEVEL,
+)
 
 
 @dataclass
@@ -11,6 +16,40 @@ class PaletteInfoDTO:
     entry_id: int
     data: bytes
     swizzle_flag: bool
+    rgba8888_luts: dict = field(default_factory=dict, repr=False, compare=False)  # see palette_lut.py
+
+
+@dataclass
+class DecodeJobDTO:
+    entry_type: int
+    image_data: bytes
+    img_width: int
+    img_height: int
+    img_bpp: int
+    is_swizzled: bool
+    ea_img_signature: str
+    palette_info_dto: PaletteInfoDTO
+
+
+@dataclass
+class MipLevelDTO:
+    level: int  # 0 is the main image
+    img_width: int
+    img_height: int
+    data_offset: int  # offset in image data after decompression
+    data_size: int
+
+
+@dataclass
+class TocEntryDTO:
+    tag: str
+    entry_offset: int
+    entry_size: int
+    record_id: int
+    img_width: int
+    img_height: int
+    mipmaps_count: int
+    is_compressed: bool
 
 
 @dataclass
@@ -25,3 +64,36 @@ class EncodeInfoDTO:
 class PartialEncodeInfoDTO:
     encoded_image_data: bytes
     encoded_palette_data: bytes
+
+
+@dataclass
+class EncodeOptionsDTO:
+    mipmaps_resampling_type_str: str = "nearest"
+    palette_quantizer: str = "kmeans"
+    palette_dithering: bool = False
+    bc_encode_preset: str = DEFAULT_BC_ENCODE_PRESET
+    refpack_compression_level: str = DEFAULT_REFPACK_COMPRESSION_LEVEL
+    allow_data_growth: bool = False
+
+
+@dataclass
+class EncodeJobDTO:
+    entry_type: int
+    img_width: int
+    img_height: int
+    img_bpp: int
+    mipmaps_count: int
+    is_swizzled: bool
+    ea_img_signature: str
+    palette_info_dto: PaletteInfoDTO
+    raw_data_size: int
+    encode_options: EncodeOptionsDTO = field(default_factory=EncodeOptionsDTO)
+
+
+@dataclass
+class ImportResultDTO:
+    entry_id: str  # id of the dir entry (also used as tree view tag)
+    tag: str
+    image_file_path: str
+    is_imported: bool
+    error_message: str
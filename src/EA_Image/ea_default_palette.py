@@ -130,3 +130,5 @@ ea_default_palette_data: list[int] = [
     0xC0, 0xEA, 0x5A, 0x0E, 0x1C, 0x44, 0xE4, 0x2A,
     0xFB, 0xF6, 0x77, 0x31, 0xA8, 0xE9, 0xC8, 0x05
 ]
+
+ea_default_palette_bytes: bytes = bytes(ea_default_palette_data)
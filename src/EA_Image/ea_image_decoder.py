@@ -3,377 +3,472 @@ Copyright © 2025  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
-from typing import Optional
+import dataclasses
+import traceback
+from typing import Callable, Dict, Optional, Tuple
 
+import numpy as np
 from reversebox.common.logger import get_logger
+from reversebox.compression.compression_refpack import RefpackHandler
+from reversebox.image.decoders.gst_decoder_encoder import GSTImageDecoderEncoder
 from reversebox.image.image_decoder import ImageDecoder
 from reversebox.image.image_formats import ImageFormats
 
-from src.EA_Image.common import (
-    get_bpp_for_image_type,
-    get_indexed_image_format,
-    get_indexed_palette_format,
+from src.EA_Image.codec_registry import (
+    DECODE_COMPRESSED,
+    DECODE_GST,
+    DECODE_INDEXED,
+    DECODE_INLINE_PALETTE,
+    DECODE_N64,
+    DECODE_PIXEL,
+    DECODE_PSP_DXT,
+    DECODE_RAW,
+    DECODE_YUV,
+    CodecInfo,
+    get_codec_info,
 )
-from src.EA_Image.common_ea_dir import is_image_swizzled
-from src.EA_Image.dir_entry import DirEntry
-from src.EA_Image.dto import PaletteInfoDTO
+from src.EA_Image.common import get_indexed_image_format, get_indexed_palette_format
+from src.EA_Image.common_ea_dir import handle_image_swizzle_logic, is_image_compressed
+from src.EA_Image.dto import DecodeJobDTO, MipLevelDTO, PaletteInfoDTO
+from src.EA_Image.palette_lut import (
+    PALETTE_LUT_IMAGE_FORMATS,
+    decode_indexed_image_with_lut,
+    decode_palette_to_rgba8888,
+    get_palette_rgba8888_lut,
+    render_index_plane,
+    render_index_plane_into,
+    unpack_palette_indices,
+)
+from src.EA_Image.psp_padding import is_psp_padding_used, remove_psp_padding
 
 logger = get_logger(__name__)
 
+# decoder is stateless, so one instance is reused for all images
+image_decoder: ImageDecoder = ImageDecoder()
 
-def decode_image_data_by_entry_type(
-    entry_type: int, image_data: bytes, palette_info_dto: PaletteInfoDTO, ea_dir_entry: DirEntry
-) -> Optional[bytes]:
-    ea_image_decoder: ImageDecoder = ImageDecoder()
+# channel order of output buffers (indices of RGBA8888 channels)
+PIXEL_ORDER_CHANNELS: Dict[str, Tuple[int, ...]] = {
+    "RGBA": (0, 1, 2, 3),
+    "BGRA": (2, 1, 0, 3),
+}
 
-    if entry_type == 1:
-        return ea_image_decoder.decode_indexed_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-        )
-    elif entry_type == 2:
 
-        if len(palette_info_dto.data) == 0:
-            logger.error("Error while converting palette data for type 2!")
-            return
+def get_prepared_image_data(decode_job: DecodeJobDTO) -> Tuple[int, bytes]:
+    """
+    Runs all steps before decoding (decompress, unswizzle, remove padding).
+    Returns entry type without compression flag and image data ready for decoding.
+    """
+    image_data: bytes = get_decompressed_image_data(decode_job)
+    entry_type: int = decode_job.entry_type & 0x7F
 
-        return ea_image_decoder.decode_indexed_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-        )
-    elif entry_type == 3:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.RGBA5551
-        )
-    elif entry_type == 4:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.RGB888
-        )
-    elif entry_type == 5:
-        return image_data  # r8g8b8a8
-    elif entry_type == 8:
-        return ea_image_decoder.decode_gst_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            ImageFormats.GST121,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-            is_swizzled=is_image_swizzled(ea_dir_entry),
-        )
-    elif entry_type == 9:
-        return ea_image_decoder.decode_gst_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            ImageFormats.GST221,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-            is_swizzled=is_image_swizzled(ea_dir_entry),
-        )
-    elif entry_type == 10:
-        return ea_image_decoder.decode_gst_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            ImageFormats.GST421,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-            is_swizzled=is_image_swizzled(ea_dir_entry),
-        )
-    elif entry_type == 11:
-        return ea_image_decoder.decode_gst_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            ImageFormats.GST821,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-            is_swizzled=is_image_swizzled(ea_dir_entry),
-        )
-    elif entry_type == 12:
-        return ea_image_decoder.decode_gst_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            ImageFormats.GST122,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-            is_swizzled=is_image_swizzled(ea_dir_entry),
-        )
-    elif entry_type == 13:
-        return ea_image_decoder.decode_gst_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            ImageFormats.GST222,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-            is_swizzled=is_image_swizzled(ea_dir_entry),
-        )
-    elif entry_type == 14:
-        return ea_image_decoder.decode_gst_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            ImageFormats.GST422,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-            is_swizzled=is_image_swizzled(ea_dir_entry),
-        )
-    elif entry_type == 15:
-        return ea_image_decoder.decode_gst_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            ImageFormats.GST822,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-            is_swizzled=is_image_swizzled(ea_dir_entry),
-        )
-    elif entry_type == 20:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.RGB565, image_endianess="big"
-        )
-    elif entry_type == 21:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.N64_BGR5A3, image_endianess="big"
-        )
-    elif entry_type == 22:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.ARGB8888
-        )
-    elif entry_type == 24:
-        return ea_image_decoder.decode_indexed_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-            image_endianess="big",
-            palette_endianess="big",
-        )
-    elif entry_type == 25:
-        return ea_image_decoder.decode_indexed_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-            image_endianess="big",
-            palette_endianess="big",
-        )
-    elif entry_type == 30:
-        return ea_image_decoder.decode_n64_image(
-            image_data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            ImageFormats.N64_CMPR,
-        )
-    elif entry_type == 33:
-        return image_data  # palette
-    elif entry_type == 34:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.XRGB1555
-        )  # palette
-    elif entry_type == 35:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.XRGB1555
-        )  # palette
-    elif entry_type == 36:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.RGB888
-        )  # palette
-    elif entry_type == 42:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.RGBA8888
-        )  # palette
-    elif entry_type == 59:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.XRGB1555
-        )  # palette
-    elif entry_type == 64:
-        return ea_image_decoder.decode_indexed_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-        )
-    elif entry_type == 65:
-        return ea_image_decoder.decode_indexed_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-        )
-    elif entry_type == 66:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.RGBT5551
-        )
-    elif entry_type == 67:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.RGB888
-        )
-    elif entry_type == 69:
-        return ea_image_decoder.decode_psp_dxt_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.PSP_DXT1
-        )
-    elif entry_type == 70:
-        return ea_image_decoder.decode_psp_dxt_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.PSP_DXT3
-        )
-    elif entry_type == 71:
-        return ea_image_decoder.decode_psp_dxt_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.PSP_DXT5
-        )
-    elif entry_type == 88:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.RGB565
-        )
-    elif entry_type == 89:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.RGB565
-        )
-    elif entry_type == 90:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.RGBX4444
-        )
-    elif entry_type == 91:
-        return image_data  # r8g8b8a8
-    elif entry_type == 92:
-        return ea_image_decoder.decode_indexed_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-        )
-    elif entry_type == 93:
-        return ea_image_decoder.decode_indexed_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
+    # unswizzling logic
+    if decode_job.is_swizzled:
+        image_data = handle_image_swizzle_logic(
+            image_data, entry_type, decode_job.img_width, decode_job.img_height, decode_job.ea_img_signature, False
         )
-    elif entry_type == 96:
-        return ea_image_decoder.decode_compressed_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.BC1_DXT1
-        )
-    elif entry_type == 97:
-        return ea_image_decoder.decode_compressed_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.BC2_DXT3
-        )
-    elif entry_type == 98:
-        return ea_image_decoder.decode_compressed_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.BC3_DXT5
-        )
-    elif entry_type == 100:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.GRAY8
-        )
-    elif entry_type == 101:
-        return ea_image_decoder.decode_n64_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.N64_IA8
-        )
-    elif entry_type == 104:
-        return ea_image_decoder.decode_yuv_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.YUV422_YUY2
-        )
-    elif entry_type == 109:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.BGRA4444
-        )
-    elif entry_type == 115:
-        return ea_image_decoder.decode_indexed_image(
-            image_data[1024:],
-            image_data[:1024],
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            ImageFormats.PAL8,
-            ImageFormats.RGBA8888,
-            image_endianess="big",
-        )
-    elif entry_type == 119:
-        return ea_image_decoder.decode_indexed_image(
-            image_data[64:],
-            image_data[:64],
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            ImageFormats.PAL4,
-            ImageFormats.RGBA8888,
-            image_endianess="big",
-        )
-    elif entry_type == 120:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.BGR565
-        )
-    elif entry_type == 121:
-        return ea_image_decoder.decode_indexed_image(
-            image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-        )
-    elif entry_type == 122:
-        return ea_image_decoder.decode_indexed_image(
+
+    # padding logic
+    if is_psp_padding_used(decode_job.ea_img_signature, entry_type):
+        image_data = remove_psp_padding(image_data, decode_job.img_width, decode_job.img_height, decode_job.img_bpp)
+
+    return entry_type, image_data
+
+
+def get_decompressed_image_data(decode_job: DecodeJobDTO) -> bytes:
+    if is_image_compressed(decode_job.entry_type):
+        return RefpackHandler().decompress_data(decode_job.image_data)
+    return decode_job.image_data
+
+
+def get_mip_level_decode_job(
+    decode_job: DecodeJobDTO, mip_level: MipLevelDTO, decompressed_image_data: Optional[bytes] = None
+) -> Optional[DecodeJobDTO]:
+    """
+    Returns job for decoding one mipmap level (data of this level only, with level dimensions).
+    Returns None if level is not stored in image data.
+    """
+    if decompressed_image_data is None:
+        decompressed_image_data = get_decompressed_image_data(decode_job)
+    start_offset: int = mip_level.data_offset
+    end_offset: int = start_offset + mip_level.data_size
+    if end_offset > len(decompressed_image_data):
+        logger.warning(
+            f"Mipmap level {mip_level.level} is out of image data! "
+            f"Level_end_offset: {end_offset}, Image_data_size: {len(decompressed_image_data)}"
+        )
+        return None
+
+    entry_type: int = decode_job.entry_type & 0x7F
+    codec_info: Optional[CodecInfo] = get_codec_info(entry_type)
+    level_data: bytes = decompressed_image_data[start_offset:end_offset]
+    if codec_info and codec_info.decode_kind == DECODE_INLINE_PALETTE:  # each level is decoded with the same palette
+        level_data = decompressed_image_data[: codec_info.inline_palette_size] + level_data
+    return dataclasses.replace(
+        decode_job,
+        entry_type=entry_type,
+        image_data=level_data,
+        img_width=mip_level.img_width,
+        img_height=mip_level.img_height,
+    )
+
+
+def decode_ea_image_job(decode_job: DecodeJobDTO) -> Optional[bytes]:
+    """
+    Runs the whole conversion chain (decompress, unswizzle, remove padding, decode) for one image.
+    Job contains only plain data, so this function can be executed in worker processes.
+    """
+    entry_type, image_data = get_prepared_image_data(decode_job)
+    return _decode_prepared_image_data(decode_job, entry_type, image_data)
+
+
+def get_output_array(output_buffer, data_size: int) -> np.ndarray:
+    """
+    Returns writable view of caller-provided buffer (bytearray, NumPy array, shared memory etc.)
+    with shape (pixel_count, 4). Nothing is copied.
+    """
+    output_array: np.ndarray = np.frombuffer(output_buffer, dtype=np.uint8)
+    if not output_array.flags.writeable:
+        raise Exception("Output buffer is read-only!")
+    if len(output_array) < data_size:
+        raise Exception(f"Output buffer too small! Buffer_size: {len(output_array)}, Required_size: {data_size}")
+    return output_array[:data_size].reshape(-1, 4)
+
+
+def copy_rgba8888_data_into(rgba8888_data: bytes, output_buffer, pixel_order: str = "RGBA") -> int:
+    output_array: np.ndarray = get_output_array(output_buffer, len(rgba8888_data))
+    rgba8888_array: np.ndarray = np.frombuffer(rgba8888_data, dtype=np.uint8).reshape(-1, 4)
+    if pixel_order == "RGBA":
+        output_array[:] = rgba8888_array
+    else:  # channels are copied one by one, so no temporary array is created
+        for output_channel, input_channel in enumerate(PIXEL_ORDER_CHANNELS[pixel_order]):
+            output_array[:, output_channel] = rgba8888_array[:, input_channel]
+    return len(rgba8888_data)
+
+
+def get_rgba8888_data_from_buffer(output_buffer, data_size: int, pixel_order: str = "RGBA") -> bytes:
+    # reverse of copy_rgba8888_data_into, e.g. for storing data decoded into buffer in disk cache
+    output_array: np.ndarray = np.frombuffer(output_buffer, dtype=np.uint8, count=data_size).reshape(-1, 4)
+    if pixel_order == "RGBA":
+        return output_array.tobytes()
+    return output_array[:, np.argsort(PIXEL_ORDER_CHANNELS[pixel_order])].tobytes()
+
+
+def decode_ea_image_job_into(decode_job: DecodeJobDTO, output_buffer, pixel_order: str = "RGBA") -> int:
+    """
+    The same as decode_ea_image_job, but decoded pixels are written into caller-provided buffer
+    in RGBA or BGRA order, so one buffer can be reused for many images.
+    Returns number of written bytes (0 if image can't be decoded).
+    """
+    if pixel_order not in PIXEL_ORDER_CHANNELS:
+        raise Exception(f"Pixel order {pixel_order} not supported!")
+    data_size: int = decode_job.img_width * decode_job.img_height * 4
+    output_array: np.ndarray = get_output_array(output_buffer, data_size)
+    entry_type, image_data = get_prepared_image_data(decode_job)
+
+    # indexed images are rendered straight into the buffer
+    codec_info: Optional[CodecInfo] = get_codec_info(entry_type)
+    try:
+        palette_lut: Optional[np.ndarray] = (
+            get_palette_rgba8888_lut_for_codec(codec_info, decode_job.palette_info_dto) if codec_info else None
+        )
+        if palette_lut is not None:
+            index_plane: Optional[bytes] = get_index_plane_data(
+                entry_type, image_data, decode_job.img_width, decode_job.img_height, decode_job.is_swizzled
+            )
+            if index_plane is not None:
+                if pixel_order != "RGBA":
+                    palette_lut = palette_lut[:, PIXEL_ORDER_CHANNELS[pixel_order]]
+                render_index_plane_into(index_plane, palette_lut, output_array)
+                return data_size
+    except Exception as error:
+        logger.error(f"Error while decoding EA image! Error: {error}")
+        return 0
+
+    img_convert_data: Optional[bytes] = _decode_prepared_image_data(decode_job, entry_type, image_data)
+    if not img_convert_data:
+        return 0
+    return copy_rgba8888_data_into(img_convert_data, output_array, pixel_order)
+
+
+def decode_ea_image_job_with_index_plane(decode_job: DecodeJobDTO) -> Tuple[Optional[bytes], Optional[bytes]]:
+    """
+    The same as decode_ea_image_job, but for indexed images it also returns index plane
+    (one palette index per pixel), so image can be rendered again with other palette without decoding.
+    """
+    entry_type, image_data = get_prepared_image_data(decode_job)
+    index_plane: Optional[bytes] = get_index_plane_data(
+        entry_type, image_data, decode_job.img_width, decode_job.img_height, decode_job.is_swizzled
+    )
+
+    # image is rendered from index plane, so indices are unpacked only once
+    codec_info: Optional[CodecInfo] = get_codec_info(entry_type)
+    if index_plane is not None and codec_info:
+        try:
+            palette_lut: Optional[np.ndarray] = get_palette_rgba8888_lut_for_codec(
+                codec_info, decode_job.palette_info_dto
+            )
+            if palette_lut is not None:
+                return render_index_plane(index_plane, palette_lut), index_plane
+        except Exception as error:
+            logger.error(f"Error while decoding EA image! Error: {error}")
+            return None, index_plane
+
+    return _decode_prepared_image_data(decode_job, entry_type, image_data), index_plane
+
+
+def decode_ea_image_index_plane(decode_job: DecodeJobDTO) -> Optional[bytes]:
+    entry_type, image_data = get_prepared_image_data(decode_job)
+    return get_index_plane_data(
+        entry_type, image_data, decode_job.img_width, decode_job.img_height, decode_job.is_swizzled
+    )
+
+
+def get_index_plane_data(
+    entry_type: int, image_data: bytes, img_width: int, img_height: int, is_swizzled: bool
+) -> Optional[bytes]:
+    # index planes are available for types which use palette from palette entry (PAL4/PAL8 and GST)
+    codec_info: Optional[CodecInfo] = get_codec_info(entry_type)
+    if not codec_info or codec_info.decode_kind not in (DECODE_INDEXED, DECODE_GST):
+        return None
+    image_format: ImageFormats = get_indexed_image_format(codec_info.bpp)
+    if image_format not in PALETTE_LUT_IMAGE_FORMATS:
+        return None
+    try:
+        if codec_info.decode_kind == DECODE_GST:
+            image_data = GSTImageDecoderEncoder().decode_gst_image_main(
+                image_data, img_width, img_height, codec_info.image_format, is_swizzled
+            )
+            image_endianess: str = "little"
+        else:
+            image_endianess = codec_info.image_endianess
+        return unpack_palette_indices(image_data, img_width * img_height, image_format, image_endianess).tobytes()
+    except Exception as error:
+        logger.error(f"Error while reading index plane! Error: {error}")
+        return None
+
+
+def _decode_prepared_image_data(decode_job: DecodeJobDTO, entry_type: int, image_data: bytes) -> Optional[bytes]:
+    # decoding logic
+    try:
+        img_convert_data: Optional[bytes] = decode_image_data_by_entry_type(
+            entry_type,
             image_data,
-            palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
-            get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-            image_endianess="big",
-        )
-    elif entry_type == 123:
-        # for i in range(1024):
-        #     palette_data += b"\x00"  # workaround for Need For Speed 2 PC, e.g. "TR000_QFS.fsh"
-        return ea_image_decoder.decode_indexed_image(
+            decode_job.palette_info_dto,
+            decode_job.img_width,
+            decode_job.img_height,
+            decode_job.is_swizzled,
+        )
+    except Exception as error:
+        logger.error(f"Error while decoding EA image! Error: {error}")
+        logger.error(traceback.format_exc())
+        return None
+
+    if not img_convert_data:
+        logger.error("Decoded image data is empty!")
+        return None
+
+    return img_convert_data
+
+
+def get_palette_rgba8888_lut_for_codec(codec_info: CodecInfo, palette_info_dto: PaletteInfoDTO) -> Optional[np.ndarray]:
+    """
+    Returns palette converted to RGBA8888 (cached in palette DTO) or None if lookup table can't be used for image type.
+    """
+    if codec_info.decode_kind not in (DECODE_INDEXED, DECODE_GST) or len(palette_info_dto.data) == 0:
+        return None
+    if get_indexed_image_format(codec_info.bpp) not in PALETTE_LUT_IMAGE_FORMATS:
+        return None
+    palette_format: ImageFormats = get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data))
+    palette_endianess: str = codec_info.palette_endianess if codec_info.decode_kind == DECODE_INDEXED else "little"
+    return get_palette_rgba8888_lut(palette_info_dto, palette_format, palette_endianess)
+
+
+def _decode_raw(
+    codec_info: CodecInfo,
+    image_data: bytes,
+    palette_info_dto: PaletteInfoDTO,
+    img_width: int,
+    img_height: int,
+    is_swizzled: bool,
+) -> bytes:
+    return image_data  # r8g8b8a8
+
+
+def _decode_pixel(
+    codec_info: CodecInfo,
+    image_data: bytes,
+    palette_info_dto: PaletteInfoDTO,
+    img_width: int,
+    img_height: int,
+    is_swizzled: bool,
+) -> bytes:
+    return image_decoder.decode_image(
+        image_data, img_width, img_height, codec_info.image_format, image_endianess=codec_info.image_endianess
+    )
+
+
+def _decode_indexed(
+    codec_info: CodecInfo,
+    image_data: bytes,
+    palette_info_dto: PaletteInfoDTO,
+    img_width: int,
+    img_height: int,
+    is_swizzled: bool,
+) -> Optional[bytes]:
+    if len(palette_info_dto.data) == 0:
+        logger.error(f"Error while converting palette data for type {codec_info.entry_type}!")
+        return None
+
+    # for type 123:
+    # for i in range(1024):
+    #     palette_data += b"\x00"  # workaround for Need For Speed 2 PC, e.g. "TR000_QFS.fsh"
+    image_format: ImageFormats = get_indexed_image_format(codec_info.bpp)
+    palette_lut: Optional[np.ndarray] = get_palette_rgba8888_lut_for_codec(codec_info, palette_info_dto)
+    if palette_lut is not None:
+        return decode_indexed_image_with_lut(
+            image_data, palette_lut, img_width, img_height, image_format, codec_info.image_endianess
+        )
+    return image_decoder.decode_indexed_image(
+        image_data,
+        palette_info_dto.data,
+        img_width,
+        img_height,
+        get_indexed_image_format(codec_info.bpp),
+        get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
+        image_endianess=codec_info.image_endianess,
+        palette_endianess=codec_info.palette_endianess,
+    )
+
+
+def _decode_inline_palette(
+    codec_info: CodecInfo,
+    image_data: bytes,
+    palette_info_dto: PaletteInfoDTO,
+    img_width: int,
+    img_height: int,
+    is_swizzled: bool,
+) -> bytes:
+    palette_size: int = codec_info.inline_palette_size
+    if codec_info.image_format in PALETTE_LUT_IMAGE_FORMATS:  # palette is used only once, so it's not cached
+        palette_lut: np.ndarray = np.frombuffer(
+            decode_palette_to_rgba8888(image_data[:palette_size], ImageFormats.RGBA8888, "little"), dtype=np.uint8
+        ).reshape(-1, 4)
+        return decode_indexed_image_with_lut(
+            image_data[palette_size:],
+            palette_lut,
+            img_width,
+            img_height,
+            codec_info.image_format,
+            codec_info.image_endianess,
+        )
+    return image_decoder.decode_indexed_image(
+        image_data[palette_size:],
+        image_data[:palette_size],
+        img_width,
+        img_height,
+        codec_info.image_format,
+        ImageFormats.RGBA8888,
+        image_endianess=codec_info.image_endianess,
+    )
+
+
+def _decode_gst(
+    codec_info: CodecInfo,
+    image_data: bytes,
+    palette_info_dto: PaletteInfoDTO,
+    img_width: int,
+    img_height: int,
+    is_swizzled: bool,
+) -> bytes:
+    palette_lut: Optional[np.ndarray] = get_palette_rgba8888_lut_for_codec(codec_info, palette_info_dto)
+    if palette_lut is None:
+        return image_decoder.decode_gst_image(
             image_data,
             palette_info_dto.data,
-            ea_dir_entry.h_width,
-            ea_dir_entry.h_height,
-            get_indexed_image_format(get_bpp_for_image_type(entry_type)),
+            img_width,
+            img_height,
+            codec_info.image_format,
+            get_indexed_image_format(codec_info.bpp),
             get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data)),
-        )
-    elif entry_type == 125:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.BGRA8888
-        )
-    elif entry_type == 126:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.BGRA5551
-        )
-    elif entry_type == 127:
-        return ea_image_decoder.decode_image(
-            image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ImageFormats.BGR888
-        )
-    else:
+            is_swizzled=is_swizzled,
+        )
+    gst_image_data: bytes = GSTImageDecoderEncoder().decode_gst_image_main(
+        image_data, img_width, img_height, codec_info.image_format, is_swizzled
+    )
+    return decode_indexed_image_with_lut(
+        gst_image_data, palette_lut, img_width, img_height, get_indexed_image_format(codec_info.bpp)
+    )
+
+
+def _decode_n64(
+    codec_info: CodecInfo,
+    image_data: bytes,
+    palette_info_dto: PaletteInfoDTO,
+    img_width: int,
+    img_height: int,
+    is_swizzled: bool,
+) -> bytes:
+    return image_decoder.decode_n64_image(image_data, img_width, img_height, codec_info.image_format)
+
+
+def _decode_psp_dxt(
+    codec_info: CodecInfo,
+    image_data: bytes,
+    palette_info_dto: PaletteInfoDTO,
+    img_width: int,
+    img_height: int,
+    is_swizzled: bool,
+) -> bytes:
+    return image_decoder.decode_psp_dxt_image(image_data, img_width, img_height, codec_info.image_format)
+
+
+def _decode_compressed(
+    codec_info: CodecInfo,
+    image_data: bytes,
+    palette_info_dto: PaletteInfoDTO,
+    img_width: int,
+    img_height: int,
+    is_swizzled: bool,
+) -> bytes:
+    return image_decoder.decode_compressed_image(image_data, img_width, img_height, codec_info.image_format)
+
+
+def _decode_yuv(
+    codec_info: CodecInfo,
+    image_data: bytes,
+    palette_info_dto: PaletteInfoDTO,
+    img_width: int,
+    img_height: int,
+    is_swizzled: bool,
+) -> bytes:
+    return image_decoder.decode_yuv_image(image_data, img_width, img_height, codec_info.image_format)
+
+
+decode_handlers: Dict[str, Callable] = {
+    DECODE_RAW: _decode_raw,
+    DECODE_PIXEL: _decode_pixel,
+    DECODE_INDEXED: _decode_indexed,
+    DECODE_INLINE_PALETTE: _decode_inline_palette,
+    DECODE_GST: _decode_gst,
+    DECODE_N64: _decode_n64,
+    DECODE_PSP_DXT: _decode_psp_dxt,
+    DECODE_COMPRESSED: _decode_compressed,
+    DECODE_YUV: _decode_yuv,
+}
+
+
+def decode_image_data_by_entry_type(
+    entry_type: int,
+    image_data: bytes,
+    palette_info_dto: PaletteInfoDTO,
+    img_width: int,
+    img_height: int,
+    is_swizzled: bool,
+) -> Optional[bytes]:
+    codec_info: Optional[CodecInfo] = get_codec_info(entry_type)
+    if not codec_info:
         logger.error(f"Unsupported type {entry_type} for convert and preview!")
-        return
+        return None
+    return decode_handlers[codec_info.decode_kind](
+        codec_info, image_data, palette_info_dto, img_width, img_height, is_swizzled
+    )
@@ -3,22 +3,33 @@ Copyright © 2024-2025  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+from typing import Callable, Dict, Optional
+
 import PIL.Image
 from reversebox.common.common import fill_data_with_padding_to_desired_length
 from reversebox.common.logger import get_logger
-from reversebox.compression.compression_refpack import RefpackHandler
 from reversebox.image.common import get_linear_image_data_size
 from reversebox.image.image_encoder import ImageEncoder
 from reversebox.image.image_formats import ImageFormats
 from reversebox.image.swizzling.swizzle_ps2 import swizzle_ps2_palette
 
+from src.EA_Image.bc_encoder import BC_ENCODE_SUPPORTED_FORMATS, encode_bc_image
+from src.EA_Image.codec_registry import (
+    ENCODE_COMPRESSED,
+    ENCODE_INDEXED,
+    ENCODE_INLINE_PALETTE,
+    ENCODE_N64,
+    ENCODE_PIXEL,
+    ENCODE_RAW,
+    CodecInfo,
+    get_codec_info,
+)
 from src.EA_Image.common import (
     get_bpp_for_image_type,
     get_indexed_image_format,
     get_indexed_palette_format,
 )
 from src.EA_Image.common_ea_dir import (
-    get_palette_info_dto_from_dir_entry,
     handle_image_swizzle_logic,
     is_image_compressed,
     is_image_swizzled,
@@ -28,20 +39,63 @@ from src.EA_Image.constants import (
     mipmaps_resampling_mapping,
 )
 from src.EA_Image.dir_entry import DirEntry
-from src.EA_Image.dto import EncodeInfoDTO, PaletteInfoDTO, PartialEncodeInfoDTO
+from src.EA_Image.dto import (
+    EncodeInfoDTO,
+    EncodeJobDTO,
+    EncodeOptionsDTO,
+    PaletteInfoDTO,
+    PartialEncodeInfoDTO,
+)
 from src.EA_Image.ea_image_main import EAImage
+from src.EA_Image.mipmaps import generate_mipmap_pyramid, get_mipmap_sizes
+from src.EA_Image.palette_quantizer import encode_indexed_image
+from src.EA_Image.psp_padding import add_psp_padding, is_psp_padding_used
+from src.EA_Image.refpack_encoder import compress_refpack_data
 
 logger = get_logger(__name__)
 
+# encoder is stateless, so one instance is reused for all images
+image_encoder: ImageEncoder = ImageEncoder()
+
 
-def encode_ea_image(rgba8888_data: bytes, ea_dir: DirEntry, ea_img: EAImage, gui_main) -> EncodeInfoDTO:
+def encode_ea_image(
+    rgba8888_data: bytes, ea_dir: DirEntry, ea_img: EAImage, encode_options: EncodeOptionsDTO
+) -> EncodeInfoDTO:
     logger.info("Initializing encode_ea_image")
-    entry_type: int = ea_dir.h_record_id & 0x7F
+    encode_job: EncodeJobDTO = get_encode_job(ea_dir, ea_img, encode_options)
+    return encode_ea_image_job(rgba8888_data, encode_job)
+
+
+def get_encode_job(
+    ea_dir: DirEntry, ea_img: EAImage, encode_options: Optional[EncodeOptionsDTO] = None
+) -> EncodeJobDTO:
+    # job contains only plain data, so it can be sent to worker processes
+    return EncodeJobDTO(
+        entry_type=ea_dir.h_record_id,
+        img_width=ea_dir.h_width,
+        img_height=ea_dir.h_height,
+        img_bpp=ea_dir.h_image_bpp,
+        mipmaps_count=ea_dir.get_mipmaps_count(),
+        is_swizzled=is_image_swizzled(ea_dir),
+        ea_img_signature=ea_img.sign,
+        palette_info_dto=ea_img.get_palette_info_dto(ea_dir),
+        raw_data_size=len(ea_dir.raw_data),
+        encode_options=encode_options or EncodeOptionsDTO(),
+    )
+
+
+def encode_ea_image_job(rgba8888_data: bytes, encode_job: EncodeJobDTO) -> EncodeInfoDTO:
+    """
+    Runs the whole encoding chain (encode, swizzle, compress, pad) for one image.
+    """
+    entry_type: int = encode_job.entry_type & 0x7F
+    palette_info_dto: PaletteInfoDTO = encode_job.palette_info_dto
     indexed_image_format: ImageFormats = get_indexed_image_format(get_bpp_for_image_type(entry_type))
-    palette_info_dto: PaletteInfoDTO = get_palette_info_dto_from_dir_entry(ea_dir, ea_img)
     palette_format: ImageFormats = get_indexed_palette_format(palette_info_dto.entry_id, len(palette_info_dto.data))
-    mipmaps_resampling_type_str: str = gui_main.current_mipmaps_resampling.get()
-    mipmaps_resampling_type: PIL.Image.Resampling = mipmaps_resampling_mapping[mipmaps_resampling_type_str]
+    encode_options: EncodeOptionsDTO = encode_job.encode_options
+    mipmaps_resampling_type: PIL.Image.Resampling = mipmaps_resampling_mapping[
+        encode_options.mipmaps_resampling_type_str
+    ]
 
     if entry_type not in IMPORT_IMAGES_SUPPORTED_TYPES:
         raise Exception("Image type not supported for encoding!")
@@ -50,65 +104,63 @@ def encode_ea_image(rgba8888_data: bytes, ea_dir: DirEntry, ea_img: EAImage, gui
     partial_image_info: PartialEncodeInfoDTO = encode_image_data_by_entry_type(
         entry_type,
         rgba8888_data,
-        ea_dir.h_width,
-        ea_dir.h_height,
+        encode_job.img_width,
+        encode_job.img_height,
         indexed_image_format,
         palette_format,
-        ea_dir.h_mipmaps_count if isinstance(ea_dir.h_mipmaps_count, int) else ea_dir.new_shape_number_of_mipmaps,
+        encode_job.mipmaps_count,
         mipmaps_resampling_type,
+        palette_info_dto,
+        encode_options,
     )
 
-    # swizzle logic
-    if is_image_swizzled(ea_dir):
-        start_offset: int = 0
-        image_size: int = get_linear_image_data_size(ea_dir.h_image_bpp, ea_dir.h_width, ea_dir.h_height)
-        end_offset: int = image_size
-        swizzled_image_data = handle_image_swizzle_logic(
-            partial_image_info.encoded_image_data[start_offset:end_offset],
-            entry_type,
-            ea_dir.h_width,
-            ea_dir.h_height,
-            ea_img.sign,
-            True,
+    # swizzle and PSP padding logic (main image and all mipmaps are converted separately into one output buffer)
+    is_psp_padded: bool = is_psp_padding_used(encode_job.ea_img_signature, entry_type)
+    if encode_job.is_swizzled or is_psp_padded:
+        encoded_image_data: memoryview = memoryview(partial_image_info.encoded_image_data)
+        mipmap_sizes: list = get_mipmap_sizes(encode_job.img_width, encode_job.img_height, encode_job.mipmaps_count)
+        levels_size: int = sum(
+            get_linear_image_data_size(encode_job.img_bpp, mip_width, mip_height)
+            for mip_width, mip_height in mipmap_sizes
         )
-
-        # mipmaps swizzle logic
-        if ea_dir.h_mipmaps_count and ea_dir.h_mipmaps_count > 0:
-            mip_width: int = ea_dir.h_width
-            mip_height: int = ea_dir.h_height
-            for i in range(ea_dir.h_mipmaps_count):
-                mip_width //= 2
-                mip_height //= 2
-                mipmap_size = get_linear_image_data_size(ea_dir.h_image_bpp, mip_width, mip_height)
-                start_offset = end_offset
-                end_offset = start_offset + mipmap_size
-
-                mip_swizzled_data = handle_image_swizzle_logic(
-                    partial_image_info.encoded_image_data[start_offset:end_offset],
-                    entry_type,
-                    mip_width,
-                    mip_height,
-                    ea_img.sign,
-                    True,
+        converted_image_data = bytearray(min(levels_size, len(encoded_image_data)))
+        start_offset: int = 0
+        converted_offset: int = 0  # converted levels may be padded (e.g. PSP mipmaps)
+        for mip_width, mip_height in mipmap_sizes:
+            if start_offset >= len(encoded_image_data):
+                break  # some types are encoded without mipmaps
+            end_offset: int = start_offset + get_linear_image_data_size(encode_job.img_bpp, mip_width, mip_height)
+            mip_data: bytes = bytes(encoded_image_data[start_offset:end_offset])
+            if encode_job.is_swizzled:  # PSP swizzle adds padding by itself
+                mip_data = handle_image_swizzle_logic(
+                    mip_data, entry_type, mip_width, mip_height, encode_job.ea_img_signature, True
                 )
-                swizzled_image_data += mip_swizzled_data
+            else:
+                mip_data = add_psp_padding(mip_data, mip_width, mip_height, encode_job.img_bpp)
+            converted_end_offset: int = converted_offset + len(mip_data)
+            converted_image_data[converted_offset:converted_end_offset] = mip_data
+            start_offset, converted_offset = end_offset, converted_end_offset
 
-        partial_image_info.encoded_image_data = swizzled_image_data
+        del converted_image_data[converted_offset:]
+        partial_image_info.encoded_image_data = bytes(converted_image_data)
 
     # compression logic
     if is_image_compressed(entry_type):
-        partial_image_info.encoded_image_data = RefpackHandler().compress_data(partial_image_info.encoded_image_data)
+        partial_image_info.encoded_image_data = compress_refpack_data(
+            partial_image_info.encoded_image_data, encode_options.refpack_compression_level
+        )
 
-    if len(partial_image_info.encoded_image_data) > len(ea_dir.raw_data):
+    # bigger data is allowed only if the file will be rebuilt on save
+    if len(partial_image_info.encoded_image_data) > encode_job.raw_data_size and not encode_options.allow_data_growth:
         raise Exception(
             f"Encoded data too big! "
             f"Encoded_data_size: {len(partial_image_info.encoded_image_data)}, "
-            f"Raw_data_size: {len(ea_dir.raw_data)}"
+            f"Raw_data_size: {encode_job.raw_data_size}"
         )
 
-    if len(partial_image_info.encoded_image_data) < len(ea_dir.raw_data):
+    if len(partial_image_info.encoded_image_data) < encode_job.raw_data_size:
         partial_image_info.encoded_image_data = fill_data_with_padding_to_desired_length(
-            partial_image_info.encoded_image_data, len(ea_dir.raw_data)
+            partial_image_info.encoded_image_data, encode_job.raw_data_size
         )
 
     if palette_info_dto.swizzle_flag:
@@ -122,8 +174,37 @@ def encode_ea_image(rgba8888_data: bytes, ea_dir: DirEntry, ea_img: EAImage, gui
     )
 
 
-def encode_image_data_by_entry_type(
-    entry_type: int,
+def apply_encode_info(
+    ea_dir: DirEntry, ea_img: EAImage, encode_info_dto: EncodeInfoDTO, allow_data_growth: bool = False
+) -> None:
+    """
+    Replaces raw data (and palette) of the entry with encoded data.
+    Bigger data is accepted only if "allow_data_growth" is set (file has to be rebuilt on save then).
+    """
+    new_data_size: int = len(encode_info_dto.encoded_img_data)
+    if new_data_size < len(ea_dir.raw_data) or (new_data_size > len(ea_dir.raw_data) and not allow_data_growth):
+        raise Exception(
+            f"Image data for import doesn't match. Can't import image! "
+            f"New data size: {len(encode_info_dto.encoded_img_data)}, "
+            f"Old data size: {len(ea_dir.raw_data)}"
+        )
+
+    ea_dir.raw_data = encode_info_dto.encoded_img_data
+    ea_dir.entry_import_flag = True
+
+    # replace palette data
+    if encode_info_dto.is_palette_imported_flag:
+        for bin_attach_entry in ea_dir.bin_attachments_list:
+            if bin_attach_entry.h_record_id == encode_info_dto.palette_entry_id:
+                bin_attach_entry.raw_data = encode_info_dto.encoded_palette_data
+                bin_attach_entry.import_flag = True
+        ea_img.invalidate_palette_index()  # palette will be resolved again from new data
+
+    ea_img.invalidate_img_convert_data(ea_dir)  # imported image will be decoded again for preview
+
+
+def _encode_raw(
+    codec_info: CodecInfo,
     rgba8888_data: bytes,
     img_width: int,
     img_height: int,
@@ -131,268 +212,175 @@ def encode_image_data_by_entry_type(
     palette_format: ImageFormats,
     mipmaps_count: int,
     mipmaps_resampling_type: PIL.Image.Resampling,
-) -> PartialEncodeInfoDTO:
-    image_encoder = ImageEncoder()
-    encoded_palette_data: bytes = b""
+    palette_info_dto: Optional[PaletteInfoDTO],
+    encode_options: EncodeOptionsDTO,
+) -> tuple:
+    return rgba8888_data, b""
 
-    if entry_type == 1:
-        encoded_image_data, encoded_palette_data = image_encoder.encode_indexed_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            indexed_image_format,
-            palette_format,
-            max_color_count=16,
-            number_of_mipmaps=mipmaps_count,
-        )
-    elif entry_type == 2:
-        encoded_image_data, encoded_palette_data = image_encoder.encode_indexed_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            indexed_image_format,
-            palette_format,
-            max_color_count=256,
-            number_of_mipmaps=mipmaps_count,
-        )
-    elif entry_type == 3:
-        encoded_image_data = image_encoder.encode_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            ImageFormats.RGBA5551,
-            number_of_mipmaps=mipmaps_count,
-            mipmaps_resampling_type=mipmaps_resampling_type,
-        )
-    elif entry_type == 4:
-        encoded_image_data = image_encoder.encode_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            ImageFormats.RGB888,
-            number_of_mipmaps=mipmaps_count,
-            mipmaps_resampling_type=mipmaps_resampling_type,
-        )
-    elif entry_type == 5:
-        encoded_image_data = rgba8888_data
-    elif entry_type == 21:
-        encoded_image_data = image_encoder.encode_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            ImageFormats.N64_BGR5A3,
-            image_endianess="big",
-            number_of_mipmaps=mipmaps_count,
-            mipmaps_resampling_type=mipmaps_resampling_type,
-        )
-    elif entry_type == 22:
-        encoded_image_data = image_encoder.encode_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            ImageFormats.ARGB8888,
-            number_of_mipmaps=mipmaps_count,
-            mipmaps_resampling_type=mipmaps_resampling_type,
-        )
-    elif entry_type == 24:
-        encoded_image_data, encoded_palette_data = image_encoder.encode_indexed_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            indexed_image_format,
-            palette_format,
-            image_endianess="big",
-            max_color_count=16,
-            number_of_mipmaps=mipmaps_count,
-        )
-    elif entry_type == 25:
-        encoded_image_data, encoded_palette_data = image_encoder.encode_indexed_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            indexed_image_format,
-            palette_format,
-            image_endianess="big",
-            max_color_count=256,
-            number_of_mipmaps=mipmaps_count,
-        )
-    elif entry_type == 30:
-        encoded_image_data = image_encoder.encode_n64_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            ImageFormats.N64_CMPR,
-        )
-    elif entry_type == 64:
-        encoded_image_data, encoded_palette_data = image_encoder.encode_indexed_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            indexed_image_format,
-            palette_format,
-            max_color_count=16,
-            number_of_mipmaps=mipmaps_count,
-        )
-    elif entry_type == 65:
-        encoded_image_data, encoded_palette_data = image_encoder.encode_indexed_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            indexed_image_format,
-            palette_format,
-            max_color_count=256,
-            number_of_mipmaps=mipmaps_count,
-        )
-    elif entry_type == 66:
-        encoded_image_data = image_encoder.encode_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            ImageFormats.RGBT5551,
-            number_of_mipmaps=mipmaps_count,
-            mipmaps_resampling_type=mipmaps_resampling_type,
-        )
-    elif entry_type in (88, 89):
-        encoded_image_data = image_encoder.encode_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            ImageFormats.RGB565,
-            number_of_mipmaps=mipmaps_count,
-            mipmaps_resampling_type=mipmaps_resampling_type,
-        )
-    elif entry_type == 90:
-        encoded_image_data = image_encoder.encode_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            ImageFormats.RGBX4444,
-            number_of_mipmaps=mipmaps_count,
-            mipmaps_resampling_type=mipmaps_resampling_type,
-        )
-    elif entry_type == 91:
-        encoded_image_data = rgba8888_data
-    elif entry_type == 92:
-        encoded_image_data, encoded_palette_data = image_encoder.encode_indexed_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            indexed_image_format,
-            palette_format,
-            max_color_count=16,
-            number_of_mipmaps=mipmaps_count,
-        )
-    elif entry_type == 93:
-        encoded_image_data, encoded_palette_data = image_encoder.encode_indexed_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            indexed_image_format,
-            palette_format,
-            max_color_count=256,
-            number_of_mipmaps=mipmaps_count,
-        )
-    elif entry_type == 96:
-        encoded_image_data = image_encoder.encode_compressed_image(
-            rgba8888_data, img_width, img_height, ImageFormats.BC1_DXT1  # TODO - mipmaps
-        )
-    elif entry_type == 97:
-        encoded_image_data = image_encoder.encode_compressed_image(
-            rgba8888_data, img_width, img_height, ImageFormats.BC2_DXT3  # TODO - mipmaps
-        )
-    elif entry_type == 98:
-        encoded_image_data = image_encoder.encode_compressed_image(
-            rgba8888_data, img_width, img_height, ImageFormats.BC3_DXT5  # TODO - mipmaps
-        )
-    elif entry_type == 109:
-        encoded_image_data = image_encoder.encode_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            ImageFormats.BGRA4444,
-            number_of_mipmaps=mipmaps_count,
-            mipmaps_resampling_type=mipmaps_resampling_type,
-        )
-    elif entry_type == 115:
-        encoded_image_data, temp_palette_data = image_encoder.encode_indexed_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            indexed_image_format,
-            palette_format,
-            max_color_count=256,
-            number_of_mipmaps=mipmaps_count,
-        )
-        encoded_image_data = temp_palette_data + encoded_image_data
-    elif entry_type == 119:
-        encoded_image_data, temp_palette_data = image_encoder.encode_indexed_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            indexed_image_format,
-            palette_format,
-            max_color_count=16,
-            number_of_mipmaps=mipmaps_count,
-            image_endianess="little",  # TODO - should work on "big", but it doesn't
-        )
-        encoded_image_data = temp_palette_data + encoded_image_data
-    elif entry_type == 120:
-        encoded_image_data = image_encoder.encode_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            ImageFormats.BGR565,
-            number_of_mipmaps=mipmaps_count,
-            mipmaps_resampling_type=mipmaps_resampling_type,
-        )
-    elif entry_type == 121:
-        encoded_image_data, encoded_palette_data = image_encoder.encode_indexed_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            indexed_image_format,
-            palette_format,
-            max_color_count=16,
-            number_of_mipmaps=mipmaps_count,
-        )
-    elif entry_type == 123:
-        encoded_image_data, encoded_palette_data = image_encoder.encode_indexed_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            indexed_image_format,
-            palette_format,
-            max_color_count=256,
-            number_of_mipmaps=mipmaps_count,
-        )
-    elif entry_type == 125:
-        encoded_image_data = image_encoder.encode_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            ImageFormats.BGRA8888,
-            number_of_mipmaps=mipmaps_count,
-            mipmaps_resampling_type=mipmaps_resampling_type,
-        )
-    elif entry_type == 126:
-        encoded_image_data = image_encoder.encode_image(
-            rgba8888_data,
-            img_width,
-            img_height,
-            ImageFormats.BGRA5551,
-            number_of_mipmaps=mipmaps_count,
-            mipmaps_resampling_type=mipmaps_resampling_type,
+
+def _encode_pixel(
+    codec_info: CodecInfo,
+    rgba8888_data: bytes,
+    img_width: int,
+    img_height: int,
+    indexed_image_format: ImageFormats,
+    palette_format: ImageFormats,
+    mipmaps_count: int,
+    mipmaps_resampling_type: PIL.Image.Resampling,
+    palette_info_dto: Optional[PaletteInfoDTO],
+    encode_options: EncodeOptionsDTO,
+) -> tuple:
+    # all mipmaps are generated at once and encoded level by level
+    mipmap_sizes: list = get_mipmap_sizes(img_width, img_height, mipmaps_count)
+    mipmaps_data: list = [rgba8888_data] + generate_mipmap_pyramid(
+        rgba8888_data, img_width, img_height, mipmaps_count, mipmaps_resampling_type
+    )
+    encoded_image_data: bytes = b"".join(
+        image_encoder.encode_image(
+            bytes(mip_rgba8888_data),
+            mip_width,
+            mip_height,
+            codec_info.image_format,
+            image_endianess=codec_info.encode_image_endianess or codec_info.image_endianess,
         )
-    elif entry_type == 127:
-        encoded_image_data = image_encoder.encode_image(
+        for mip_rgba8888_data, (mip_width, mip_height) in zip(mipmaps_data, mipmap_sizes)
+    )
+    return encoded_image_data, b""
+
+
+def _encode_indexed(
+    codec_info: CodecInfo,
+    rgba8888_data: bytes,
+    img_width: int,
+    img_height: int,
+    indexed_image_format: ImageFormats,
+    palette_format: ImageFormats,
+    mipmaps_count: int,
+    mipmaps_resampling_type: PIL.Image.Resampling,
+    palette_info_dto: Optional[PaletteInfoDTO],
+    encode_options: EncodeOptionsDTO,
+) -> tuple:
+    # existing palette is reused if it already contains all colors of the image
+    return encode_indexed_image(
+        rgba8888_data,
+        img_width,
+        img_height,
+        indexed_image_format,
+        palette_format,
+        codec_info.palette_color_count,
+        image_endianess=codec_info.encode_image_endianess or "little",
+        palette_endianess=codec_info.palette_endianess,
+        number_of_mipmaps=mipmaps_count,
+        existing_palette_data=palette_info_dto.data if palette_info_dto else None,
+        quantizer=encode_options.palette_quantizer,
+        use_dithering=encode_options.palette_dithering,
+    )
+
+
+def _encode_inline_palette(
+    codec_info: CodecInfo,
+    rgba8888_data: bytes,
+    img_width: int,
+    img_height: int,
+    indexed_image_format: ImageFormats,
+    palette_format: ImageFormats,
+    mipmaps_count: int,
+    mipmaps_resampling_type: PIL.Image.Resampling,
+    palette_info_dto: Optional[PaletteInfoDTO],
+    encode_options: EncodeOptionsDTO,
+) -> tuple:
+    encoded_image_data, temp_palette_data = _encode_indexed(
+        codec_info,
+        rgba8888_data,
+        img_width,
+        img_height,
+        indexed_image_format,
+        palette_format,
+        mipmaps_count,
+        mipmaps_resampling_type,
+        None,
+        encode_options,
+    )
+    return temp_palette_data + encoded_image_data, b""  # palette is stored before image data
+
+
+def _encode_n64(
+    codec_info: CodecInfo,
+    rgba8888_data: bytes,
+    img_width: int,
+    img_height: int,
+    indexed_image_format: ImageFormats,
+    palette_format: ImageFormats,
+    mipmaps_count: int,
+    mipmaps_resampling_type: PIL.Image.Resampling,
+    palette_info_dto: Optional[PaletteInfoDTO],
+    encode_options: EncodeOptionsDTO,
+) -> tuple:
+    return image_encoder.encode_n64_image(rgba8888_data, img_width, img_height, codec_info.image_format), b""
+
+
+def _encode_compressed(
+    codec_info: CodecInfo,
+    rgba8888_data: bytes,
+    img_width: int,
+    img_height: int,
+    indexed_image_format: ImageFormats,
+    palette_format: ImageFormats,
+    mipmaps_count: int,
+    mipmaps_resampling_type: PIL.Image.Resampling,
+    palette_info_dto: Optional[PaletteInfoDTO],
+    encode_options: EncodeOptionsDTO,
+) -> tuple:
+    if codec_info.image_format in BC_ENCODE_SUPPORTED_FORMATS:
+        encoded_image_data: bytes = encode_bc_image(
             rgba8888_data,
             img_width,
             img_height,
-            ImageFormats.BGR888,
-            number_of_mipmaps=mipmaps_count,
-            mipmaps_resampling_type=mipmaps_resampling_type,
+            codec_info.image_format,
+            mipmaps_count,
+            mipmaps_resampling_type,
+            encode_options.bc_encode_preset,
         )
-    else:
+        return encoded_image_data, b""
+    return image_encoder.encode_compressed_image(rgba8888_data, img_width, img_height, codec_info.image_format), b""
+
+
+encode_handlers: Dict[str, Callable] = {
+    ENCODE_RAW: _encode_raw,
+    ENCODE_PIXEL: _encode_pixel,
+    ENCODE_INDEXED: _encode_indexed,
+    ENCODE_INLINE_PALETTE: _encode_inline_palette,
+    ENCODE_N64: _encode_n64,
+    ENCODE_COMPRESSED: _encode_compressed,
+}
+
+
+def encode_image_data_by_entry_type(
+    entry_type: int,
+    rgba8888_data: bytes,
+    img_width: int,
+    img_height: int,
+    indexed_image_format: ImageFormats,
+    palette_format: ImageFormats,
+    mipmaps_count: int,
+    mipmaps_resampling_type: PIL.Image.Resampling,
+    palette_info_dto: Optional[PaletteInfoDTO] = None,
+    encode_options: Optional[EncodeOptionsDTO] = None,
+) -> PartialEncodeInfoDTO:
+    codec_info: Optional[CodecInfo] = get_codec_info(entry_type)
+    if not codec_info or not codec_info.encode_kind:
         raise Exception(f"Image type {entry_type} not supported for encoding!")
 
+    encoded_image_data, encoded_palette_data = encode_handlers[codec_info.encode_kind](
+        codec_info,
+        rgba8888_data,
+        img_width,
+        img_height,
+        indexed_image_format,
+        palette_format,
+        mipmaps_count,
+        mipmaps_resampling_type,
+        palette_info_dto,
+        encode_options or EncodeOptionsDTO(),
+    )
     return PartialEncodeInfoDTO(encoded_image_data=encoded_image_data, encoded_palette_data=encoded_palette_data)
@@ -3,14 +3,15 @@ Copyright © 2023-2025  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+import io
+import mmap
 import os
 import struct
-import traceback
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 from reversebox.common.logger import get_logger
-from reversebox.compression.compression_refpack import RefpackHandler
-from reversebox.image.image_padding import psp_image_padding
 
 from src.EA_Image.attachments.comment_entry import CommentEntry
 from src.EA_Image.attachments.hot_spot_entry import HotSpotEntry
@@ -18,9 +19,10 @@ from src.EA_Image.attachments.img_name_entry import ImgNameEntry
 from src.EA_Image.attachments.metal_bin_entry import MetalBinEntry
 from src.EA_Image.attachments.palette_entry import PaletteEntry
 from src.EA_Image.attachments.unknown_entry import UnknownEntry
+from src.EA_Image.codec_registry import CodecInfo, get_codec_info
 from src.EA_Image.common_ea_dir import (
     get_palette_info_dto_from_dir_entry,
-    handle_image_swizzle_logic,
+    get_shared_palette_info_dto,
     is_image_compressed,
     is_image_swizzled,
 )
@@ -30,20 +32,46 @@ from src.EA_Image.constants import (
     OLD_SHAPE_ALLOWED_SIGNATURES,
     PALETTE_TYPES,
 )
-from src.EA_Image.data_read import get_null_terminated_string, get_string
+from src.EA_Image.data_read import (
+    get_null_terminated_string,
+    get_string,
+    get_struct_layouts,
+    read_struct,
+)
+from src.EA_Image.decode_cache import DecodeCache, decode_cache
 from src.EA_Image.dir_entry import DirEntry
-from src.EA_Image.dto import PaletteInfoDTO
-from src.EA_Image.ea_image_decoder import decode_image_data_by_entry_type
+from src.EA_Image.disk_cache import DiskDecodeCache
+from src.EA_Image.dto import DecodeJobDTO, MipLevelDTO, PaletteInfoDTO, TocEntryDTO
+from src.EA_Image.ea_image_decoder import (
+    copy_rgba8888_data_into,
+    decode_ea_image_index_plane,
+    decode_ea_image_job,
+    decode_ea_image_job_into,
+    decode_ea_image_job_with_index_plane,
+    get_mip_level_decode_job,
+    get_palette_rgba8888_lut_for_codec,
+    get_rgba8888_data_from_buffer,
+)
+from src.EA_Image.memory_file import MemoryFile
+from src.EA_Image.mip_levels import get_smallest_mip_level_for_size
+from src.EA_Image.palette_lut import render_index_plane
+from src.EA_Image.refpack_decoder import decompress_refpack_file
 
 logger = get_logger(__name__)
 
 
 class EAImage:
+    # precompiled TOC entry layouts
+    old_shape_toc_entry_layouts: dict = get_struct_layouts("4sL")  # tag, offset
+    new_shape_toc_entry_layouts: dict = get_struct_layouts("2L")  # offset, size (null terminated tag follows)
+
     def __init__(self):
         self.sign = None
         self.total_f_size = -1
-        self.total_f_data: Optional[bytes] = None
+        self.total_f_data: Optional[bytes] = None  # bytes or memoryview of the mapping (memory mapped mode)
         self.is_total_f_data_compressed: bool = False
+        self.is_memory_mapped: bool = False
+        self.file_mapping: Optional[mmap.mmap] = None
         self.num_of_entries = -1
         self.format_version = None
         self.header_and_toc_size = None  # new shape only
@@ -55,12 +83,158 @@ class EAImage:
         self.f_endianess_desc = None
         self.f_size = None
         self.dir_entry_list = []
+        self.toc_entry_list: List[TocEntryDTO] = []  # filled in scan mode only
         self.ea_image_id = -1
         self.dir_entry_id = 0
+        self.decode_cache: DecodeCache = decode_cache
+        self.disk_cache: Optional[DiskDecodeCache] = None  # persistent cache is optional
+        self.palette_index: Dict[DirEntry, PaletteInfoDTO] = {}  # resolved palette for each image entry
+        self.shared_palette_info_dto: Optional[PaletteInfoDTO] = None
+        self.is_shared_palette_resolved: bool = False
+        self.keep_index_planes: bool = False  # keep palette indices of decoded images for fast re-rendering
 
     def set_ea_image_id(self, in_ea_image_id):
         self.ea_image_id = in_ea_image_id
 
+    def load_file(self, in_file_path: str, memory_mapped: bool = False) -> tuple:
+        """
+        Reads and parses the whole EA image file.
+        In memory mapped mode the file is mapped with mmap and "raw_data" of all dir entries
+        and bin attachments are memoryview slices of the mapping, so nothing is copied
+        until a decoder needs the bytes. Compressed (refpack) files are decompressed
+        into one preallocated buffer, which is always sliced the same way.
+        Returns result of the signature and size check.
+        """
+        in_file_name: str = os.path.basename(in_file_path)
+        with open(in_file_path, "rb") as ea_file:
+            sign: bytes = ea_file.read(2)
+            ea_file.seek(0)
+            if sign == b"\x10\xFB":
+                in_file_data = decompress_refpack_file(ea_file)  # decompressed into one preallocated buffer
+                if isinstance(in_file_data, mmap.mmap):
+                    self.file_mapping = in_file_data  # very big file, decompressed into temporary file
+                self.is_total_f_data_compressed = True
+                memory_mapped = True  # decompressed buffer is sliced without copying
+            elif memory_mapped and len(sign) > 0:
+                self.file_mapping = mmap.mmap(ea_file.fileno(), 0, access=mmap.ACCESS_READ)
+                in_file_data = self.file_mapping
+            else:
+                in_file_data = ea_file.read()
+
+        if memory_mapped:
+            in_file = MemoryFile(in_file_data)
+            self.is_memory_mapped = True
+            self.total_f_data = in_file.view
+        else:
+            in_file = io.BytesIO(in_file_data)
+            self.total_f_data = in_file_data
+
+        check_result = self.check_file_signature_and_size(in_file)
+        if check_result[0] != "OK":
+            return check_result
+
+        in_file.seek(0)
+        self.parse_header(in_file, in_file_path, in_file_name)
+        self.parse_directory(in_file)
+
+        # check if there are any bin attachments
+        # and add them to the list if found
+        self.parse_bin_attachments(in_file)
+        return check_result
+
+    def scan_toc(self, in_file_path: str) -> tuple:
+        """
+        Fast scan mode for listing and indexing.
+        Reads only file header, table of contents and header of each dir entry,
+        image data and bin attachments are skipped. Results are stored in "toc_entry_list".
+        Compressed (refpack) files need to be decompressed as a whole first.
+        Returns result of the signature and size check.
+        """
+        in_file_name: str = os.path.basename(in_file_path)
+        with open(in_file_path, "rb") as ea_file:
+            sign: bytes = ea_file.read(2)
+            ea_file.seek(0)
+            if sign == b"\x10\xFB":
+                self.is_total_f_data_compressed = True
+                return self._scan_toc(MemoryFile(decompress_refpack_file(ea_file)), in_file_path, in_file_name)
+            return self._scan_toc(ea_file, in_file_path, in_file_name)
+
+    def _scan_toc(self, in_file, in_file_path: str, in_file_name: str) -> tuple:
+        check_result = self.check_file_signature_and_size(in_file)
+        if check_result[0] != "OK":
+            return check_result
+
+        in_file.seek(0)
+        self.parse_header(in_file, in_file_path, in_file_name)
+        self.toc_entry_list = []
+        for ea_dir_entry in self.parse_toc(in_file):
+            in_file.seek(ea_dir_entry.start_offset)
+            ea_dir_entry.set_entry_header(in_file, self.f_endianess, self.sign)
+            self.toc_entry_list.append(self.get_toc_entry(ea_dir_entry))
+        return check_result
+
+    def get_toc_entry(self, ea_dir_entry: DirEntry) -> TocEntryDTO:
+        if self.sign in NEW_SHAPE_ALLOWED_SIGNATURES:
+            entry_size: int = ea_dir_entry.toc_entry_size
+            mipmaps_count: int = ea_dir_entry.new_shape_number_of_mipmaps
+        else:
+            entry_size: int = ea_dir_entry.end_offset - ea_dir_entry.start_offset
+            mipmaps_count: int = ea_dir_entry.h_mipmaps_count
+
+        return TocEntryDTO(
+            tag=ea_dir_entry.tag,
+            entry_offset=ea_dir_entry.start_offset,
+            entry_size=entry_size,
+            record_id=ea_dir_entry.h_record_id,
+            img_width=ea_dir_entry.h_width,
+            img_height=ea_dir_entry.h_height,
+            mipmaps_count=mipmaps_count,
+            is_compressed=is_image_compressed(ea_dir_entry.h_record_id),
+        )
+
+    def close(self) -> None:
+        # drop all references to file data, so the mapping can be released
+        for ea_dir_entry in self.dir_entry_list:
+            self.decode_cache.invalidate(ea_dir_entry)
+            self.invalidate_mip_level_data(ea_dir_entry)
+        self.dir_entry_list = []
+        self.invalidate_palette_index()
+        if isinstance(self.total_f_data, memoryview):
+            self.total_f_data.release()
+        self.total_f_data = None
+
+        if self.file_mapping is not None:
+            try:
+                self.file_mapping.close()
+            except BufferError:
+                logger.warning("File mapping is still in use. It will be released later.")
+            self.file_mapping = None
+
+    def release_file_mapping(self) -> None:
+        """
+        Copies all data still referenced from the mapped file into memory and closes the mapping,
+        e.g. before the mapped file is replaced on save (mapped files can't be replaced on Windows).
+        """
+        if self.file_mapping is None:
+            return
+        for ea_dir_entry in self.dir_entry_list:
+            if isinstance(ea_dir_entry.raw_data, memoryview):
+                ea_dir_entry.raw_data = bytes(ea_dir_entry.raw_data)
+            for bin_attach in ea_dir_entry.bin_attachments_list:
+                if isinstance(bin_attach.raw_data, memoryview):
+                    bin_attach.raw_data = bytes(bin_attach.raw_data)
+        if isinstance(self.total_f_data, memoryview):
+            total_f_data: bytes = bytes(self.total_f_data)
+            self.total_f_data.release()
+            self.total_f_data = total_f_data
+
+        try:
+            self.file_mapping.close()
+        except BufferError:
+            logger.warning("File mapping is still in use. It will be released later.")
+        self.file_mapping = None
+        self.is_memory_mapped = False
+
     def check_file_signature_and_size(self, in_file) -> tuple:
         try:
             # checking signature
@@ -136,7 +310,7 @@ class EAImage:
             _set_little_endianess()
         self.num_of_entries = struct.unpack(self.f_endianess + "L", in_file.read(4))[0]
         if self.sign in OLD_SHAPE_ALLOWED_SIGNATURES:
-            self.format_version = in_file.read(4).decode("utf8")  # e.g. "G354"
+            self.format_version = get_string(in_file, 4)  # e.g. "G354"
         elif self.sign in NEW_SHAPE_ALLOWED_SIGNATURES:
             self.header_and_toc_size = struct.unpack(self.f_endianess + "L", in_file.read(4))[0]
 
@@ -154,44 +328,48 @@ class EAImage:
 
         return True  # header has been parsed
 
-    def parse_directory(self, in_file) -> bool:
-        # creating directory entries
+    def parse_toc(self, in_file) -> List[DirEntry]:
+        """
+        Reads table of contents and returns list of dir entries (sorted by offset)
+        with start and end offsets set. Entry headers and data are not read here.
+        """
+        dir_entry_list: List[DirEntry] = []
         for i in range(self.num_of_entries):
             self.dir_entry_id += 1
             entry_id = str(self.ea_image_id) + "_direntry_" + str(self.dir_entry_id)
             ea_dir_entry = None
 
             if self.sign in OLD_SHAPE_ALLOWED_SIGNATURES:
-                entry_tag_bytes = in_file.read(4)
-                entry_tag = entry_tag_bytes.decode("utf8")
-                entry_offset = struct.unpack(self.f_dir_endianess + "L", in_file.read(4))[0]
-                ea_dir_entry = DirEntry(entry_id, entry_tag, entry_offset)
+                entry_tag, entry_offset = read_struct(in_file, self.old_shape_toc_entry_layouts, self.f_dir_endianess)
+                ea_dir_entry = DirEntry(entry_id, entry_tag.decode("utf8"), entry_offset)
             elif self.sign in NEW_SHAPE_ALLOWED_SIGNATURES:
-                entry_offset = struct.unpack(self.f_dir_endianess + "L", in_file.read(4))[0]
-                entry_size = struct.unpack(self.f_dir_endianess + "L", in_file.read(4))[0]  # noqa: F841
+                entry_offset, entry_size = read_struct(in_file, self.new_shape_toc_entry_layouts, self.f_dir_endianess)
                 entry_tag = get_null_terminated_string(in_file)
                 ea_dir_entry = DirEntry(entry_id, entry_tag, entry_offset)
+                ea_dir_entry.toc_entry_size = entry_size
 
-            self.dir_entry_list.append(ea_dir_entry)  # dir entry is now initialized and can be added to the list
+            dir_entry_list.append(ea_dir_entry)  # dir entry is now initialized and can be added to the list
 
         # sort dir entries by entry start offset
         # it can solve issues when dir entries are listed in random order in archive TOC
         # (e.g. The Need for Speed: Special Edition .FSH files)
-        self.dir_entry_list.sort(key=lambda d_entry: d_entry.start_offset)
+        dir_entry_list.sort(key=lambda d_entry: d_entry.start_offset)
 
         # updating end offset for each entry
-        # and parsing DIR entry data
-        entry_num = 0
-        for i in range(self.num_of_entries):
-            ea_dir_entry = self.dir_entry_list[i]
-            entry_num += 1
-
-            # set end offset for DIR entry
-            if entry_num == self.num_of_entries:
-                ea_dir_entry.end_offset = self.total_f_size
+        for i in range(len(dir_entry_list)):
+            if i == len(dir_entry_list) - 1:
+                dir_entry_list[i].end_offset = self.total_f_size
             else:
-                ea_dir_entry.end_offset = self.dir_entry_list[i + 1].start_offset
+                dir_entry_list[i].end_offset = dir_entry_list[i + 1].start_offset
+
+        return dir_entry_list
 
+    def parse_directory(self, in_file) -> bool:
+        # creating directory entries
+        self.dir_entry_list = self.parse_toc(in_file)
+
+        # parsing DIR entry data
+        for ea_dir_entry in self.dir_entry_list:
             in_file.seek(ea_dir_entry.start_offset)
             self.parse_dir_entry_header_and_data(in_file, ea_dir_entry)
 
@@ -270,7 +448,14 @@ class EAImage:
 
         return True
 
-    def convert_images(self, gui_main) -> bool:
+    def convert_images(self, gui_main, lazy: bool = False, max_workers: int = 1) -> bool:
+        """
+        Converts all supported images to RGBA8888.
+        In lazy mode images are only marked as supported and decoding is deferred
+        until RGBA data is requested with get_img_convert_data.
+        If max_workers is bigger than 1, images are decoded in parallel in worker processes.
+        """
+        entries_to_convert: list = []
         for i in range(self.num_of_entries):
             ea_dir_entry = self.dir_entry_list[i]
             entry_type = ea_dir_entry.h_record_id
@@ -281,52 +466,254 @@ class EAImage:
                 )
                 continue
 
+            ea_dir_entry.is_img_convert_supported = True
+            if lazy:
+                continue
+
+            if max_workers > 1:
+                entries_to_convert.append(ea_dir_entry)
+                continue
+
             logger.info(
                 f'Starting conversion for image {str(i+1)}, img_type={str(entry_type)}, img_tag="{ea_dir_entry.tag}"...'
             )
-            ea_dir_entry.is_img_convert_supported = True
             self.convert_image_data_for_export_and_preview(ea_dir_entry, entry_type, gui_main)
             logger.info(
                 f'Finished conversion for image {str(i + 1)}, img_type={str(entry_type)}, img_tag="{ea_dir_entry.tag}"...'
             )
-        return True
-
-    def convert_image_data_for_export_and_preview(self, ea_dir_entry: DirEntry, entry_type: int, gui_main) -> bool:
-        image_data: bytes = ea_dir_entry.raw_data
 
-        # decompress logic
-        if is_image_compressed(entry_type):
-            image_data = RefpackHandler().decompress_data(image_data)
-
-        entry_type = entry_type & 0x7F
-
-        # unswizzling logic
-        if is_image_swizzled(ea_dir_entry):
-            image_data = handle_image_swizzle_logic(
-                image_data, entry_type, ea_dir_entry.h_width, ea_dir_entry.h_height, self.sign, False
-            )
+        if entries_to_convert:
+            self.convert_images_parallel(entries_to_convert, max_workers)
+        return True
 
-        # padding logic
-        if self.sign in ("SHPM", "ShpM") and entry_type not in (69, 70, 71):  # PSP padding
-            image_data = psp_image_padding(
-                image_data, ea_dir_entry.h_width, ea_dir_entry.h_height, ea_dir_entry.h_image_bpp
+    def convert_images_parallel(self, entries_to_convert: list, max_workers: int) -> None:
+        pending_entries: list = []
+        decode_jobs: list = []
+        disk_cache_keys: list = []
+        for ea_dir_entry in entries_to_convert:
+            decode_job: DecodeJobDTO = self.get_decode_job(ea_dir_entry, ea_dir_entry.h_record_id)
+            if self.disk_cache:
+                disk_cache_key: str = self.disk_cache.get_key(decode_job)
+                ea_dir_entry.img_convert_data = self.disk_cache.get(disk_cache_key)
+                if ea_dir_entry.img_convert_data is not None:
+                    continue  # no need to decode it again
+                disk_cache_keys.append(disk_cache_key)
+            pending_entries.append(ea_dir_entry)
+            decode_jobs.append(decode_job)
+
+        logger.info(f"Starting parallel conversion of {len(decode_jobs)} images, max_workers={max_workers}...")
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # map() returns results in the same order as jobs were submitted
+            for i, img_convert_data in enumerate(executor.map(decode_ea_image_job, decode_jobs)):
+                pending_entries[i].img_convert_data = img_convert_data
+                if self.disk_cache and img_convert_data:
+                    self.disk_cache.put(disk_cache_keys[i], img_convert_data)
+        logger.info(f"Finished parallel conversion of {len(decode_jobs)} images...")
+
+    def get_img_convert_data(self, ea_dir_entry: DirEntry) -> Optional[bytes]:
+        """
+        Returns RGBA8888 data for dir entry.
+        Image is decoded on first request and kept in the LRU decode cache.
+        """
+        if ea_dir_entry.img_convert_data:
+            return ea_dir_entry.img_convert_data  # converted eagerly
+
+        img_convert_data: Optional[bytes] = self.decode_cache.get(ea_dir_entry)
+        if img_convert_data is not None:
+            return img_convert_data
+
+        if ea_dir_entry.index_plane is not None:  # e.g. after palette change
+            img_convert_data = self.render_image_with_palette(ea_dir_entry)
+            if img_convert_data:
+                self.decode_cache.put(ea_dir_entry, img_convert_data)
+                return img_convert_data
+
+        logger.info(
+            f'Decoding image on demand, img_type={str(ea_dir_entry.h_record_id)}, img_tag="{ea_dir_entry.tag}"...'
+        )
+        img_convert_data = self.decode_image_data(ea_dir_entry, ea_dir_entry.h_record_id)
+        if img_convert_data:
+            self.decode_cache.put(ea_dir_entry, img_convert_data)
+        return img_convert_data
+
+    def decode_image_data_into(self, ea_dir_entry: DirEntry, output_buffer, pixel_order: str = "RGBA") -> int:
+        """
+        Writes decoded image into caller-provided writable buffer (bytearray, NumPy array, shared memory etc.)
+        in RGBA or BGRA order. Buffer needs at least width * height * 4 bytes and it can be reused for next images.
+        Images already decoded (or found in disk cache) are copied, other images are decoded straight
+        into the buffer and they are not kept in the decode cache (only in disk cache, if it's enabled).
+        Returns number of written bytes (0 if image can't be decoded).
+        """
+        img_convert_data: Optional[bytes] = ea_dir_entry.img_convert_data or self.decode_cache.get(ea_dir_entry)
+        if img_convert_data is not None:
+            return copy_rgba8888_data_into(img_convert_data, output_buffer, pixel_order)
+
+        decode_job: DecodeJobDTO = self.get_decode_job(ea_dir_entry, ea_dir_entry.h_record_id)
+        disk_cache_key: Optional[str] = self.disk_cache.get_key(decode_job) if self.disk_cache else None
+        if disk_cache_key:
+            img_convert_data = self.disk_cache.get(disk_cache_key)
+            if img_convert_data is not None:
+                return copy_rgba8888_data_into(img_convert_data, output_buffer, pixel_order)
+
+        written_data_size: int = decode_ea_image_job_into(decode_job, output_buffer, pixel_order)
+        if disk_cache_key and written_data_size:
+            self.disk_cache.put(
+                disk_cache_key, get_rgba8888_data_from_buffer(output_buffer, written_data_size, pixel_order)
             )
-
-        # palette info logic
-        palette_info_dto: PaletteInfoDTO = get_palette_info_dto_from_dir_entry(ea_dir_entry, self)
-
-        # decoding logic
+        return written_data_size
+
+    def invalidate_img_convert_data(self, ea_dir_entry: DirEntry, keep_index_plane: bool = False) -> None:
+        # needs to be called after raw data (or palette) of the entry has changed
+        # index plane can be kept if only palette has changed
+        ea_dir_entry.img_convert_data = None
+        if not keep_index_plane:
+            ea_dir_entry.index_plane = None
+        self.decode_cache.invalidate(ea_dir_entry)
+        self.invalidate_mip_level_data(ea_dir_entry)
+
+    def get_mip_level_data(self, ea_dir_entry: DirEntry, level: int) -> Optional[bytes]:
+        """
+        Returns RGBA8888 data of one mipmap level (level 0 is the main image).
+        Only requested level is decoded and it's kept in the LRU decode cache.
+        """
+        if level == 0:
+            return self.get_img_convert_data(ea_dir_entry)
+
+        mip_levels: List[MipLevelDTO] = ea_dir_entry.get_mip_levels(self.sign)
+        if not 0 < level < len(mip_levels):
+            logger.warning(f'Mipmap level {level} not available for img_tag="{ea_dir_entry.tag}"!')
+            return None
+
+        cache_key: tuple = (ea_dir_entry, level)
+        img_convert_data: Optional[bytes] = self.decode_cache.get(cache_key)
+        if img_convert_data is not None:
+            return img_convert_data
+
+        decode_job: Optional[DecodeJobDTO] = get_mip_level_decode_job(
+            self.get_decode_job(ea_dir_entry, ea_dir_entry.h_record_id), mip_levels[level]
+        )
+        if not decode_job:
+            return None
+        img_convert_data = decode_ea_image_job(decode_job)
+        if img_convert_data:
+            self.decode_cache.put(cache_key, img_convert_data)
+        return img_convert_data
+
+    def invalidate_mip_level_data(self, ea_dir_entry: DirEntry) -> None:
+        for level in range(1, ea_dir_entry.get_mipmaps_count() + 1):
+            self.decode_cache.invalidate((ea_dir_entry, level))
+
+    def get_preview_image_data(
+        self, ea_dir_entry: DirEntry, max_width: int, max_height: int
+    ) -> Tuple[Optional[bytes], int, int]:
+        """
+        Returns (RGBA8888 data, width, height) of the smallest mipmap level which still fills
+        preview of given size, so big textures don't need to be decoded and downscaled for preview.
+        """
+        mip_levels: List[MipLevelDTO] = ea_dir_entry.get_mip_levels(self.sign)
+        level: int = get_smallest_mip_level_for_size(mip_levels, max_width, max_height)
+        if level > 0:
+            img_convert_data: Optional[bytes] = self.get_mip_level_data(ea_dir_entry, level)
+            if img_convert_data:
+                return img_convert_data, mip_levels[level].img_width, mip_levels[level].img_height
+        return self.get_img_convert_data(ea_dir_entry), ea_dir_entry.h_width, ea_dir_entry.h_height
+
+    def get_index_plane(self, ea_dir_entry: DirEntry) -> Optional[bytes]:
+        """
+        Returns palette indices (one byte per pixel) of indexed image or None for other image types.
+        Index plane is read once and kept in dir entry until raw data of the entry changes.
+        """
+        if ea_dir_entry.index_plane is None:
+            decode_job: DecodeJobDTO = self.get_decode_job(ea_dir_entry, ea_dir_entry.h_record_id)
+            ea_dir_entry.index_plane = decode_ea_image_index_plane(decode_job)
+        return ea_dir_entry.index_plane
+
+    def render_image_with_palette(
+        self, ea_dir_entry: DirEntry, palette_info_dto: Optional[PaletteInfoDTO] = None
+    ) -> Optional[bytes]:
+        """
+        Returns RGBA8888 data of indexed image rendered with given palette (e.g. for palette swap preview)
+        or with current palette of the entry. Image is not decoded again, only its index plane is used.
+        """
+        codec_info: Optional[CodecInfo] = get_codec_info(ea_dir_entry.h_record_id & 0x7F)
+        index_plane: Optional[bytes] = self.get_index_plane(ea_dir_entry)
+        if not codec_info or index_plane is None:
+            return None
+        if palette_info_dto is None:
+            palette_info_dto = self.get_palette_info_dto(ea_dir_entry)
         try:
-            ea_dir_entry.img_convert_data = decode_image_data_by_entry_type(
-                entry_type, image_data, palette_info_dto, ea_dir_entry
-            )
+            palette_lut: Optional[np.ndarray] = get_palette_rgba8888_lut_for_codec(codec_info, palette_info_dto)
+            return render_index_plane(index_plane, palette_lut) if palette_lut is not None else None
         except Exception as error:
-            logger.error(f"Error while decoding EA image! Error: {error}")
-            logger.error(traceback.format_exc())
-            return False
-
-        if not ea_dir_entry.img_convert_data:
-            logger.error("Decoded image data is empty!")
-            return False
+            logger.error(f"Error while rendering image with palette! Error: {error}")
+            return None
 
-        return True
+    def convert_image_data_for_export_and_preview(self, ea_dir_entry: DirEntry, entry_type: int, gui_main) -> bool:
+        ea_dir_entry.img_convert_data = self.decode_image_data(ea_dir_entry, entry_type)
+        return True if ea_dir_entry.img_convert_data else False
+
+    def get_palette_info_dto(self, ea_dir_entry: DirEntry) -> PaletteInfoDTO:
+        """
+        Returns palette for image entry. Palettes are resolved (and unswizzled) only once per entry
+        and kept in palette index until it's invalidated.
+        """
+        palette_info_dto: Optional[PaletteInfoDTO] = self.palette_index.get(ea_dir_entry)
+        if palette_info_dto is None:
+            palette_info_dto = get_palette_info_dto_from_dir_entry(ea_dir_entry, self)
+            self.palette_index[ea_dir_entry] = palette_info_dto
+        return palette_info_dto
+
+    def get_shared_palette_info_dto(self) -> Optional[PaletteInfoDTO]:
+        if not self.is_shared_palette_resolved:
+            self.shared_palette_info_dto = get_shared_palette_info_dto(self.dir_entry_list)
+            self.is_shared_palette_resolved = True
+        return self.shared_palette_info_dto
+
+    def invalidate_palette_index(self) -> None:
+        # needs to be called after palette data has been changed (e.g. palette import)
+        self.palette_index.clear()
+        self.shared_palette_info_dto = None
+        self.is_shared_palette_resolved = False
+
+    def get_decode_job(self, ea_dir_entry: DirEntry, entry_type: int) -> DecodeJobDTO:
+        """
+        Collects everything needed to decode one image (raw bytes, header fields, resolved palette).
+        Job doesn't reference EAImage or DirEntry objects, so it can be sent to worker process.
+        """
+        palette_info_dto: PaletteInfoDTO = self.get_palette_info_dto(ea_dir_entry)
+        codec_info: Optional[CodecInfo] = get_codec_info(entry_type & 0x7F)
+        if codec_info:
+            try:
+                # palette lookup table is created once and sent to worker processes together with palette
+                get_palette_rgba8888_lut_for_codec(codec_info, palette_info_dto)
+            except Exception as error:
+                logger.debug(f"Palette lookup table not created: {error}")
+        return DecodeJobDTO(
+            entry_type=entry_type,
+            image_data=bytes(ea_dir_entry.raw_data),  # raw data may be a memoryview in memory mapped mode
+            img_width=ea_dir_entry.h_width,
+            img_height=ea_dir_entry.h_height,
+            img_bpp=ea_dir_entry.h_image_bpp,
+            is_swizzled=is_image_swizzled(ea_dir_entry),
+            ea_img_signature=self.sign,
+            palette_info_dto=palette_info_dto,
+        )
+
+    def _run_decode_job(self, ea_dir_entry: DirEntry, decode_job: DecodeJobDTO) -> Optional[bytes]:
+        if not self.keep_index_planes:
+            return decode_ea_image_job(decode_job)
+        img_convert_data, ea_dir_entry.index_plane = decode_ea_image_job_with_index_plane(decode_job)
+        return img_convert_data
+
+    def decode_image_data(self, ea_dir_entry: DirEntry, entry_type: int) -> Optional[bytes]:
+        decode_job: DecodeJobDTO = self.get_decode_job(ea_dir_entry, entry_type)
+        if not self.disk_cache:
+            return self._run_decode_job(ea_dir_entry, decode_job)
+
+        disk_cache_key: str = self.disk_cache.get_key(decode_job)
+        img_convert_data: Optional[bytes] = self.disk_cache.get(disk_cache_key)
+        if img_convert_data is None:
+            img_convert_data = self._run_decode_job(ea_dir_entry, decode_job)
+            if img_convert_data:
+                self.disk_cache.put(disk_cache_key, img_convert_data)
+        return img_convert_data
@@ -0,0 +1,343 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import bisect
+import io
+import os
+import shutil
+import struct
+import tempfile
+from typing import Callable, Dict, List, Tuple
+
+from reversebox.common.logger import get_logger
+
+from src.EA_Image.constants import (
+    DEFAULT_REFPACK_COMPRESSION_LEVEL,
+    NEW_SHAPE_ALLOWED_SIGNATURES,
+    REBUILD_MAX_ENTRY_ALIGNMENT,
+)
+from src.EA_Image.ea_image_main import EAImage
+from src.EA_Image.refpack_encoder import compress_refpack_data
+
+logger = get_logger(__name__)
+
+
+def get_dirty_blocks(ea_img: EAImage) -> List[Tuple[int, int, bytes, int]]:
+    """
+    Returns list of (data_offset, original_data_size, data, header_offset) for all imported images
+    and bin attachments, sorted by offset.
+    """
+    dirty_blocks: List[Tuple[int, int, bytes, int]] = []
+    for ea_dir in ea_img.dir_entry_list:
+        if ea_dir.entry_import_flag:
+            dirty_blocks.append(
+                (ea_dir.raw_data_offset, ea_dir.raw_data_size, ea_dir.raw_data, ea_dir.h_entry_header_offset)
+            )
+        for bin_attach in ea_dir.bin_attachments_list:
+            if bin_attach.import_flag:
+                dirty_blocks.append(
+                    (
+                        bin_attach.raw_data_offset,
+                        bin_attach.end_offset - bin_attach.raw_data_offset,
+                        bin_attach.raw_data,
+                        bin_attach.raw_data_offset - bin_attach.header_size,
+                    )
+                )
+    dirty_blocks.sort(key=lambda dirty_block: dirty_block[0])
+    return dirty_blocks
+
+
+def get_dirty_ranges(ea_img: EAImage) -> List[Tuple[int, bytes]]:
+    """
+    Returns list of (offset, data) for all imported images and bin attachments, sorted by offset.
+    """
+    return [(data_offset, data) for data_offset, _, data, _ in get_dirty_blocks(ea_img)]
+
+
+def is_rebuild_needed(ea_img: EAImage) -> bool:
+    # file has to be rebuilt if size of any imported data has changed
+    return any(len(data) != data_size for _, data_size, data, _ in get_dirty_blocks(ea_img))
+
+
+def _is_same_file(first_file_path: str, second_file_path: str) -> bool:
+    try:
+        return os.path.samefile(first_file_path, second_file_path)
+    except OSError:
+        return False  # e.g. output file doesn't exist yet
+
+
+def _save_atomically(ea_img: EAImage, out_file_path: str, write_function: Callable) -> None:
+    # data is written to temporary file in the target directory and renamed at the end,
+    # so the output file is never left half-written
+    out_directory_path: str = os.path.dirname(os.path.abspath(out_file_path))
+    temp_file_handle, temp_file_path = tempfile.mkstemp(dir=out_directory_path, suffix=".tmp")
+    os.close(temp_file_handle)
+    try:
+        write_function(temp_file_path)
+        with open(temp_file_path, "r+b") as temp_file:
+            os.fsync(temp_file.fileno())
+        if os.path.isfile(ea_img.f_path):
+            shutil.copymode(ea_img.f_path, temp_file_path)  # temporary files are created with private mode
+        if ea_img.is_memory_mapped and _is_same_file(out_file_path, ea_img.f_path):
+            ea_img.release_file_mapping()  # opened file can't be replaced while it's mapped
+        os.replace(temp_file_path, out_file_path)
+    except BaseException:
+        try:
+            os.remove(temp_file_path)
+        except OSError:
+            pass
+        raise
+
+
+def save_ea_image(
+    ea_img: EAImage,
+    out_file_path: str,
+    compression_level: str = DEFAULT_REFPACK_COMPRESSION_LEVEL,
+    max_workers: int = 1,
+) -> int:
+    """
+    Saves EA image with all imported data.
+    File is rebuilt only if size of imported data has changed, otherwise it's just patched.
+    Compression level and max_workers are used only for compressed (refpack) files.
+    """
+    if is_rebuild_needed(ea_img):
+        return save_ea_image_rebuilt(ea_img, out_file_path, compression_level, max_workers)
+    return save_ea_image_patched(ea_img, out_file_path, compression_level, max_workers)
+
+
+def save_ea_image_patched(
+    ea_img: EAImage,
+    out_file_path: str,
+    compression_level: str = DEFAULT_REFPACK_COMPRESSION_LEVEL,
+    max_workers: int = 1,
+) -> int:
+    """
+    Saves EA image with all imported data. Only changed byte ranges are written,
+    rest of the file is copied from the source file (by the OS, without reading it into memory).
+    Data is written to temporary file first and renamed to "out_file_path" at the end.
+    Compressed (refpack) files are patched in memory and compressed again.
+    Returns number of patched bytes.
+    """
+    dirty_ranges: List[Tuple[int, bytes]] = get_dirty_ranges(ea_img)
+    file_size: int = len(ea_img.total_f_data)
+    for offset, data in dirty_ranges:
+        if offset + len(data) > file_size:
+            raise Exception(f"Imported data at offset {offset} doesn't fit in file!")
+
+    def _write_patched_file(temp_file_path: str) -> None:
+        if ea_img.is_total_f_data_compressed:
+            file_data = bytearray(ea_img.total_f_data)
+            for offset, data in dirty_ranges:
+                end_offset: int = offset + len(data)
+                file_data[offset:end_offset] = data
+            with open(temp_file_path, "wb") as temp_file:
+                temp_file.write(compress_refpack_data(file_data, compression_level, max_workers))
+            return
+
+        if os.path.isfile(ea_img.f_path) and os.path.getsize(ea_img.f_path) == file_size:
+            shutil.copyfile(ea_img.f_path, temp_file_path)  # fast copy done by the OS
+        else:
+            with open(temp_file_path, "wb") as temp_file:
+                temp_file.write(ea_img.total_f_data)  # source file has been changed or removed
+        with open(temp_file_path, "r+b") as temp_file:
+            for offset, data in dirty_ranges:
+                temp_file.seek(offset)
+                temp_file.write(data)
+
+    _save_atomically(ea_img, out_file_path, _write_patched_file)
+    patched_size: int = sum(len(data) for _, data in dirty_ranges)
+    logger.info(f"Saved {out_file_path}, patched {len(dirty_ranges)} range(s), {patched_size} bytes")
+    return patched_size
+
+
+class ShapeRebuilder:
+    """
+    Rebuilds old shape or new shape file when size of imported data has changed.
+    All bytes which are not imported (headers, gaps, padding, unknown data) are copied from the source file,
+    only size and offset fields are updated: TOC offsets (and new shape TOC sizes), total file size,
+    "size of the block" of chained entry headers and bin attachments and new shape data sizes.
+    Entries are shifted by a multiple of their original alignment, so alignment is preserved.
+    """
+
+    def __init__(self, ea_img: EAImage):
+        self.ea_img: EAImage = ea_img
+        self.file_data = ea_img.total_f_data
+        self.is_new_shape: bool = ea_img.sign in NEW_SHAPE_ALLOWED_SIGNATURES
+        self.dirty_blocks: List[Tuple[int, int, bytes, int]] = get_dirty_blocks(ea_img)
+        self.shift_offsets: List[int] = []  # offsets (in source file) where data is inserted or removed
+        self.shift_sums: List[int] = []  # total shift after each of the "shift_offsets"
+        self.padding_sizes: Dict[int, int] = {}
+        self.field_patches: Dict[int, bytes] = {}
+
+    def get_new_offset(self, old_offset: int) -> int:
+        shift_index: int = bisect.bisect_right(self.shift_offsets, old_offset)
+        return old_offset + (self.shift_sums[shift_index - 1] if shift_index > 0 else 0)
+
+    def _add_shift(self, old_offset: int, size_difference: int) -> None:
+        self.shift_offsets.append(old_offset)
+        self.shift_sums.append((self.shift_sums[-1] if self.shift_sums else 0) + size_difference)
+
+    def _get_entry_alignment(self) -> int:
+        alignment: int = REBUILD_MAX_ENTRY_ALIGNMENT
+        for ea_dir in self.ea_img.dir_entry_list:
+            while ea_dir.start_offset % alignment:
+                alignment //= 2
+        return alignment
+
+    def plan_layout(self) -> None:
+        # data is shifted after each resized block, padding is inserted at the end of entries to keep alignment
+        alignment: int = self._get_entry_alignment()
+        dirty_block_index: int = 0
+        previous_data_end_offset: int = 0
+        for ea_dir in self.ea_img.dir_entry_list:
+            while dirty_block_index < len(self.dirty_blocks):
+                data_offset, data_size, data, _ = self.dirty_blocks[dirty_block_index]
+                if data_offset >= ea_dir.end_offset:
+                    break
+                if data_offset < previous_data_end_offset:
+                    raise Exception("Can't rebuild file with overlapping entries!")
+                previous_data_end_offset = data_offset + data_size
+                if len(data) != data_size:
+                    self._add_shift(previous_data_end_offset, len(data) - data_size)
+                dirty_block_index += 1
+
+            total_shift: int = self.shift_sums[-1] if self.shift_sums else 0
+            padding_size: int = -total_shift % alignment
+            if padding_size:
+                self.padding_sizes[ea_dir.end_offset] = padding_size
+                self._add_shift(ea_dir.end_offset, padding_size)
+
+        if dirty_block_index < len(self.dirty_blocks):
+            raise Exception("Can't rebuild file! Imported data is outside of entries.")
+
+    def _read_uint32(self, offset: int, endianess: str) -> int:
+        return struct.unpack_from(endianess + "L", self.file_data, offset)[0]
+
+    def _patch_uint32(self, offset: int, value: int, endianess: str) -> None:
+        self.field_patches[offset] = struct.pack(endianess + "L", value)
+
+    def _get_new_block_size(self, header_offset: int, block_size: int) -> int:
+        return self.get_new_offset(header_offset + block_size) - self.get_new_offset(header_offset)
+
+    def _patch_block_header(self, header_offset: int, has_next_block: bool, size_difference: int) -> None:
+        endianess: str = self.ea_img.f_endianess
+        if self.is_new_shape:
+            if has_next_block:
+                block_size: int = self._read_uint32(header_offset + 4, endianess)
+                self._patch_uint32(header_offset + 4, self._get_new_block_size(header_offset, block_size), endianess)
+            if size_difference:
+                data_size: int = self._read_uint32(header_offset + 12, endianess)
+                self._patch_uint32(header_offset + 12, data_size + size_difference, endianess)
+        elif has_next_block:
+            # old shape headers start with 1 byte record ID and 3 bytes block size
+            record_id_and_size: int = self._read_uint32(header_offset, endianess)
+            if endianess == "<":
+                record_id, block_size = record_id_and_size & 0xFF, record_id_and_size >> 8
+            else:
+                record_id, block_size = record_id_and_size >> 24, record_id_and_size & 0xFFFFFF
+            new_block_size: int = self._get_new_block_size(header_offset, block_size)
+            if new_block_size > 0xFFFFFF:
+                raise Exception("Can't rebuild file! Entry is too big for old shape file.")
+            if endianess == "<":
+                self._patch_uint32(header_offset, record_id | (new_block_size << 8), endianess)
+            else:
+                self._patch_uint32(header_offset, (record_id << 24) | new_block_size, endianess)
+
+    def plan_field_patches(self) -> None:
+        size_differences: Dict[int, int] = {
+            header_offset: len(data) - data_size for _, data_size, data, header_offset in self.dirty_blocks
+        }
+
+        # chained headers of entries and bin attachments
+        for ea_dir in self.ea_img.dir_entry_list:
+            self._patch_block_header(
+                ea_dir.h_entry_header_offset,
+                ea_dir.if_next_entry_exist_flag,
+                size_differences.get(ea_dir.h_entry_header_offset, 0),
+            )
+            for bin_attach in ea_dir.bin_attachments_list:
+                header_offset: int = bin_attach.raw_data_offset - bin_attach.header_size
+                self._patch_block_header(
+                    header_offset, bin_attach.if_next_entry_exist_flag, size_differences.get(header_offset, 0)
+                )
+
+        # table of contents
+        dir_endianess: str = self.ea_img.f_dir_endianess
+        toc_offset: int = 16
+        for _ in range(self.ea_img.num_of_entries):
+            if self.is_new_shape:
+                entry_offset: int = self._read_uint32(toc_offset, dir_endianess)
+                entry_size: int = self._read_uint32(toc_offset + 4, dir_endianess)
+                self._patch_uint32(toc_offset, self.get_new_offset(entry_offset), dir_endianess)
+                self._patch_uint32(toc_offset + 4, self._get_new_block_size(entry_offset, entry_size), dir_endianess)
+                tag_offset: int = toc_offset + 8
+                header_and_toc_size: int = self.ea_img.header_and_toc_size
+                tag_size: int = bytes(self.file_data[tag_offset:header_and_toc_size]).find(b"\x00")
+                toc_offset = tag_offset + tag_size + 1  # tag is null terminated
+            else:
+                entry_offset = self._read_uint32(toc_offset + 4, dir_endianess)
+                self._patch_uint32(toc_offset + 4, self.get_new_offset(entry_offset), dir_endianess)
+                toc_offset += 8
+
+        # total file size (little endian in most files)
+        total_size_endianess: str = "<"
+        if self._read_uint32(4, "<") != len(self.file_data) and self._read_uint32(4, ">") == len(self.file_data):
+            total_size_endianess = ">"
+        total_f_size: int = self._read_uint32(4, total_size_endianess)
+        self._patch_uint32(4, self.get_new_offset(total_f_size), total_size_endianess)
+
+    def write(self, out_file) -> int:
+        """
+        Streams rebuilt file to "out_file". Returns number of written bytes.
+        """
+        # events are (offset, order, replaced_size, new_data), padding is inserted before data at the same offset
+        events: list = [(offset, 1, len(patch), patch) for offset, patch in self.field_patches.items()]
+        events += [(data_offset, 1, data_size, data) for data_offset, data_size, data, _ in self.dirty_blocks]
+        events += [(offset, 0, 0, bytes(padding_size)) for offset, padding_size in self.padding_sizes.items()]
+        events.sort(key=lambda event: (event[0], event[1]))
+
+        file_view = memoryview(self.file_data)
+        written_size: int = 0
+        current_offset: int = 0
+        for offset, _, replaced_size, new_data in events:
+            if offset < current_offset:
+                raise Exception(f"Can't rebuild file! Overlapping data at offset {offset}.")
+            written_size += out_file.write(file_view[current_offset:offset])
+            written_size += out_file.write(new_data)
+            current_offset = offset + replaced_size
+        written_size += out_file.write(file_view[current_offset:])
+        return written_size
+
+
+def save_ea_image_rebuilt(
+    ea_img: EAImage,
+    out_file_path: str,
+    compression_level: str = DEFAULT_REFPACK_COMPRESSION_LEVEL,
+    max_workers: int = 1,
+) -> int:
+    """
+    Saves EA image with all imported data, also when imported data is bigger than original data.
+    Output is streamed to disk (compressed files are rebuilt in memory and compressed again).
+    Data is written to temporary file first and renamed to "out_file_path" at the end.
+    Returns size of the rebuilt file.
+    """
+    shape_rebuilder = ShapeRebuilder(ea_img)
+    shape_rebuilder.plan_layout()
+    shape_rebuilder.plan_field_patches()
+    rebuilt_sizes: List[int] = []
+
+    def _write_rebuilt_file(temp_file_path: str) -> None:
+        if ea_img.is_total_f_data_compressed:
+            memory_file = io.BytesIO()
+            rebuilt_sizes.append(shape_rebuilder.write(memory_file))
+            with open(temp_file_path, "wb") as temp_file:
+                temp_file.write(compress_refpack_data(memory_file.getvalue(), compression_level, max_workers))
+            return
+        with open(temp_file_path, "wb") as temp_file:
+            rebuilt_sizes.append(shape_rebuilder.write(temp_file))
+
+    _save_atomically(ea_img, out_file_path, _write_rebuilt_file)
+    logger.info(f"Saved rebuilt file {out_file_path}, size: {rebuilt_sizes[0]} bytes")
+    return rebuilt_sizes[0]
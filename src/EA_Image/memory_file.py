@@ -0,0 +1,54 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import os
+import struct
+
+
+class MemoryFile:
+    """
+    Read-only file-like object over any buffer (bytes, bytearray, mmap).
+    Unlike io.BytesIO, read() returns memoryview slices of the buffer,
+    so nothing is copied while the file is being parsed.
+    """
+
+    def __init__(self, in_buffer):
+        self.view = memoryview(in_buffer).cast("B")
+        self.size = len(self.view)
+        self.position = 0
+
+    def read(self, size: int = -1) -> memoryview:
+        start_offset: int = self.position
+        if size is None or size < 0:
+            end_offset: int = self.size
+        else:
+            end_offset: int = min(start_offset + size, self.size)
+        self.position = max(start_offset, end_offset)
+        return self.view[start_offset:end_offset]
+
+    def unpack(self, struct_layout: struct.Struct) -> tuple:
+        # unpacks structure directly from the buffer and moves position after it
+        result: tuple = struct_layout.unpack_from(self.view, self.position)
+        self.position += struct_layout.size
+        return result
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_SET:
+            self.position = offset
+        elif whence == os.SEEK_CUR:
+            self.position += offset
+        elif whence == os.SEEK_END:
+            self.position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence value: {whence}")
+        if self.position < 0:
+            raise ValueError(f"Negative seek position: {self.position}")
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def close(self) -> None:
+        self.view.release()
@@ -0,0 +1,104 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from typing import List, Optional
+
+from reversebox.common.logger import get_logger
+from reversebox.image.common import get_linear_image_data_size, get_stride_value_psp
+from reversebox.image.image_formats import ImageFormats
+
+from src.EA_Image.codec_registry import (
+    DECODE_COMPRESSED,
+    DECODE_GST,
+    DECODE_INLINE_PALETTE,
+    DECODE_N64,
+    DECODE_PSP_DXT,
+    CodecInfo,
+    get_codec_info,
+)
+from src.EA_Image.dto import MipLevelDTO
+from src.EA_Image.mipmaps import get_mipmap_sizes
+from src.EA_Image.psp_padding import get_psp_row_layout, is_psp_padding_used
+
+logger = get_logger(__name__)
+
+# Byte ranges of all mipmap levels, calculated from header values only (without decoding).
+# Levels are stored one after another in the same layout as written by the encoder.
+# GST and N64 textures use codec specific layouts, so only their main image is available.
+
+MIP_LEVELS_NOT_SUPPORTED_DECODE_KINDS = (DECODE_GST, DECODE_N64)
+
+
+def get_block_image_data_size(img_width: int, img_height: int, image_format: ImageFormats) -> int:
+    block_size: int = 8 if image_format in (ImageFormats.BC1_DXT1, ImageFormats.PSP_DXT1) else 16
+    return max(1, (img_width + 3) // 4) * max(1, (img_height + 3) // 4) * block_size
+
+
+def get_mip_level_data_size(
+    codec_info: CodecInfo, img_width: int, img_height: int, ea_img_signature: str, is_swizzled: bool
+) -> int:
+    if is_psp_padding_used(ea_img_signature, codec_info.entry_type):
+        _, padded_row_size = get_psp_row_layout(img_width, codec_info.bpp)
+        if is_swizzled:  # swizzled PSP levels are also aligned to 8 rows
+            return get_stride_value_psp(img_width, codec_info.bpp) * ((img_height + 7) & ~7)
+        return padded_row_size * img_height
+    if codec_info.decode_kind in (DECODE_COMPRESSED, DECODE_PSP_DXT) and not is_swizzled:
+        return get_block_image_data_size(img_width, img_height, codec_info.image_format)
+    return get_linear_image_data_size(codec_info.bpp, img_width, img_height)
+
+
+def get_mip_level_layout(
+    entry_type: int,
+    img_width: int,
+    img_height: int,
+    mipmaps_count: int,
+    ea_img_signature: str,
+    is_swizzled: bool,
+) -> List[MipLevelDTO]:
+    """
+    Returns byte ranges of all levels (main image first).
+    """
+    codec_info: Optional[CodecInfo] = get_codec_info(entry_type & 0x7F)
+    if not codec_info:
+        return []
+
+    if (
+        not codec_info.supports_mipmaps
+        or codec_info.decode_kind in MIP_LEVELS_NOT_SUPPORTED_DECODE_KINDS
+        or (codec_info.decode_kind == DECODE_INLINE_PALETTE and is_swizzled)
+    ):
+        mipmaps_count = 0
+
+    data_offset: int = codec_info.inline_palette_size if codec_info.decode_kind == DECODE_INLINE_PALETTE else 0
+    mip_levels: List[MipLevelDTO] = []
+    for level, (mip_width, mip_height) in enumerate(get_mipmap_sizes(img_width, img_height, mipmaps_count)):
+        if mip_width <= 0 or mip_height <= 0:
+            break  # too many mipmaps in header
+        try:
+            data_size: int = get_mip_level_data_size(codec_info, mip_width, mip_height, ea_img_signature, is_swizzled)
+        except Exception as error:
+            logger.warning(f"Can't calculate size of mipmap level {level}! Error: {error}")
+            break
+        mip_levels.append(MipLevelDTO(level, mip_width, mip_height, data_offset, data_size))
+        data_offset += data_size
+    return mip_levels
+
+
+def get_smallest_mip_level_for_size(mip_levels: List[MipLevelDTO], max_width: int, max_height: int) -> int:
+    """
+    Returns the smallest level which can be downscaled to fit in (max_width, max_height) box
+    without upscaling, i.e. the level used for preview of the main image scaled to this box.
+    """
+    if not mip_levels:
+        return 0
+    main_width, main_height = mip_levels[0].img_width, mip_levels[0].img_height
+    scale: float = min(max_width / main_width, max_height / main_height, 1.0)
+    target_width, target_height = main_width * scale, main_height * scale
+    selected_level: int = 0
+    for mip_level in mip_levels[1:]:
+        if mip_level.img_width < target_width or mip_level.img_height < target_height:
+            break
+        selected_level = mip_level.level
+    return selected_level
@@ -0,0 +1,152 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import PIL.Image
+from reversebox.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _box_filter(x: np.ndarray) -> np.ndarray:
+    return ((x >= -0.5) & (x < 0.5)).astype(np.float64)
+
+
+def _bilinear_filter(x: np.ndarray) -> np.ndarray:
+    return np.maximum(1.0 - np.abs(x), 0.0)
+
+
+def _hamming_filter(x: np.ndarray) -> np.ndarray:
+    return np.where(np.abs(x) < 1.0, np.sinc(x) * (0.54 + 0.46 * np.cos(np.pi * x)), 0.0)
+
+
+def _bicubic_filter(x: np.ndarray) -> np.ndarray:
+    a: float = -0.5
+    x = np.abs(x)
+    return np.where(
+        x < 1.0,
+        ((a + 2.0) * x - (a + 3.0)) * x * x + 1,
+        np.where(x < 2.0, (((x - 5) * x + 8) * x - 4) * a, 0.0),
+    )
+
+
+def _lanczos_filter(x: np.ndarray) -> np.ndarray:
+    return np.where(np.abs(x) < 3.0, np.sinc(x) * np.sinc(x / 3.0), 0.0)
+
+
+# filter function and its support, the same filters are used by Pillow
+resampling_filters: Dict[PIL.Image.Resampling, Tuple[Callable, float]] = {
+    PIL.Image.Resampling.BOX: (_box_filter, 0.5),
+    PIL.Image.Resampling.BILINEAR: (_bilinear_filter, 1.0),
+    PIL.Image.Resampling.HAMMING: (_hamming_filter, 1.0),
+    PIL.Image.Resampling.BICUBIC: (_bicubic_filter, 2.0),
+    PIL.Image.Resampling.LANCZOS: (_lanczos_filter, 3.0),
+}
+
+
+def get_mipmap_sizes(img_width: int, img_height: int, mipmaps_count: int) -> List[Tuple[int, int]]:
+    """
+    Returns sizes of all levels (main image first).
+    """
+    mipmap_sizes: List[Tuple[int, int]] = [(img_width, img_height)]
+    for _ in range(mipmaps_count):
+        img_width //= 2
+        img_height //= 2
+        mipmap_sizes.append((img_width, img_height))
+    return mipmap_sizes
+
+
+def get_resample_coefficients(
+    in_size: int, out_size: int, resampling_type: PIL.Image.Resampling
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns source indices and weights (out_size x number_of_taps) for one axis.
+    Coefficients are calculated the same way as in Pillow (filter is stretched when downscaling).
+    """
+    scale: float = in_size / out_size if out_size else 1.0
+    centers: np.ndarray = (np.arange(out_size) + 0.5) * scale
+    if resampling_type not in resampling_filters:  # nearest
+        return np.minimum(centers.astype(np.intp), in_size - 1)[:, None], np.ones((out_size, 1), dtype=np.float32)
+
+    filter_function, filter_support = resampling_filters[resampling_type]
+    filter_scale: float = max(scale, 1.0)
+    support: float = filter_support * filter_scale
+    taps_count: int = int(math.ceil(support)) * 2 + 1
+    first_indices: np.ndarray = np.maximum((centers - support + 0.5).astype(np.intp), 0)
+    last_indices: np.ndarray = np.minimum((centers + support + 0.5).astype(np.intp), in_size)
+    indices: np.ndarray = first_indices[:, None] + np.arange(taps_count)
+    weights: np.ndarray = filter_function((indices - centers[:, None] + 0.5) / filter_scale)
+    weights[indices >= last_indices[:, None]] = 0.0
+    weights /= np.maximum(weights.sum(axis=1, keepdims=True), 1e-12)
+    return np.minimum(indices, in_size - 1), weights.astype(np.float32)
+
+
+def _resample_axis(
+    level_data: np.ndarray, out_size: int, axis: int, resampling_type: PIL.Image.Resampling
+) -> np.ndarray:
+    indices, weights = get_resample_coefficients(level_data.shape[axis], out_size, resampling_type)
+    out_shape: list = list(level_data.shape)
+    out_shape[axis] = out_size
+    resampled_data: np.ndarray = np.zeros(out_shape, dtype=np.float32)
+    weights_shape: list = [1] * level_data.ndim
+    weights_shape[axis] = out_size
+    for tap_number in range(indices.shape[1]):
+        resampled_data += np.take(level_data, indices[:, tap_number], axis=axis) * weights[:, tap_number].reshape(
+            weights_shape
+        )
+    return resampled_data
+
+
+def generate_mipmap_pyramid(
+    rgba8888_data: bytes,
+    img_width: int,
+    img_height: int,
+    mipmaps_count: int,
+    resampling_type: PIL.Image.Resampling,
+) -> List[memoryview]:
+    """
+    Generates RGBA8888 data of all mipmap levels (without main image).
+    All levels are calculated from one premultiplied float buffer, each level from the previous one
+    (no rounding between levels), and stored in one output buffer. Returned list contains views of this buffer.
+    """
+    mipmap_sizes: List[Tuple[int, int]] = get_mipmap_sizes(img_width, img_height, mipmaps_count)[1:]
+    pyramid_data = bytearray(sum(mip_width * mip_height * 4 for mip_width, mip_height in mipmap_sizes))
+    pyramid_view: memoryview = memoryview(pyramid_data)
+    if not mipmap_sizes:
+        return []
+
+    base_pixels: np.ndarray = np.frombuffer(rgba8888_data, dtype=np.uint8).reshape(img_height, img_width, 4)
+    level_data: Optional[np.ndarray] = None
+    if resampling_type in resampling_filters:
+        # colors are premultiplied by alpha, so transparent pixels don't bleed into mipmaps (as in Pillow)
+        level_data = base_pixels.astype(np.float32)
+        level_data[..., :3] *= level_data[..., 3:] / 255.0
+
+    mipmap_views: List[memoryview] = []
+    level_offset: int = 0
+    for mip_width, mip_height in mipmap_sizes:
+        level_size: int = mip_width * mip_height * 4
+        level_pixels: np.ndarray = np.frombuffer(
+            pyramid_data, dtype=np.uint8, count=level_size, offset=level_offset
+        ).reshape(mip_height, mip_width, 4)
+        if level_data is None:
+            # nearest neighbour is always sampled from main image
+            y_indices: np.ndarray = get_resample_coefficients(img_height, mip_height, resampling_type)[0][:, 0]
+            x_indices: np.ndarray = get_resample_coefficients(img_width, mip_width, resampling_type)[0][:, 0]
+            level_pixels[...] = base_pixels[y_indices[:, None], x_indices]
+        else:
+            level_data = _resample_axis(level_data, mip_width, 1, resampling_type)
+            level_data = _resample_axis(level_data, mip_height, 0, resampling_type)
+            alpha: np.ndarray = level_data[..., 3:]
+            colors: np.ndarray = np.where(alpha > 0, level_data[..., :3] * 255.0 / np.maximum(alpha, 1e-6), 0.0)
+            level_pixels[..., :3] = np.clip(np.rint(colors), 0, 255)
+            level_pixels[..., 3:] = np.clip(np.rint(alpha), 0, 255)
+        level_end_offset: int = level_offset + level_size
+        mipmap_views.append(pyramid_view[level_offset:level_end_offset])
+        level_offset = level_end_offset
+    return mipmap_views
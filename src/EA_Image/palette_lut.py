@@ -0,0 +1,116 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+from reversebox.image.common import convert_bpp_to_bytes_per_pixel
+from reversebox.image.image_decoder import ImageDecoder
+from reversebox.image.image_formats import ImageFormats
+
+from src.EA_Image.dto import PaletteInfoDTO
+
+# Palettes are converted to RGBA8888 lookup tables (one row per color) and indexed images
+# are expanded with one NumPy "take". Tables are kept in PaletteInfoDTO, so palette shared
+# by many images of one file is converted only once.
+
+PALETTE_LUT_IMAGE_FORMATS: Tuple[ImageFormats, ...] = (ImageFormats.PAL4, ImageFormats.PAL8)
+PALETTE_LUT_MAX_COLORS: int = 256
+
+image_decoder: ImageDecoder = ImageDecoder()
+
+
+def get_palette_color_count(palette_data: bytes, palette_format: ImageFormats) -> int:
+    # the same number of colors as read by reversebox indexed decoder
+    if palette_format in (ImageFormats.IA_X2_ARGB, ImageFormats.IA_X2_GRAB):
+        return len(palette_data) // 4
+    palette_bpp: int = image_decoder.generic_data_formats[palette_format][1]
+    return len(palette_data) // convert_bpp_to_bytes_per_pixel(palette_bpp)
+
+
+def decode_palette_to_rgba8888(palette_data: bytes, palette_format: ImageFormats, palette_endianess: str) -> bytes:
+    # palette is decoded the same way as in indexed image decoding (as PAL8 image with one pixel per color)
+    palette_color_count: int = min(get_palette_color_count(palette_data, palette_format), PALETTE_LUT_MAX_COLORS)
+    return image_decoder.decode_indexed_image(
+        bytes(range(palette_color_count)),
+        palette_data,
+        palette_color_count,
+        1,
+        ImageFormats.PAL8,
+        palette_format,
+        palette_endianess=palette_endianess,
+    )
+
+
+def get_palette_rgba8888_lut(
+    palette_info_dto: PaletteInfoDTO, palette_format: ImageFormats, palette_endianess: str
+) -> np.ndarray:
+    lut_key: tuple = (palette_format, palette_endianess)
+    palette_luts: Dict[tuple, np.ndarray] = palette_info_dto.rgba8888_luts
+    palette_lut: np.ndarray = palette_luts.get(lut_key)
+    if palette_lut is None:
+        palette_lut = np.frombuffer(
+            decode_palette_to_rgba8888(palette_info_dto.data, palette_format, palette_endianess), dtype=np.uint8
+        ).reshape(-1, 4)
+        palette_luts[lut_key] = palette_lut
+    return palette_lut
+
+
+def unpack_palette_indices(
+    image_data: bytes, pixel_count: int, image_format: ImageFormats, image_endianess: str
+) -> np.ndarray:
+    if image_format == ImageFormats.PAL8:
+        index_count: int = pixel_count
+    elif image_format == ImageFormats.PAL4:
+        index_count = (pixel_count + 1) // 2
+    else:
+        raise Exception(f"Image format {image_format} not supported!")
+
+    packed_indices: np.ndarray = np.frombuffer(image_data, dtype=np.uint8, count=min(len(image_data), index_count))
+    if len(packed_indices) < index_count:  # missing indices are read as zero
+        packed_indices = np.concatenate([packed_indices, np.zeros(index_count - len(packed_indices), dtype=np.uint8)])
+    if image_format == ImageFormats.PAL8:
+        return packed_indices
+
+    low_indices, high_indices = packed_indices & 0x0F, packed_indices >> 4
+    if image_endianess == "little":
+        nibble_pairs: tuple = (low_indices, high_indices)
+    elif image_endianess == "big":
+        nibble_pairs = (high_indices, low_indices)
+    else:
+        raise Exception(f"Endianess not supported! Endianess: {image_endianess}")
+    return np.stack(nibble_pairs, axis=-1).ravel()[:pixel_count]
+
+
+def decode_indexed_image_with_lut(
+    image_data: bytes,
+    palette_lut: np.ndarray,
+    img_width: int,
+    img_height: int,
+    image_format: ImageFormats,
+    image_endianess: str = "little",
+) -> bytes:
+    palette_indices: np.ndarray = unpack_palette_indices(
+        image_data, img_width * img_height, image_format, image_endianess
+    )
+    return render_index_plane(palette_indices, palette_lut)
+
+
+def _get_checked_palette_indices(index_plane, palette_lut: np.ndarray) -> np.ndarray:
+    # index plane is bytes or array with one palette index per pixel
+    palette_indices: np.ndarray = np.frombuffer(index_plane, dtype=np.uint8)
+    if len(palette_indices) and palette_indices.max() >= len(palette_lut):
+        raise Exception(f"Palette index {palette_indices.max()} out of range! Palette colors: {len(palette_lut)}")
+    return palette_indices
+
+
+def render_index_plane(index_plane, palette_lut: np.ndarray) -> bytes:
+    return np.take(palette_lut, _get_checked_palette_indices(index_plane, palette_lut), axis=0).tobytes()
+
+
+def render_index_plane_into(index_plane, palette_lut: np.ndarray, output_array: np.ndarray) -> None:
+    # output array has shape (pixel_count, 4), indices are already checked, so "clip" mode doesn't buffer the output
+    palette_indices: np.ndarray = _get_checked_palette_indices(index_plane, palette_lut)
+    np.take(palette_lut, palette_indices, axis=0, out=output_array, mode="clip")
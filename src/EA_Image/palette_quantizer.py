@@ -0,0 +1,319 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+from reversebox.common.logger import get_logger
+from reversebox.image.image_encoder import ImageEncoder
+from reversebox.image.image_formats import ImageFormats
+
+from src.EA_Image.constants import PALETTE_CACHE_MAX_ENTRIES
+from src.EA_Image.palette_lut import decode_palette_to_rgba8888
+
+logger = get_logger(__name__)
+
+KMEANS_MAX_ITERATIONS: int = 8
+KMEANS_MIN_CENTROID_SHIFT: float = 0.5  # k-means stops when no palette color moves further than this
+DISTANCE_CHUNK_SIZE: int = 16384  # number of colors compared with palette at once
+REDUCED_HISTOGRAM_MIN_COLORS: int = 16384  # images with more colors are clustered on 5-bit per channel histogram
+REDUCED_HISTOGRAM_BIN_SHIFT: int = 3
+PALETTE_QUANTIZERS: Tuple[str, ...] = ("kmeans", "median_cut")  # median cut refined by k-means or median cut only
+
+# 4x4 Bayer matrix for ordered dithering, thresholds are centered around zero
+ORDERED_DITHER_MATRIX: np.ndarray = (
+    np.array([[0, 8, 2, 10], [12, 4, 14, 6], [3, 11, 1, 9], [15, 7, 13, 5]], dtype=np.float32) + 0.5
+) / 16 - 0.5
+
+image_encoder: ImageEncoder = ImageEncoder()
+
+quantize_cache: OrderedDict = OrderedDict()
+quantize_cache_lock = threading.Lock()
+
+
+def get_color_histogram(rgba8888_data: bytes) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns unique colors (packed to uint32), index of unique color for each pixel and pixel count for each color.
+    """
+    pixels: np.ndarray = np.frombuffer(rgba8888_data, dtype="<u4")
+    unique_colors, pixel_color_indices, color_counts = np.unique(pixels, return_inverse=True, return_counts=True)
+    return unique_colors, pixel_color_indices.reshape(-1), color_counts
+
+
+def get_reduced_histogram(colors: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Groups similar colors into bins (5 bits per channel).
+    Returns weighted mean color and total weight of each bin.
+    """
+    color_bins: np.ndarray = colors.astype(np.uint8) >> REDUCED_HISTOGRAM_BIN_SHIFT
+    bin_keys: np.ndarray = color_bins.view("<u4").reshape(-1)
+    unique_bin_keys, color_bin_indices = np.unique(bin_keys, return_inverse=True)
+    bin_colors, bin_weights = _get_weighted_means(colors, weights, color_bin_indices.reshape(-1), len(unique_bin_keys))
+    return bin_colors.astype(np.float32), bin_weights.astype(np.float32)
+
+
+def get_nearest_palette_indices(colors: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    # squared euclidean distance in RGBA space, |c|^2 is skipped as it's the same for all palette colors
+    palette = palette.astype(np.float32)
+    palette_squared_norms: np.ndarray = (palette * palette).sum(axis=1)
+    nearest_indices: np.ndarray = np.empty(len(colors), dtype=np.intp)
+    for chunk_start in range(0, len(colors), DISTANCE_CHUNK_SIZE):
+        chunk_end: int = chunk_start + DISTANCE_CHUNK_SIZE
+        distances: np.ndarray = palette_squared_norms - 2 * (colors[chunk_start:chunk_end] @ palette.T)
+        nearest_indices[chunk_start:chunk_end] = distances.argmin(axis=1)
+    return nearest_indices
+
+
+def _get_weighted_means(
+    colors: np.ndarray, weights: np.ndarray, labels: np.ndarray, count: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    label_weights: np.ndarray = np.bincount(labels, weights=weights, minlength=count)
+    means: np.ndarray = np.stack(
+        [np.bincount(labels, weights=colors[:, channel] * weights, minlength=count) for channel in range(4)],
+        axis=1,
+    )
+    return means / np.maximum(label_weights, 1)[:, None], label_weights
+
+
+def _get_box_error(colors: np.ndarray, weights: np.ndarray, box: np.ndarray) -> float:
+    # weighted sum of squared errors of box colors
+    if len(box) < 2:
+        return 0.0
+    box_colors, box_weights = colors[box], weights[box]
+    box_mean: np.ndarray = box_weights @ box_colors / box_weights.sum()
+    return float(box_weights @ ((box_colors - box_mean) ** 2).sum(axis=1))
+
+
+def median_cut(colors: np.ndarray, weights: np.ndarray, max_color_count: int) -> np.ndarray:
+    """
+    Splits color histogram into "max_color_count" boxes.
+    Box with the biggest weighted error is split at the weighted median of its longest channel.
+    Returns mean colors of all boxes.
+    """
+    boxes: List[np.ndarray] = [np.arange(len(colors))]
+    box_errors: List[float] = [_get_box_error(colors, weights, boxes[0])]
+    while len(boxes) < max_color_count:
+        box_number: int = int(np.argmax(box_errors))
+        if box_errors[box_number] <= 0:
+            break  # all boxes have only one color
+
+        box: np.ndarray = boxes.pop(box_number)
+        box_errors.pop(box_number)
+        box_colors: np.ndarray = colors[box]
+        channel: int = int(np.argmax(box_colors.max(axis=0) - box_colors.min(axis=0)))
+        sorted_box: np.ndarray = box[np.argsort(box_colors[:, channel], kind="stable")]
+        cumulative_weights: np.ndarray = np.cumsum(weights[sorted_box])
+        split_index: int = int(np.searchsorted(cumulative_weights, cumulative_weights[-1] / 2))
+        split_index = min(max(split_index, 1), len(sorted_box) - 1)  # both boxes need at least one color
+        for new_box in (sorted_box[:split_index], sorted_box[split_index:]):
+            boxes.append(new_box)
+            box_errors.append(_get_box_error(colors, weights, new_box))
+
+    labels: np.ndarray = np.empty(len(colors), dtype=np.intp)
+    for box_number, box in enumerate(boxes):
+        labels[box] = box_number
+    return _get_weighted_means(colors, weights, labels, len(boxes))[0]
+
+
+def kmeans_refine(colors: np.ndarray, weights: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    for _ in range(KMEANS_MAX_ITERATIONS):
+        labels: np.ndarray = get_nearest_palette_indices(colors, palette)
+        means, label_weights = _get_weighted_means(colors, weights, labels, len(palette))
+        new_palette: np.ndarray = np.where(label_weights[:, None] > 0, means, palette)  # empty clusters are kept
+        centroid_shift: float = float(np.abs(new_palette - palette).max())
+        palette = new_palette
+        if centroid_shift < KMEANS_MIN_CENTROID_SHIFT:
+            break
+    return palette
+
+
+def get_existing_palette_indices(unique_colors: np.ndarray, palette_rgba8888_data: bytes) -> Optional[np.ndarray]:
+    """
+    Returns palette index for each unique color if all colors exist in palette, otherwise None.
+    First palette entry is used for duplicated colors.
+    """
+    palette_colors: np.ndarray = np.frombuffer(palette_rgba8888_data, dtype="<u4")
+    if len(palette_colors) == 0:
+        return None
+    palette_order: np.ndarray = np.argsort(palette_colors, kind="stable")
+    sorted_positions: np.ndarray = np.searchsorted(palette_colors, unique_colors, sorter=palette_order)
+    sorted_positions = np.minimum(sorted_positions, len(palette_colors) - 1)
+    palette_indices: np.ndarray = palette_order[sorted_positions]
+    if not np.array_equal(palette_colors[palette_indices], unique_colors):
+        return None
+    return palette_indices
+
+
+def get_dithered_palette_indices(rgba8888_data: bytes, img_width: int, palette: np.ndarray) -> np.ndarray:
+    """
+    Maps pixels to palette with ordered dithering. Strength of dithering is a typical distance
+    between neighbouring palette colors, so it adapts to the palette. Alpha is not dithered.
+    """
+    pixels: np.ndarray = np.frombuffer(rgba8888_data, dtype=np.uint8).reshape(-1, 4).astype(np.float32)
+    palette_distances: np.ndarray = np.sqrt(((palette[:, None, :3] - palette[None, :, :3]) ** 2).sum(axis=2))
+    np.fill_diagonal(palette_distances, np.inf)
+    dither_strength: float = float(np.median(palette_distances.min(axis=1))) if len(palette) > 1 else 0.0
+
+    pixel_positions: np.ndarray = np.arange(len(pixels))
+    thresholds: np.ndarray = ORDERED_DITHER_MATRIX[(pixel_positions // img_width) % 4, pixel_positions % img_width % 4]
+    pixels[:, :3] += thresholds[:, None] * dither_strength
+    return get_nearest_palette_indices(pixels, palette)
+
+
+def quantize_rgba8888_data(
+    rgba8888_data: bytes,
+    max_color_count: int,
+    palette_rgba8888_data: Optional[bytes] = None,
+    quantizer: str = "kmeans",
+    dithering_width: int = 0,
+) -> Tuple[np.ndarray, Optional[bytes]]:
+    """
+    Returns palette index for each pixel and RGBA8888 palette (up to "max_color_count" colors).
+    If all pixels already exist in "palette_rgba8888_data", this palette is reused and None is returned
+    instead of new palette. Results are cached by image hash.
+    If "dithering_width" (image width) is set, lossy palettes are applied with ordered dithering.
+    """
+    if quantizer not in PALETTE_QUANTIZERS:
+        raise Exception(f"Unknown palette quantizer: {quantizer}")
+    image_hash: bytes = hashlib.blake2b(rgba8888_data, digest_size=16).digest()
+    palette_hash: bytes = hashlib.blake2b(palette_rgba8888_data or b"", digest_size=16).digest()
+    cache_key: tuple = (image_hash, palette_hash, max_color_count, quantizer, dithering_width)
+    with quantize_cache_lock:
+        cached_result: Optional[tuple] = quantize_cache.get(cache_key)
+        if cached_result is not None:
+            quantize_cache.move_to_end(cache_key)
+            return cached_result
+
+    unique_colors, pixel_color_indices, color_counts = get_color_histogram(rgba8888_data)
+    existing_palette_indices: Optional[np.ndarray] = None
+    if palette_rgba8888_data:
+        usable_palette_size: int = max_color_count * 4  # image can't use palette entries above max color count
+        existing_palette_indices = get_existing_palette_indices(
+            unique_colors, palette_rgba8888_data[:usable_palette_size]
+        )
+
+    palette_rgba8888_result: Optional[bytes] = None
+    if existing_palette_indices is not None:
+        color_palette_indices: np.ndarray = existing_palette_indices
+    elif len(unique_colors) <= max_color_count:
+        color_palette_indices = np.arange(len(unique_colors))  # lossless, every color gets its own palette entry
+        palette_rgba8888_result = unique_colors.astype("<u4").tobytes()
+    else:
+        colors: np.ndarray = unique_colors.view(np.uint8).reshape(-1, 4).astype(np.float32)
+        weights: np.ndarray = color_counts.astype(np.float32)
+        histogram_colors, histogram_weights = colors, weights
+        if len(colors) > REDUCED_HISTOGRAM_MIN_COLORS:
+            histogram_colors, histogram_weights = get_reduced_histogram(colors, weights)
+        palette: np.ndarray = median_cut(histogram_colors, histogram_weights, max_color_count)
+        if quantizer == "kmeans":
+            palette = kmeans_refine(histogram_colors, histogram_weights, palette)
+        palette = np.clip(np.rint(palette), 0, 255)
+        color_palette_indices = get_nearest_palette_indices(colors, palette)
+        palette_rgba8888_result = palette.astype(np.uint8).tobytes()
+        if dithering_width:
+            pixel_color_indices = get_dithered_palette_indices(rgba8888_data, dithering_width, palette)
+            color_palette_indices = np.arange(len(palette))
+
+    pixel_palette_indices: np.ndarray = color_palette_indices.astype(np.uint8)[pixel_color_indices]
+    pixel_palette_indices.flags.writeable = False  # result is shared by cache
+    result: tuple = (pixel_palette_indices, palette_rgba8888_result)
+    with quantize_cache_lock:
+        quantize_cache[cache_key] = result
+        while len(quantize_cache) > PALETTE_CACHE_MAX_ENTRIES:
+            quantize_cache.popitem(last=False)
+    return result
+
+
+def clear_quantize_cache() -> None:
+    with quantize_cache_lock:
+        quantize_cache.clear()
+
+
+def encode_palette_indices(palette_indices: np.ndarray, image_format: ImageFormats, image_endianess: str) -> bytes:
+    if image_format == ImageFormats.PAL8:
+        return palette_indices.tobytes()
+    if image_format == ImageFormats.PAL4:
+        if len(palette_indices) % 2:
+            palette_indices = np.append(palette_indices, np.uint8(0))
+        first_indices, second_indices = palette_indices[0::2] & 0x0F, palette_indices[1::2] & 0x0F
+        if image_endianess == "little":
+            return ((second_indices << 4) | first_indices).astype(np.uint8).tobytes()
+        return ((first_indices << 4) | second_indices).astype(np.uint8).tobytes()
+    raise Exception(f"Image format {image_format} not supported!")
+
+
+def encode_palette(
+    palette_rgba8888_data: bytes, palette_format: ImageFormats, image_endianess: str, max_color_count: int
+) -> bytes:
+    # palette is aligned to 16 or 256 colors, unused entries are filled with zeros
+    aligned_color_count: int = 16 if max_color_count <= 16 else 256
+    palette_color_count: int = len(palette_rgba8888_data) // 4
+    encoded_palette_data: bytes = image_encoder.encode_image(
+        palette_rgba8888_data, palette_color_count, 1, palette_format, image_endianess=image_endianess
+    )
+    bytes_per_color: int = len(encoded_palette_data) // palette_color_count
+    return encoded_palette_data + bytes((aligned_color_count - palette_color_count) * bytes_per_color)
+
+
+def encode_indexed_image(
+    rgba8888_data: bytes,
+    img_width: int,
+    img_height: int,
+    image_format: ImageFormats,
+    palette_format: ImageFormats,
+    max_color_count: int,
+    image_endianess: str = "little",
+    palette_endianess: str = "little",
+    number_of_mipmaps: int = 0,
+    existing_palette_data: Optional[bytes] = None,
+    quantizer: str = "kmeans",
+    use_dithering: bool = False,
+) -> Tuple[bytes, bytes]:
+    """
+    Quantizes and encodes RGBA8888 image to indexed format (PAL4/PAL8). Output is the same as in
+    "ImageEncoder.encode_indexed_image", but existing palette is reused if it contains all colors of the image.
+    Returns encoded image data (with mipmaps) and encoded palette data.
+    """
+    if image_format not in (ImageFormats.PAL4, ImageFormats.PAL8):
+        raise Exception(f"Image format {image_format} not supported!")
+    if not max_color_count or max_color_count > 256:
+        raise Exception(f"Max number of colors {max_color_count} is not allowed!")
+    if len(rgba8888_data) != img_width * img_height * 4:
+        raise Exception(f"Wrong RGBA data size: {len(rgba8888_data)}")
+
+    existing_palette_rgba8888_data: Optional[bytes] = None
+    if existing_palette_data:
+        existing_palette_rgba8888_data = decode_palette_to_rgba8888(
+            existing_palette_data, palette_format, palette_endianess
+        )
+    palette_indices, palette_rgba8888_data = quantize_rgba8888_data(
+        rgba8888_data, max_color_count, existing_palette_rgba8888_data, quantizer, img_width if use_dithering else 0
+    )
+    if palette_rgba8888_data is None:
+        logger.info("All colors found in existing palette. Palette is reused.")
+        encoded_palette_data: bytes = existing_palette_data
+    else:
+        encoded_palette_data = encode_palette(palette_rgba8888_data, palette_format, image_endianess, max_color_count)
+
+    encoded_image_data: bytes = encode_palette_indices(palette_indices, image_format, image_endianess)
+
+    # mipmaps are resized from palette indices, so they use the same palette
+    if number_of_mipmaps > 0:
+        indices_image: Image.Image = Image.fromarray(palette_indices.reshape(img_height, img_width))
+        mip_width: int = img_width
+        mip_height: int = img_height
+        for _ in range(number_of_mipmaps):
+            mip_width //= 2
+            mip_height //= 2
+            mip_indices_image: Image.Image = indices_image.resize((mip_width, mip_height), Image.Resampling.NEAREST)
+            encoded_image_data += encode_palette_indices(
+                np.asarray(mip_indices_image, dtype=np.uint8).reshape(-1), image_format, image_endianess
+            )
+
+    return encoded_image_data, encoded_palette_data
@@ -0,0 +1,57 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import functools
+from typing import Tuple
+
+import numpy as np
+from reversebox.image.common import get_stride_value_psp
+
+# Rows of PSP textures are aligned to 16 bytes.
+# Padding is removed with one strided copy (or no copy at all if rows are already aligned)
+# and added back on import with the same row layout.
+
+
+def is_psp_padding_used(ea_img_signature: str, entry_type: int) -> bool:
+    return ea_img_signature in ("SHPM", "ShpM") and entry_type not in (69, 70, 71)  # DXT types are not padded
+
+
+@functools.lru_cache(maxsize=256)
+def get_psp_row_layout(img_width: int, bpp: int) -> Tuple[int, int]:
+    """
+    Returns (row_size, padded_row_size) in bytes for one row of PSP texture.
+    """
+    if bpp >= 8:
+        row_size: int = img_width * (bpp // 8)
+    elif bpp == 4:
+        row_size = img_width // 2
+    else:
+        raise Exception(f"Not supported bpp={bpp}")
+    return row_size, get_stride_value_psp(img_width, bpp)
+
+
+def remove_psp_padding(image_data: bytes, img_width: int, img_height: int, bpp: int) -> bytes:
+    row_size, padded_row_size = get_psp_row_layout(img_width, bpp)
+    image_size: int = row_size * img_height
+    if row_size == padded_row_size:
+        return image_data if len(image_data) == image_size else bytes(image_data[:image_size])
+
+    padded_data: np.ndarray = np.frombuffer(image_data, dtype=np.uint8)
+    padded_size: int = padded_row_size * img_height
+    if len(padded_data) < padded_size:  # last rows are missing, they are filled with zeros
+        padded_data = np.concatenate([padded_data, np.zeros(padded_size - len(padded_data), dtype=np.uint8)])
+    rows: np.ndarray = padded_data[:padded_size].reshape(img_height, padded_row_size)
+    return rows[:, :row_size].tobytes()
+
+
+def add_psp_padding(image_data: bytes, img_width: int, img_height: int, bpp: int) -> bytes:
+    row_size, padded_row_size = get_psp_row_layout(img_width, bpp)
+    if row_size == padded_row_size:
+        return image_data
+    padded_rows: np.ndarray = np.zeros((img_height, padded_row_size), dtype=np.uint8)
+    padded_rows[:, :row_size] = np.frombuffer(image_data, dtype=np.uint8, count=row_size * img_height).reshape(
+        img_height, row_size
+    )
+    return padded_rows.tobytes()
@@ -0,0 +1,145 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import mmap
+import tempfile
+from typing import Union
+
+from src.EA_Image.constants import REFPACK_TEMP_FILE_OUTPUT_THRESHOLD
+
+# Streaming decoder for EA Refpack (QFS) compression.
+# Unlike RefpackHandler, it writes decompressed data directly into one preallocated
+# output buffer, so no intermediate copies of the decompressed data are made.
+
+
+def get_refpack_header_info(compressed_data) -> tuple:
+    """
+    Returns tuple (header_size, uncompressed_size) read from Refpack header.
+    """
+    if len(compressed_data) < 5:
+        raise Exception("Compressed data too short!")
+    compression_flags: int = compressed_data[0]
+    if compressed_data[1] != 0xFB:
+        raise Exception("Wrong refpack compression header!")
+
+    size_field_length: int = 4 if compression_flags & 0x80 else 3
+    header_offset: int = 2
+    if compression_flags & 0x01:
+        header_offset += size_field_length  # skip compressed size
+    header_size: int = header_offset + size_field_length
+    uncompressed_size: int = int.from_bytes(bytes(compressed_data[header_offset:header_size]), "big")
+    return header_size, uncompressed_size
+
+
+def create_refpack_output_buffer(uncompressed_size: int) -> Union[bytearray, mmap.mmap]:
+    # very big outputs are stored in temporary file mapping instead of process memory
+    if uncompressed_size < REFPACK_TEMP_FILE_OUTPUT_THRESHOLD:
+        return bytearray(uncompressed_size)
+    with tempfile.TemporaryFile() as temp_file:
+        temp_file.truncate(uncompressed_size)
+        return mmap.mmap(temp_file.fileno(), uncompressed_size)  # mapping stays valid after file is closed
+
+
+def decompress_refpack_into(compressed_data, output_buffer, input_offset: int) -> int:
+    """
+    Decodes Refpack commands starting at "input_offset" and writes results into "output_buffer".
+    Compressed data can be any buffer (bytes, mmap etc.).
+    Returns number of bytes written.
+    """
+    data = compressed_data
+    out = output_buffer
+    input_size: int = len(data)
+    output_size: int = len(out)
+    in_pos: int = input_offset
+    out_pos: int = 0
+
+    while in_pos < input_size:
+        b0: int = data[in_pos]
+        is_last_command: bool = False
+        if b0 < 0x80:  # 2-byte command
+            b1: int = data[in_pos + 1]
+            in_pos += 2
+            plain_length: int = b0 & 0x03
+            copy_length: int = ((b0 & 0x1C) >> 2) + 3
+            copy_offset: int = ((b0 & 0x60) << 3) + b1 + 1
+        elif b0 < 0xC0:  # 3-byte command
+            b1: int = data[in_pos + 1]
+            b2: int = data[in_pos + 2]
+            in_pos += 3
+            plain_length: int = b1 >> 6
+            copy_length: int = (b0 & 0x3F) + 4
+            copy_offset: int = ((b1 & 0x3F) << 8) + b2 + 1
+        elif b0 < 0xE0:  # 4-byte command
+            b1: int = data[in_pos + 1]
+            b2: int = data[in_pos + 2]
+            b3: int = data[in_pos + 3]
+            in_pos += 4
+            plain_length: int = b0 & 0x03
+            copy_length: int = ((b0 & 0x0C) << 6) + b3 + 5
+            copy_offset: int = ((b0 & 0x10) << 12) + (b1 << 8) + b2 + 1
+        elif b0 < 0xFC:  # literal bytes only
+            in_pos += 1
+            plain_length: int = ((b0 & 0x1F) << 2) + 4
+            copy_length: int = 0
+            copy_offset: int = 0
+        else:  # end of stream (with up to 3 literal bytes)
+            in_pos += 1
+            plain_length: int = b0 & 0x03
+            copy_length: int = 0
+            copy_offset: int = 0
+            is_last_command = True
+
+        if plain_length:
+            in_end: int = in_pos + plain_length
+            out_end: int = out_pos + plain_length
+            if out_end > output_size or in_end > input_size:
+                raise Exception("Corrupted refpack data! Literal bytes out of range.")
+            out[out_pos:out_end] = data[in_pos:in_end]
+            in_pos = in_end
+            out_pos = out_end
+
+        if copy_length:
+            copy_start: int = out_pos - copy_offset
+            out_end: int = out_pos + copy_length
+            if copy_start < 0 or out_end > output_size:
+                raise Exception("Corrupted refpack data! Back reference out of range.")
+            if copy_offset >= copy_length:
+                copy_end: int = copy_start + copy_length
+                out[out_pos:out_end] = out[copy_start:copy_end]
+            else:  # overlapping copy, repeat the pattern
+                pattern: bytes = bytes(out[copy_start:out_pos])
+                out[out_pos:out_end] = (pattern * (copy_length // copy_offset + 1))[:copy_length]
+            out_pos = out_end
+
+        if is_last_command:
+            break
+
+    return out_pos
+
+
+def decompress_refpack_data(compressed_data) -> Union[bytearray, mmap.mmap]:
+    """
+    Decompresses whole Refpack stream into buffer sized from the header.
+    Returns bytearray or (for very big outputs) mapping of temporary file.
+    """
+    header_size, uncompressed_size = get_refpack_header_info(compressed_data)
+    output_buffer = create_refpack_output_buffer(uncompressed_size)
+    try:
+        decompressed_size: int = decompress_refpack_into(compressed_data, output_buffer, header_size)
+    except IndexError:
+        decompressed_size = -1  # truncated command
+    if decompressed_size != uncompressed_size:
+        if isinstance(output_buffer, mmap.mmap):
+            output_buffer.close()
+        raise Exception(
+            f"Corrupted refpack data! Decompressed size {decompressed_size} doesn't match header ({uncompressed_size})."
+        )
+    return output_buffer
+
+
+def decompress_refpack_file(in_file) -> Union[bytearray, mmap.mmap]:
+    # compressed file is mapped, so it doesn't need to be read into memory
+    with mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ) as compressed_data:
+        return decompress_refpack_data(compressed_data)
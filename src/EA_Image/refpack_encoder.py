@@ -0,0 +1,334 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Tuple
+
+import numpy as np
+from reversebox.common.logger import get_logger
+
+from src.EA_Image.constants import (
+    DEFAULT_REFPACK_COMPRESSION_LEVEL,
+    REFPACK_COMPRESSION_CHUNK_SIZE,
+)
+
+logger = get_logger(__name__)
+
+# Encoder for EA Refpack (QFS) compression.
+# Matches are searched with hash chains for all positions at once (NumPy), only parsing runs in Python.
+# Data is processed in chunks, each chunk can also reference data of previous chunks (up to max offset),
+# so chunks can be compressed in worker processes without losing compression ratio.
+
+REFPACK_MAX_OFFSET = 131072
+LONG_MATCH_LENGTH = 32  # longer matches are measured once for each repeated run
+
+# copy commands: (max offset, min length, max length, command size)
+refpack_copy_commands: Tuple[Tuple[int, int, int, int], ...] = (
+    (1024, 3, 10, 2),
+    (16384, 4, 67, 3),
+    (131072, 5, 1028, 4),
+)
+
+# compression levels: (hash chain depth, parsing method)
+refpack_compression_levels: Dict[str, Tuple[int, str]] = {
+    "fast": (2, "greedy"),
+    "normal": (8, "lazy"),
+    "best": (32, "optimal"),
+}
+
+
+def _get_match_lengths(
+    data_words: np.ndarray, positions: np.ndarray, match_positions: np.ndarray, max_lengths: np.ndarray
+) -> np.ndarray:
+    # data is compared 8 bytes at a time, first different byte is found from the lowest set bit
+    lengths: np.ndarray = np.zeros(len(positions), dtype=np.int64)
+    active_indices: np.ndarray = np.arange(len(positions))
+    while len(active_indices):
+        differences: np.ndarray = (
+            data_words[positions[active_indices] + lengths[active_indices]]
+            ^ data_words[match_positions[active_indices] + lengths[active_indices]]
+        )
+        is_equal: np.ndarray = differences == 0
+        different_indices: np.ndarray = active_indices[~is_equal]
+        lowest_bits: np.ndarray = differences[~is_equal]
+        lowest_bits &= ~lowest_bits + np.uint64(1)
+        lengths[different_indices] += np.log2(lowest_bits.astype(np.float64)).astype(np.int64) // 8
+        active_indices = active_indices[is_equal]
+        lengths[active_indices] += 8
+        active_indices = active_indices[lengths[active_indices] < max_lengths[active_indices]]
+    return np.minimum(lengths, max_lengths)
+
+
+def _get_long_match_lengths(
+    data: bytes, data_words: np.ndarray, positions: np.ndarray, match_positions: np.ndarray, max_lengths: np.ndarray
+) -> np.ndarray:
+    """
+    Returns match lengths for sorted positions. Lengths are compared only up to LONG_MATCH_LENGTH bytes first.
+    Long matches at following positions with the same offset are parts of one repeated run (e.g. padding),
+    so real length is measured only at the start of each run and decreased by one for each next position.
+    """
+    lengths: np.ndarray = _get_match_lengths(
+        data_words, positions, match_positions, np.minimum(max_lengths, LONG_MATCH_LENGTH)
+    )
+    long_indices: np.ndarray = np.flatnonzero(lengths == LONG_MATCH_LENGTH)
+    if not len(long_indices):
+        return lengths
+
+    long_positions: np.ndarray = positions[long_indices]
+    long_offsets: np.ndarray = long_positions - match_positions[long_indices]
+    is_run_start: np.ndarray = np.ones(len(long_indices), dtype=bool)
+    is_run_start[1:] = (long_positions[1:] != long_positions[:-1] + 1) | (long_offsets[1:] != long_offsets[:-1])
+    run_start_indices: np.ndarray = np.flatnonzero(is_run_start)
+
+    data_size: int = len(data)
+    run_lengths: List[int] = []
+    for position, offset in zip(long_positions[run_start_indices].tolist(), long_offsets[run_start_indices].tolist()):
+        length: int = LONG_MATCH_LENGTH
+        step: int = LONG_MATCH_LENGTH
+        while step:  # exponential search, then binary search of the first different byte
+            start_offset: int = position + length
+            end_offset: int = start_offset + step
+            match_start_offset: int = start_offset - offset
+            match_end_offset: int = end_offset - offset
+            if end_offset <= data_size and data[start_offset:end_offset] == data[match_start_offset:match_end_offset]:
+                length += step
+                step *= 2
+            else:
+                step //= 2
+        run_lengths.append(length)
+
+    run_numbers: np.ndarray = np.cumsum(is_run_start) - 1
+    run_start_positions: np.ndarray = long_positions[run_start_indices][run_numbers]
+    real_lengths: np.ndarray = np.array(run_lengths)[run_numbers] - (long_positions - run_start_positions)
+    lengths[long_indices] = np.minimum(real_lengths, max_lengths[long_indices])
+    return lengths
+
+
+def find_refpack_matches(data: bytes, history_size: int, chain_depth: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Finds best matches for all positions after "history_size" (data before is used only as dictionary).
+    Returns arrays of usable lengths and offsets, one row for each copy command type (0 - no match).
+    """
+    data_size: int = len(data)
+    positions: np.ndarray = np.arange(history_size, max(data_size - 2, history_size), dtype=np.int64)
+    best_lengths: np.ndarray = np.zeros((len(refpack_copy_commands), len(positions)), dtype=np.int64)
+    best_offsets: np.ndarray = np.zeros((len(refpack_copy_commands), len(positions)), dtype=np.int64)
+    if not len(positions):
+        return best_lengths, best_offsets
+
+    # previous position with the same 3 bytes (keys are exact, so each candidate matches at least 3 bytes)
+    data_bytes: np.ndarray = np.frombuffer(data, dtype=np.uint8).astype(np.int32)
+    keys: np.ndarray = (data_bytes[:-2] << 16) | (data_bytes[1:-1] << 8) | data_bytes[2:]
+    key_order: np.ndarray = np.argsort(keys, kind="stable")
+    sorted_keys: np.ndarray = keys[key_order]
+    previous_positions: np.ndarray = np.full(len(keys), -1, dtype=np.int64)
+    previous_positions[key_order[1:]] = np.where(sorted_keys[1:] == sorted_keys[:-1], key_order[:-1], -1)
+
+    padded_data: bytes = bytes(data) + bytes(8)
+    data_words: np.ndarray = np.ndarray(shape=(data_size + 1,), dtype="<u8", buffer=padded_data, strides=(1,))
+    max_lengths: np.ndarray = np.minimum(data_size - positions, refpack_copy_commands[-1][2])
+
+    candidates: np.ndarray = previous_positions[positions]
+    for _ in range(chain_depth):
+        offsets: np.ndarray = positions - candidates
+        valid_indices: np.ndarray = np.flatnonzero((candidates >= 0) & (offsets <= REFPACK_MAX_OFFSET))
+        if not len(valid_indices):
+            break
+        valid_offsets: np.ndarray = offsets[valid_indices]
+        lengths: np.ndarray = _get_long_match_lengths(
+            data,
+            data_words,
+            positions[valid_indices],
+            candidates[valid_indices],
+            max_lengths[valid_indices],
+        )
+        for command_number, (max_offset, min_length, _, _) in enumerate(refpack_copy_commands):
+            is_better: np.ndarray = (
+                (valid_offsets <= max_offset)
+                & (lengths >= min_length)
+                & (lengths > best_lengths[command_number, valid_indices])
+            )
+            better_indices: np.ndarray = valid_indices[is_better]
+            best_lengths[command_number, better_indices] = lengths[is_better]
+            best_offsets[command_number, better_indices] = valid_offsets[is_better]
+        candidates = np.where(candidates >= 0, previous_positions[np.maximum(candidates, 0)], -1)
+
+    for command_number, (_, _, max_length, _) in enumerate(refpack_copy_commands):
+        np.minimum(best_lengths[command_number], max_length, out=best_lengths[command_number])
+    return best_lengths, best_offsets
+
+
+def _parse_matches_greedy(best_lengths: np.ndarray, best_offsets: np.ndarray, is_lazy: bool) -> tuple:
+    # at each position command saving the most bytes is used
+    command_sizes: np.ndarray = np.array([command[3] for command in refpack_copy_commands])[:, None]
+    savings: np.ndarray = np.where(best_lengths > 0, best_lengths - command_sizes, 0)
+    best_commands: np.ndarray = savings.argmax(axis=0)
+    match_indices: np.ndarray = np.arange(best_lengths.shape[1])
+    match_savings: list = savings[best_commands, match_indices].tolist()
+    match_lengths: list = best_lengths[best_commands, match_indices].tolist()
+    match_offsets: list = best_offsets[best_commands, match_indices].tolist()
+    positions_count: int = len(match_savings)
+
+    # next position with usable match, so literal runs are skipped at once
+    next_match_positions: list = np.minimum.accumulate(
+        np.where(np.array(match_savings) > 0, match_indices, positions_count)[::-1]
+    )[::-1].tolist() + [positions_count]
+
+    positions: List[int] = []
+    lengths: List[int] = []
+    offsets: List[int] = []
+    position: int = next_match_positions[0]
+    while position < positions_count:
+        if is_lazy and position + 1 < positions_count and match_savings[position + 1] > match_savings[position]:
+            position += 1  # better match starts at next byte
+            continue
+        positions.append(position)
+        lengths.append(match_lengths[position])
+        offsets.append(match_offsets[position])
+        position += match_lengths[position]
+        if position < positions_count:
+            position = next_match_positions[position]
+    return positions, lengths, offsets
+
+
+def _parse_matches_optimal(best_lengths: np.ndarray, best_offsets: np.ndarray) -> tuple:
+    # shortest path from end of data, literal costs 1 byte, copy command costs its size
+    positions_count: int = best_lengths.shape[1]
+    command_lengths: List[list] = best_lengths.tolist()
+    command_sizes: List[int] = [command[3] for command in refpack_copy_commands]
+    path_costs: List[int] = [0] * positions_count + [2, 1, 0]  # last 2 bytes are always literals
+    path_commands: List[int] = [-1] * positions_count
+    for position in range(positions_count - 1, -1, -1):
+        best_cost: int = path_costs[position + 1] + 1
+        best_command: int = -1
+        for command_number in range(len(command_sizes)):
+            length: int = command_lengths[command_number][position]
+            if length:
+                cost: int = path_costs[position + length] + command_sizes[command_number]
+                if cost < best_cost:
+                    best_cost, best_command = cost, command_number
+        path_costs[position] = best_cost
+        path_commands[position] = best_command
+
+    positions: List[int] = []
+    lengths: List[int] = []
+    offsets: List[int] = []
+    position: int = 0
+    while position < positions_count:
+        command_number: int = path_commands[position]
+        if command_number < 0:
+            position += 1
+            continue
+        length: int = command_lengths[command_number][position]
+        positions.append(position)
+        lengths.append(length)
+        offsets.append(int(best_offsets[command_number, position]))
+        position += length
+    return positions, lengths, offsets
+
+
+def find_refpack_chunk_commands(data: bytes, history_size: int, compression_level: str) -> tuple:
+    """
+    Returns copy commands (positions, lengths, offsets) for data after "history_size".
+    Positions are relative to the end of history.
+    """
+    chain_depth, parsing_method = refpack_compression_levels[compression_level]
+    best_lengths, best_offsets = find_refpack_matches(data, history_size, chain_depth)
+    if parsing_method == "optimal":
+        return _parse_matches_optimal(best_lengths, best_offsets)
+    return _parse_matches_greedy(best_lengths, best_offsets, parsing_method == "lazy")
+
+
+def _write_literal_blocks(data: bytes, literal_start: int, literal_length: int, output_data: bytearray) -> int:
+    # literals are written in blocks of 4-112 bytes, last 0-3 bytes are stored with the next command
+    while literal_length > 3:
+        block_length: int = min(literal_length & ~3, 112)
+        block_end: int = literal_start + block_length
+        output_data.append(0xE0 | ((block_length - 4) >> 2))
+        output_data += data[literal_start:block_end]
+        literal_start = block_end
+        literal_length -= block_length
+    return literal_start
+
+
+def write_refpack_commands(data: bytes, commands: tuple, output_data: bytearray) -> None:
+    literal_start: int = 0
+    for position, length, offset in zip(*commands):
+        literal_start = _write_literal_blocks(data, literal_start, position - literal_start, output_data)
+        literal_length: int = position - literal_start
+        encoded_offset: int = offset - 1
+        if offset <= 1024 and length <= 10:
+            output_data += bytes(
+                (((encoded_offset >> 8) << 5) | ((length - 3) << 2) | literal_length, encoded_offset & 0xFF)
+            )
+        elif offset <= 16384 and length <= 67:
+            output_data += bytes(
+                (0x80 | (length - 4), (literal_length << 6) | (encoded_offset >> 8), encoded_offset & 0xFF)
+            )
+        else:
+            output_data += bytes(
+                (
+                    0xC0 | ((encoded_offset >> 16) << 4) | (((length - 5) >> 8) << 2) | literal_length,
+                    (encoded_offset >> 8) & 0xFF,
+                    encoded_offset & 0xFF,
+                    (length - 5) & 0xFF,
+                )
+            )
+        output_data += data[literal_start:position]
+        literal_start = position + length
+
+    literal_start = _write_literal_blocks(data, literal_start, len(data) - literal_start, output_data)
+    output_data.append(0xFC | (len(data) - literal_start))  # end of stream
+    output_data += data[literal_start:]
+
+
+def compress_refpack_data(
+    data: bytes, compression_level: str = DEFAULT_REFPACK_COMPRESSION_LEVEL, max_workers: int = 1
+) -> bytes:
+    """
+    Compresses data with Refpack algorithm.
+    Compression levels: "fast" (short hash chains, greedy parsing), "normal" (lazy parsing)
+    and "best" (long hash chains, optimal parsing).
+    Chunks of data are compressed in worker processes if max_workers is bigger than 1.
+    """
+    if compression_level not in refpack_compression_levels:
+        raise Exception(f"Unknown refpack compression level: {compression_level}")
+    data = bytes(data)
+    data_size: int = len(data)
+
+    chunk_starts: List[int] = list(range(0, data_size, REFPACK_COMPRESSION_CHUNK_SIZE))
+    history_sizes: List[int] = [min(chunk_start, REFPACK_MAX_OFFSET) for chunk_start in chunk_starts]
+    chunks: List[bytes] = []
+    for chunk_start, history_size in zip(chunk_starts, history_sizes):
+        history_start: int = chunk_start - history_size
+        chunk_end: int = chunk_start + REFPACK_COMPRESSION_CHUNK_SIZE
+        chunks.append(data[history_start:chunk_end])
+    if max_workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            chunk_commands: list = list(
+                executor.map(find_refpack_chunk_commands, chunks, history_sizes, repeat(compression_level))
+            )
+    else:
+        chunk_commands = [
+            find_refpack_chunk_commands(chunk, history_size, compression_level)
+            for chunk, history_size in zip(chunks, history_sizes)
+        ]
+
+    positions: List[int] = []
+    lengths: List[int] = []
+    offsets: List[int] = []
+    for chunk_start, (chunk_positions, chunk_lengths, chunk_offsets) in zip(chunk_starts, chunk_commands):
+        positions.extend(chunk_start + position for position in chunk_positions)
+        lengths.extend(chunk_lengths)
+        offsets.extend(chunk_offsets)
+
+    if data_size < 0x1000000:
+        output_data = bytearray(b"\x10\xFB" + data_size.to_bytes(3, "big"))
+    else:
+        output_data = bytearray(b"\x90\xFB" + data_size.to_bytes(4, "big"))  # 4-byte size field
+    write_refpack_commands(data, (positions, lengths, offsets), output_data)
+    logger.debug(f"Refpack compression ({compression_level}): {data_size} -> {len(output_data)} bytes")
+    return bytes(output_data)
@@ -0,0 +1,323 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+from reversebox.common.logger import get_logger
+from reversebox.image.common import (
+    convert_bpp_to_bytes_per_pixel,
+    get_stride_value,
+    get_stride_value_psp,
+)
+from reversebox.image.swizzling.swizzle_gamecube import (
+    swizzle_gamecube,
+    unswizzle_gamecube,
+)
+from reversebox.image.swizzling.swizzle_morton import swizzle_morton, unswizzle_morton
+from reversebox.image.swizzling.swizzle_ps2 import swizzle_ps2, unswizzle_ps2
+from reversebox.image.swizzling.swizzle_psp import swizzle_psp, unswizzle_psp
+
+from src.EA_Image.constants import SWIZZLE_PLAN_CACHE_BYTE_BUDGET
+
+logger = get_logger(__name__)
+
+# Swizzling of all platforms is a permutation of bytes (or nibbles for PS2 4-bit images), which depends only
+# on image size and bpp. Permutation is calculated once as array of source indices ("swizzle plan")
+# and then every image (or mipmap) with the same parameters is converted with a single NumPy gather.
+
+SWIZZLE_KINDS: Tuple[str, ...] = ("morton", "psp", "ps2", "gamecube")
+SWIZZLE_PLAN_FIRST_USE_MAX_KEYS: int = 256
+
+# reversebox functions (unswizzle, swizzle), used for plans which can't be calculated with NumPy
+reversebox_swizzle_functions: Dict[str, Tuple[Callable, Callable]] = {
+    "morton": (unswizzle_morton, swizzle_morton),
+    "psp": (unswizzle_psp, swizzle_psp),
+    "ps2": (
+        lambda image_data, img_width, img_height, bpp: unswizzle_ps2(image_data, img_width, img_height, bpp, 1),
+        lambda image_data, img_width, img_height, bpp: swizzle_ps2(image_data, img_width, img_height, bpp, 1),
+    ),
+    "gamecube": (unswizzle_gamecube, swizzle_gamecube),
+}
+
+
+class SwizzlePlan:
+    def __init__(self, source_indices: np.ndarray, unit_bits: int):
+        # positions which are not written by swizzle function are zero
+        missing_mask: np.ndarray = source_indices < 0
+        self.missing_mask: Optional[np.ndarray] = missing_mask if missing_mask.any() else None
+        self.source_indices: np.ndarray = np.where(missing_mask, 0, source_indices).astype(np.int32)
+        self.unit_bits: int = unit_bits  # 8 for byte permutation, 4 for nibble permutation
+        self.size: int = self.source_indices.nbytes + (self.missing_mask.nbytes if self.missing_mask is not None else 0)
+
+    def apply(self, image_data: bytes) -> bytes:
+        units: np.ndarray = np.frombuffer(image_data, dtype=np.uint8)
+        if self.unit_bits == 4:
+            units = _unpack_nibbles(units)
+        converted_units: np.ndarray = units[self.source_indices]
+        if self.missing_mask is not None:
+            converted_units[self.missing_mask] = 0
+        if self.unit_bits == 4:
+            converted_units = _pack_nibbles(converted_units)
+        return converted_units.tobytes()
+
+
+class SwizzlePlanCache:
+    """
+    LRU cache for swizzle plans.
+    Total size of all cached index arrays is limited by byte budget.
+    """
+
+    def __init__(self, byte_budget: int = SWIZZLE_PLAN_CACHE_BYTE_BUDGET):
+        self.byte_budget: int = byte_budget
+        self.current_size: int = 0
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.first_use_keys: OrderedDict = OrderedDict()
+
+    def mark_first_use(self, key: tuple) -> bool:
+        # returns True if key wasn't used before (only recently used keys are remembered)
+        with self.lock:
+            if key in self.first_use_keys:
+                del self.first_use_keys[key]
+                return False
+            self.first_use_keys[key] = None
+            if len(self.first_use_keys) > SWIZZLE_PLAN_FIRST_USE_MAX_KEYS:
+                self.first_use_keys.popitem(last=False)
+            return True
+
+    def get(self, key: tuple) -> Optional[SwizzlePlan]:
+        with self.lock:
+            swizzle_plan: Optional[SwizzlePlan] = self.entries.get(key)
+            if swizzle_plan is not None:
+                self.entries.move_to_end(key)  # mark as recently used
+            return swizzle_plan
+
+    def put(self, key: tuple, swizzle_plan: SwizzlePlan) -> None:
+        with self.lock:
+            if key in self.entries or swizzle_plan.size > self.byte_budget:
+                return
+            self.entries[key] = swizzle_plan
+            self.current_size += swizzle_plan.size
+            while self.current_size > self.byte_budget:
+                _, evicted_plan = self.entries.popitem(last=False)
+                self.current_size -= evicted_plan.size
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.first_use_keys.clear()
+            self.current_size = 0
+
+
+swizzle_plan_cache: SwizzlePlanCache = SwizzlePlanCache()
+
+
+class SwizzlePlanNotSupportedError(Exception):
+    pass
+
+
+def _unpack_nibbles(data: np.ndarray) -> np.ndarray:
+    return np.stack([data & 0x0F, data >> 4], axis=-1).ravel()
+
+
+def _pack_nibbles(nibbles: np.ndarray) -> np.ndarray:
+    return (nibbles[0::2] | (nibbles[1::2] << 4)).astype(np.uint8)
+
+
+def _get_morton_indices(pixel_indices: np.ndarray, img_width: int, img_height: int) -> np.ndarray:
+    # the same as calculate_morton_index from reversebox, but for all pixels at once
+    x_multiplier = y_multiplier = 1
+    x_values: np.ndarray = np.zeros_like(pixel_indices)
+    y_values: np.ndarray = np.zeros_like(pixel_indices)
+    width, height = img_width, img_height
+    while width > 1 or height > 1:
+        if width > 1:
+            x_values += x_multiplier * (pixel_indices & 1)
+            pixel_indices = pixel_indices >> 1
+            x_multiplier *= 2
+            width >>= 1
+        if height > 1:
+            y_values += y_multiplier * (pixel_indices & 1)
+            pixel_indices = pixel_indices >> 1
+            y_multiplier *= 2
+            height >>= 1
+    return y_values * img_width + x_values
+
+
+def _expand_to_bytes(pixel_offsets: np.ndarray, byte_offsets) -> np.ndarray:
+    return (pixel_offsets.reshape(-1, 1) + np.asarray(byte_offsets, dtype=np.int64)).ravel()
+
+
+def _get_morton_positions(img_width: int, img_height: int, bpp: int, data_length: int) -> tuple:
+    if bpp < 8:
+        return data_length, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)  # reversebox copies nothing
+    bytes_per_pixel: int = convert_bpp_to_bytes_per_pixel(bpp)
+    pixel_indices: np.ndarray = np.arange(img_width * img_height, dtype=np.int64)
+    morton_indices: np.ndarray = _get_morton_indices(pixel_indices, img_width, img_height)
+    byte_offsets: range = range(bytes_per_pixel)
+    linear_positions: np.ndarray = _expand_to_bytes(pixel_indices * bytes_per_pixel, byte_offsets)
+    morton_positions: np.ndarray = _expand_to_bytes(morton_indices * bytes_per_pixel, byte_offsets)
+    # reversebox unswizzle writes pixel "t" of input at morton index "t" of output
+    return data_length, morton_positions, linear_positions
+
+
+def _get_psp_positions(img_width: int, img_height: int, bpp: int, data_length: int, swizzle_flag: bool) -> tuple:
+    padded_stride: int = get_stride_value_psp(img_width, bpp)
+    if not swizzle_flag:
+        stride: int = padded_stride  # unswizzled data keeps padding
+        output_length: int = data_length
+    else:
+        stride = get_stride_value(img_width, bpp)
+        output_length = padded_stride * ((img_height + 7) & ~7)
+    y_values, x_values = np.mgrid[0:img_height, 0:stride].astype(np.int64)
+    block_indices: np.ndarray = x_values // 16 + (y_values // 8) * (padded_stride // 16)
+    swizzled_positions: np.ndarray = block_indices * 16 * 8 + (y_values % 8) * 16 + x_values % 16
+    return output_length, (y_values * stride + x_values).ravel(), swizzled_positions.ravel()
+
+
+def _get_ps2_positions(img_width: int, img_height: int, bpp: int, data_length: int) -> tuple:
+    y_values, x_values = np.mgrid[0:img_height, 0:img_width].astype(np.int64)
+    if bpp == 8:
+        block_location: np.ndarray = (y_values & ~0xF) * img_width + (x_values & ~0xF) * 2
+        swap_selector: np.ndarray = (((y_values + 2) >> 2) & 0x1) * 4
+        pos_y: np.ndarray = (((y_values & ~3) >> 1) + (y_values & 1)) & 0x7
+        column_location: np.ndarray = pos_y * img_width * 2 + ((x_values + swap_selector) & 0x7) * 4
+        byte_num: np.ndarray = ((y_values >> 1) & 1) + ((x_values >> 2) & 2)
+        swizzled_positions: np.ndarray = block_location + column_location + byte_num
+        return img_width * img_height, (y_values * img_width + x_values).ravel(), swizzled_positions.ravel()
+    if bpp in (15, 16):
+        bit_offsets: np.ndarray = np.zeros_like(x_values)
+        page_x, page_y = x_values, y_values
+        if img_width >= 16:
+            bit_offsets = (x_values & 0x08) << 1
+            page_x = ((x_values >> 6) << 6) + (y_values & 0x38) + (x_values & 0x07)
+            page_y = ((y_values >> 6) << 5) + ((x_values & 0x30) >> 1) + (y_values & 0x07)
+        swizzled_offsets: np.ndarray = (32 * (page_y * img_width + page_x) + bit_offsets) >> 3
+        linear_offsets: np.ndarray = (y_values * img_width + x_values) * 2
+        return data_length, _expand_to_bytes(linear_offsets, (0, 1)), _expand_to_bytes(swizzled_offsets, (0, 1))
+    raise SwizzlePlanNotSupportedError(f"Bpp {bpp} is not supported by PS2 swizzle plan!")
+
+
+def _get_gamecube_positions(img_width: int, img_height: int, bpp: int, data_length: int) -> tuple:
+    y_values, x_values = np.mgrid[0:img_height, 0:img_width].astype(np.int64)
+    if bpp in (32, 15, 16):
+        tile_shift: int = 6 if bpp == 32 else 5
+        blocks_x: int = (3 + img_width) >> 2
+        swizzled_offsets: np.ndarray = (((y_values >> 2) * blocks_x + (x_values >> 2)) << tile_shift) + (
+            ((y_values & 3) << 3) + ((x_values & 3) << 1)
+        )
+        if bpp == 32:  # AR and GB parts of pixel are in separate halves of tile
+            return (
+                data_length,
+                _expand_to_bytes((y_values * img_width + x_values) * 4, (0, 1, 2, 3)),
+                _expand_to_bytes(swizzled_offsets, (0, 1, 32, 33)),
+            )
+        linear_offsets: np.ndarray = (y_values * img_width + x_values) * 2
+        return data_length, _expand_to_bytes(linear_offsets, (0, 1)), _expand_to_bytes(swizzled_offsets, (0, 1))
+    if bpp in (4, 8):
+        blocks_x = (7 + img_width) >> 3
+        if bpp == 8:
+            block_y_shift, row_shift, x_pixel_offsets = 2, 3, x_values & 7
+            linear_offsets = y_values * img_width + x_values
+        else:  # two pixels in one byte are copied together
+            block_y_shift, row_shift, x_pixel_offsets = 3, 2, (x_values & 7) >> 1
+            linear_offsets = y_values * (img_width // 2) + x_values // 2
+        y_pixels: np.ndarray = y_values & ((1 << block_y_shift) - 1)
+        swizzled_offsets = (((y_values >> block_y_shift) * blocks_x + (x_values >> 3)) << 5) + (
+            (y_pixels << row_shift) + x_pixel_offsets
+        )
+        return data_length, linear_offsets.ravel(), swizzled_offsets.ravel()
+    raise SwizzlePlanNotSupportedError(f"Bpp {bpp} is not supported by GameCube swizzle plan!")
+
+
+def _get_probed_source_indices(
+    swizzle_function: Callable, img_width: int, img_height: int, bpp: int, data_length: int
+) -> np.ndarray:
+    # PS2 4-bit swizzling moves nibbles through pages of 32-bit blocks, so instead of reimplementing it,
+    # reversebox function is called with nibble indices (one 4-bit digit at a time) and result is read back
+    if data_length == 0:
+        return np.zeros(0, dtype=np.int64)  # e.g. 1x1 level
+    nibble_indices: np.ndarray = np.arange(1, data_length * 2 + 1, dtype=np.int64)  # 0 means not written
+    source_indices: Optional[np.ndarray] = None
+    for shift in range(0, max(int(nibble_indices[-1]).bit_length(), 1), 4):
+        index_digits: np.ndarray = _pack_nibbles((nibble_indices >> shift) & 0x0F).tobytes()
+        converted_digits: np.ndarray = _unpack_nibbles(
+            np.frombuffer(bytes(swizzle_function(index_digits, img_width, img_height, bpp)), dtype=np.uint8)
+        ).astype(np.int64)
+        if source_indices is None:
+            source_indices = np.zeros_like(converted_digits)
+        source_indices |= converted_digits << shift
+    return source_indices - 1
+
+
+def is_swizzle_plan_probed(swizzle_kind: str, bpp: int) -> bool:
+    return swizzle_kind == "ps2" and bpp == 4
+
+
+def create_swizzle_plan(
+    swizzle_kind: str, img_width: int, img_height: int, bpp: int, data_length: int, swizzle_flag: bool
+) -> SwizzlePlan:
+    if is_swizzle_plan_probed(swizzle_kind, bpp):
+        swizzle_function: Callable = reversebox_swizzle_functions[swizzle_kind][int(swizzle_flag)]
+        return SwizzlePlan(_get_probed_source_indices(swizzle_function, img_width, img_height, bpp, data_length), 4)
+
+    if swizzle_kind == "morton":
+        output_length, linear_positions, swizzled_positions = _get_morton_positions(
+            img_width, img_height, bpp, data_length
+        )
+    elif swizzle_kind == "psp":
+        output_length, linear_positions, swizzled_positions = _get_psp_positions(
+            img_width, img_height, bpp, data_length, swizzle_flag
+        )
+    elif swizzle_kind == "ps2":
+        output_length, linear_positions, swizzled_positions = _get_ps2_positions(
+            img_width, img_height, bpp, data_length
+        )
+    elif swizzle_kind == "gamecube":
+        output_length, linear_positions, swizzled_positions = _get_gamecube_positions(
+            img_width, img_height, bpp, data_length
+        )
+    else:
+        raise SwizzlePlanNotSupportedError(f"Swizzle kind {swizzle_kind} is not supported!")
+
+    if swizzle_flag:
+        destination_positions, source_positions = swizzled_positions, linear_positions
+    else:
+        destination_positions, source_positions = linear_positions, swizzled_positions
+    if len(destination_positions) and (
+        destination_positions.max() >= output_length or source_positions.max() >= data_length
+    ):
+        # reversebox functions would fail or resize output for such data, so they are used directly
+        raise SwizzlePlanNotSupportedError("Image data size doesn't match image dimensions!")
+    source_indices: np.ndarray = np.full(output_length, -1, dtype=np.int64)
+    source_indices[destination_positions] = source_positions
+    return SwizzlePlan(source_indices, 8)
+
+
+def convert_swizzle(
+    image_data: bytes, swizzle_kind: str, img_width: int, img_height: int, bpp: int, swizzle_flag: bool
+) -> bytes:
+    """
+    Swizzles (swizzle_flag=True) or unswizzles image data using cached swizzle plan.
+    Result is the same as result of reversebox swizzle functions.
+    """
+    plan_key: tuple = (swizzle_kind, img_width, img_height, bpp, len(image_data), swizzle_flag)
+    swizzle_plan: Optional[SwizzlePlan] = swizzle_plan_cache.get(plan_key)
+    if swizzle_plan is None:
+        try:
+            if is_swizzle_plan_probed(swizzle_kind, bpp) and swizzle_plan_cache.mark_first_use(plan_key):
+                # probing costs a few reversebox calls, so it's done only for sizes which are used more than once
+                raise SwizzlePlanNotSupportedError("Plan is created on second use of image size")
+            swizzle_plan = create_swizzle_plan(swizzle_kind, img_width, img_height, bpp, len(image_data), swizzle_flag)
+        except SwizzlePlanNotSupportedError as error:
+            logger.debug(f"Swizzle plan not used: {error}")
+            swizzle_function: Callable = reversebox_swizzle_functions[swizzle_kind][int(swizzle_flag)]
+            return bytes(swizzle_function(image_data, img_width, img_height, bpp))
+        swizzle_plan_cache.put(plan_key, swizzle_plan)
+    return swizzle_plan.apply(image_data)
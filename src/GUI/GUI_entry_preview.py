@@ -25,16 +25,20 @@ class GuiEntryPreview(tk.Frame):
         self.ph_img = None
         self.preview_instance = None
 
-    def init_image_preview_logic(self, ea_dir, item_iid):
-        if not ea_dir.img_convert_data or len(ea_dir.img_convert_data) == 0:
+    def init_image_preview_logic(self, ea_img, ea_dir, item_iid):
+        # image is decoded on first preview (big textures are previewed with their mipmap if available)
+        img_convert_data, img_width, img_height = ea_img.get_preview_image_data(
+            ea_dir, self.canvas_width, self.canvas_height
+        )
+        if not img_convert_data or len(img_convert_data) == 0:
             logger.error(f"Preview failed for {str(item_iid)}, because converted image data is empty!")
             return
 
         try:
             pil_img = Image.frombuffer(
                 "RGBA",
-                (int(ea_dir.h_width), int(ea_dir.h_height)),
-                ea_dir.img_convert_data,
+                (int(img_width), int(img_height)),
+                img_convert_data,
                 "raw",
                 "RGBA",
                 0,
@@ -86,7 +90,7 @@ class GuiEntryPreview(tk.Frame):
         self.preview_instance.place(x=5, y=5, width=285, height=130)
 
     def init_binary_preview_logic(self, bin_attachment):
-        preview_hex_string = bin_attachment.raw_data.decode("utf8", "backslashreplace").replace("\000", ".")[
+        preview_hex_string = bytes(bin_attachment.raw_data).decode("utf8", "backslashreplace").replace("\000", ".")[
             0:200
         ]  # limit preview to 200 characters
         self.preview_instance = tk.Label(
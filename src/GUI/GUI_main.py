@@ -3,7 +3,6 @@ Copyright © 2024-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
-import io
 import os
 import subprocess
 import tkinter as tk
@@ -16,21 +15,28 @@ from typing import Optional
 from PIL import Image, ImageTk
 from reversebox.common.common import get_file_extension, get_file_extension_uppercase
 from reversebox.common.logger import get_logger
-from reversebox.compression.compression_refpack import RefpackHandler
 from reversebox.image.pillow_wrapper import PillowWrapper
 
 from src.EA_Image import ea_image_main
 from src.EA_Image.attachments.palette_entry import PaletteEntry
+from src.EA_Image.batch_import import get_import_mapping_from_directory, import_images
 from src.EA_Image.constants import (
     CONVERT_IMAGES_SUPPORTED_TYPES,
+    DEFAULT_BC_ENCODE_PRESET,
+    DEFAULT_DECODE_CACHE_BYTE_BUDGET,
+    DEFAULT_DISK_CACHE_BYTE_BUDGET,
+    DEFAULT_REFPACK_COMPRESSION_LEVEL,
     IMPORT_IMAGES_SUPPORTED_TYPES,
     NEW_SHAPE_ALLOWED_SIGNATURES,
     OLD_SHAPE_ALLOWED_SIGNATURES,
     PALETTE_TYPES,
 )
-from src.EA_Image.dto import EncodeInfoDTO
-from src.EA_Image.ea_image_encoder import encode_ea_image
+from src.EA_Image.decode_cache import decode_cache
+from src.EA_Image.disk_cache import DiskDecodeCache
+from src.EA_Image.dto import EncodeInfoDTO, EncodeOptionsDTO
+from src.EA_Image.ea_image_encoder import apply_encode_info, encode_ea_image
 from src.EA_Image.ea_image_main import EAImage
+from src.EA_Image.ea_image_writer import save_ea_image
 from src.GUI.about_window import AboutWindow
 from src.GUI.GUI_entry_preview import GuiEntryPreview
 from src.GUI.GUI_menu import GuiMenu
@@ -67,6 +73,12 @@ class EAManGui:
         self.checkmark_path = os.path.join(self.MAIN_DIRECTORY, "data", "img", "checkmark.png")
         self.checkmark_image = None
         self.current_mipmaps_resampling = tk.StringVar(value="nearest")
+        self.current_memory_mapped_loading = tk.BooleanVar(value=False)
+        self.current_allow_data_growth = tk.BooleanVar(value=False)
+        self.current_refpack_compression_level = tk.StringVar(value=DEFAULT_REFPACK_COMPRESSION_LEVEL)
+        self.current_palette_quantizer = tk.StringVar(value="kmeans")
+        self.current_palette_dithering = tk.BooleanVar(value=False)
+        self.current_bc_encode_preset = tk.StringVar(value=DEFAULT_BC_ENCODE_PRESET)
 
         try:
             self.master.iconbitmap(self.icon_path)
@@ -105,11 +117,15 @@ class EAManGui:
         self.loading_label = None
 
         # user config
+        self.disk_cache: Optional[DiskDecodeCache] = None
         self.user_config = ConfigParser()
         self.user_config_file_path: str = os.path.join(self.MAIN_DIRECTORY, "config.ini")
         self.user_config.add_section("config")
         self.user_config.set("config", "save_directory_path", "")
         self.user_config.set("config", "open_directory_path", "")
+        self.user_config.set("config", "decode_cache_size_mb", str(DEFAULT_DECODE_CACHE_BYTE_BUDGET // (1024 * 1024)))
+        self.user_config.set("config", "disk_cache_directory_path", os.path.join(self.MAIN_DIRECTORY, "cache"))
+        self.user_config.set("config", "disk_cache_size_mb", str(DEFAULT_DISK_CACHE_BYTE_BUDGET // (1024 * 1024)))
         if not os.path.exists(self.user_config_file_path):
             with open(self.user_config_file_path, "w") as configfile:
                 self.user_config.write(configfile)
@@ -118,6 +134,12 @@ class EAManGui:
         try:
             self.current_save_directory_path = self.user_config.get("config", "save_directory_path")
             self.current_open_directory_path = self.user_config.get("config", "open_directory_path")
+            decode_cache.set_byte_budget(self.user_config.getint("config", "decode_cache_size_mb") * 1024 * 1024)
+            disk_cache_size_mb: int = self.user_config.getint("config", "disk_cache_size_mb")
+            if disk_cache_size_mb > 0:  # set size to 0 to disable disk cache
+                self.disk_cache = DiskDecodeCache(
+                    self.user_config.get("config", "disk_cache_directory_path"), disk_cache_size_mb * 1024 * 1024
+                )
         except Exception as error:
             logger.error(f"Error while loading user config: {error}")
             self.current_save_directory_path = ""
@@ -127,6 +149,17 @@ class EAManGui:
     #                                             methods                                                #
     ######################################################################################################
 
+    def get_encode_options(self) -> EncodeOptionsDTO:
+        # options are copied from Tk variables, so they can be sent to worker processes
+        return EncodeOptionsDTO(
+            mipmaps_resampling_type_str=self.current_mipmaps_resampling.get(),
+            palette_quantizer=self.current_palette_quantizer.get(),
+            palette_dithering=self.current_palette_dithering.get(),
+            bc_encode_preset=self.current_bc_encode_preset.get(),
+            refpack_compression_level=self.current_refpack_compression_level.get(),
+            allow_data_growth=self.current_allow_data_growth.get(),
+        )
+
     def _execute_old_shape_tab_logic(self):
         self.tab_controller.tab_controller_box.tab(0, state="normal")
         self.tab_controller.tab_controller_box.tab(1, state="disabled")
@@ -214,7 +247,7 @@ class EAManGui:
                 pass
 
             if ea_dir.is_img_convert_supported:
-                self.entry_preview.init_image_preview_logic(ea_dir, item_iid)
+                self.entry_preview.init_image_preview_logic(ea_img, ea_dir, item_iid)
 
             else:
                 self.entry_preview.init_image_preview_not_supported_logic()
@@ -354,6 +387,10 @@ class EAManGui:
             self.tree_rclick_popup.add_command(
                 label="Save File As...", command=lambda: self.treeview_rclick_save_file_as(item_iid)
             )
+            self.tree_rclick_popup.add_command(
+                label="Import Images from Folder...",
+                command=lambda: self.treeview_rclick_import_images_from_directory(item_iid),
+            )
             self.tree_rclick_popup.tk_popup(event.x_root, event.y_root, entry="0")
         elif "direntry" in item_iid and "binattach" not in item_iid:
             self.tree_rclick_popup.add_command(
@@ -394,37 +431,26 @@ class EAManGui:
             self.set_text_in_box(self.tab_controller.new_shape_file_header_info_box.fh_text_header_and_toc_size, "")
             self._execute_new_shape_tab_logic()
 
+        self.opened_ea_images.remove(ea_img)
+        ea_img.close()  # release file data (and file mapping)
         del ea_img  # removing object from memory
 
     def treeview_rclick_save_file_as(self, item_iid):
         ea_img: EAImage = self.tree_view.tree_man.get_object(item_iid, self.opened_ea_images)
-        ea_img_memory_file = io.BytesIO(ea_img.total_f_data)
-
-        # replace image with import data
-        for ea_dir in ea_img.dir_entry_list:
-            if ea_dir.entry_import_flag:
-                ea_img_memory_file.seek(ea_dir.raw_data_offset)
-                ea_img_memory_file.write(ea_dir.raw_data)
-
-                for bin_attach in ea_dir.bin_attachments_list:
-                    if bin_attach.import_flag:
-                        ea_img_memory_file.seek(bin_attach.raw_data_offset)
-                        ea_img_memory_file.write(bin_attach.raw_data)
-
         out_file_extension: str = get_file_extension(ea_img.f_path)
 
         logger.info(f"Opening save file dialog for file {ea_img.f_name}...")
-        out_file = None
+        out_file_path: str = ""
         try:
-            out_file = filedialog.asksaveasfile(
-                mode="wb",
+            # only file path is needed, output file is written by the patching writer
+            out_file_path = filedialog.asksaveasfilename(
                 defaultextension=out_file_extension,
                 initialdir=self.current_save_directory_path,
                 initialfile=ea_img.f_name,
                 filetypes=(("EA Image File", f"*{out_file_extension}"),),
             )
             try:
-                selected_directory = os.path.dirname(out_file.name)
+                selected_directory = os.path.dirname(out_file_path)
             except Exception:
                 selected_directory = ""
             self.current_save_directory_path = selected_directory  # set directory path from history
@@ -436,21 +462,27 @@ class EAManGui:
         except Exception as error:
             logger.error(f"Error: {error}")
             messagebox.showwarning("Warning", "Failed to save file!")
-        if out_file is None:
+        if not out_file_path:
             return False  # user closed file dialog on purpose
 
-        # Saving data
-        ea_img_memory_file.seek(0)
-        out_data: Optional[bytes] = ea_img_memory_file.read()
-        if not out_data:
+        # Saving data (only imported ranges are written, file is rebuilt if imported data is bigger)
+        if not ea_img.total_f_data:
             logger.error("Empty data to export!")
             messagebox.showwarning("Warning", "Empty data! Export not possible!")
             return False
 
-        out_file.write(out_data)
-        out_file.close()
+        try:
+            save_ea_image(
+                ea_img, out_file_path, self.current_refpack_compression_level.get(), max_workers=os.cpu_count() or 1
+            )
+        except Exception as error:
+            logger.error(f"Failed to save file! Error: {error}")
+            logger.error(traceback.format_exc())
+            messagebox.showwarning("Warning", "Failed to save file!")
+            return False
+
         messagebox.showinfo("Info", "File saved successfully!")
-        logger.info(f"EA Image has been exported successfully to {out_file.name}")
+        logger.info(f"EA Image has been exported successfully to {out_file_path}")
         return True
 
     def treeview_rclick_open_in_explorer(self, item_iid):
@@ -499,7 +531,7 @@ class EAManGui:
         file_extension: str = get_file_extension_uppercase(out_file.name)
         pillow_wrapper = PillowWrapper()
         out_data = pillow_wrapper.get_pil_image_file_data_for_export(
-            ea_dir.img_convert_data, ea_dir.h_width, ea_dir.h_height, pillow_format=file_extension
+            ea_img.get_img_convert_data(ea_dir), ea_dir.h_width, ea_dir.h_height, pillow_format=file_extension
         )
         del pillow_wrapper
         if not out_data:
@@ -547,37 +579,27 @@ class EAManGui:
 
         # import logic (raw data replace)
         rgba_data: bytes = PillowWrapper().get_pil_rgba_data_for_import(in_file_path)
-        encode_info_dto: EncodeInfoDTO = encode_ea_image(rgba_data, ea_dir, ea_img, self)
+        encode_options: EncodeOptionsDTO = self.get_encode_options()
+        encode_info_dto: EncodeInfoDTO = encode_ea_image(rgba_data, ea_dir, ea_img, encode_options)
 
-        if len(encode_info_dto.encoded_img_data) != len(ea_dir.raw_data):
-            message: str = (f"Image data for import doesn't match. Can't import image! "
-                            f"New data size: {len(encode_info_dto.encoded_img_data)}, "
-                            f"Old data size: {len(ea_dir.raw_data)}")
-            messagebox.showwarning("Warning", message)
-            logger.error(message)
+        try:
+            apply_encode_info(ea_dir, ea_img, encode_info_dto, encode_options.allow_data_growth)
+        except Exception as error:
+            messagebox.showwarning("Warning", str(error))
+            logger.error(str(error))
             return False
 
-        ea_dir.raw_data = encode_info_dto.encoded_img_data
-        ea_dir.entry_import_flag = True
-
-        # replace palette data
-        if encode_info_dto.is_palette_imported_flag:
-            for bin_attach_entry in ea_dir.bin_attachments_list:
-                if bin_attach_entry.h_record_id == encode_info_dto.palette_entry_id:
-                    bin_attach_entry.raw_data = encode_info_dto.encoded_palette_data
-                    bin_attach_entry.import_flag = True
-
         # preview update logic start
-        if len(ea_dir.img_convert_data) != len(rgba_data):
-            message: str = f"Wrong size of image preview data! Convert_data_size: {len(ea_dir.img_convert_data)}, Rgba_data_size: {len(rgba_data)}"
+        img_convert_data_size: int = ea_dir.h_width * ea_dir.h_height * 4
+        if img_convert_data_size != len(rgba_data):
+            message: str = f"Wrong size of image preview data! Convert_data_size: {img_convert_data_size}, Rgba_data_size: {len(rgba_data)}"
             # messagebox.showwarning("Warning", message)
             logger.error(message)
             # return False  # TODO - uncomment this after adding support for mipmaps?
 
         # preview update
         logger.info("Preview update for imported image")
-        ea_img.convert_image_data_for_export_and_preview(ea_dir, ea_dir.h_record_id, self)
-        self.entry_preview.init_image_preview_logic(ea_dir, item_iid)  # refresh preview for imported image
+        self.entry_preview.init_image_preview_logic(ea_img, ea_dir, item_iid)  # refresh preview for imported image
 
         # update tree view entry
         checkmark_image = Image.open(self.checkmark_path).resize((15, 15))
@@ -588,6 +610,54 @@ class EAManGui:
         logger.info("Image has been imported successfully")
         return True
 
+    def treeview_rclick_import_images_from_directory(self, item_iid) -> bool:
+        ea_img: EAImage = self.tree_view.tree_man.get_object(item_iid, self.opened_ea_images)
+
+        directory_path: str = filedialog.askdirectory(initialdir=self.current_open_directory_path)
+        if not directory_path:
+            return False  # user closed directory dialog on purpose
+
+        try:
+            import_mapping: list = get_import_mapping_from_directory(ea_img, directory_path)
+        except Exception as error:
+            logger.error(f"Failed to read directory! Error: {error}")
+            messagebox.showwarning("Warning", "Failed to read directory!")
+            return False
+        if not import_mapping:
+            messagebox.showwarning("Warning", "No images matching entries of this file have been found!")
+            return False
+
+        self.loading_label = tk.Label(self.main_frame, text="Importing... Please wait.", font=("Arial", 14))
+        self.loading_label.place(x=0, y=0, relwidth=1, relheight=1)
+        self.loading_label.update()
+        try:
+            import_results: list = import_images(
+                ea_img,
+                import_mapping,
+                self.get_encode_options(),
+                max_workers=os.cpu_count() or 1,
+            )
+        finally:
+            self.loading_label.destroy()
+
+        # update tree view entries
+        checkmark_image = Image.open(self.checkmark_path).resize((15, 15))
+        self.checkmark_image = ImageTk.PhotoImage(checkmark_image)
+        for import_result in import_results:
+            if import_result.is_imported:
+                self.tree_view.treeview_widget.tag_configure(import_result.entry_id, font=("Segoe UI", 9, "bold"))
+                self.tree_view.treeview_widget.tag_configure(import_result.entry_id, image=self.checkmark_image)
+
+        failed_results: list = [import_result for import_result in import_results if not import_result.is_imported]
+        message: str = f"Imported images: {len(import_results) - len(failed_results)}, failed: {len(failed_results)}"
+        for import_result in failed_results[:10]:
+            message += f"\n{import_result.tag}: {import_result.error_message}"
+        if failed_results:
+            messagebox.showwarning("Warning", message)
+        else:
+            messagebox.showinfo("Info", message)
+        return not failed_results
+
     def treeview_rclick_export_raw(self, item_iid):
         ea_img = self.tree_view.tree_man.get_object(item_iid.split("_")[0], self.opened_ea_images)
 
@@ -663,41 +733,24 @@ class EAManGui:
             messagebox.showwarning("Warning", "Failed to open file!")
             return
 
+        in_file.close()
+        logger.info(f"Loading file {in_file_name}...")
+
         ea_img: EAImage = ea_image_main.EAImage()
-        sign: bytes = in_file.read(2)
-        if sign == b"\x10\xFB":
-            in_file.seek(0)
-            in_file_data: bytes = in_file.read()
-            in_file = io.BytesIO(
-                RefpackHandler().decompress_data(in_file_data)
-            )  # convert on-disk file to memory file with decompressed data
-            ea_img.is_total_f_data_compressed = True
-        in_file.seek(0)
-        check_result = ea_img.check_file_signature_and_size(in_file)
-
-        # save data for later export
-        ea_img.total_f_data = in_file.read()
-        in_file.seek(0)
+        self.ea_image_id += 1
+        ea_img.set_ea_image_id(self.ea_image_id)
+        ea_img.disk_cache = self.disk_cache
+        check_result = ea_img.load_file(in_file_path, memory_mapped=self.current_memory_mapped_loading.get())
 
         if check_result[0] != "OK":
+            ea_img.close()
             error_msg = "ERROR: " + str(check_result[0]) + "\n" + str(check_result[1]) + "\n\n" + "File not supported!"
             messagebox.showwarning("Warning", error_msg)
             return
 
-        logger.info(f"Loading file {in_file_name}...")
-
-        self.ea_image_id += 1
         self.opened_ea_images_count += 1
-        ea_img.set_ea_image_id(self.ea_image_id)
         self.opened_ea_images.append(ea_img)
 
-        ea_img.parse_header(in_file, in_file_path, in_file_name)
-        ea_img.parse_directory(in_file)
-
-        # check if there are any bin attachments
-        # and add them to the list if found
-        ea_img.parse_bin_attachments(in_file)
-
         # convert all supported images
         # in the ea_img file
         try:
@@ -706,7 +759,7 @@ class EAManGui:
             if ea_img.total_f_size > 200000:
                 self.loading_label.place(x=0, y=0, relwidth=1, relheight=1)
                 self.loading_label.update()
-            ea_img.convert_images(self)
+            ea_img.convert_images(self, lazy=True)  # images are decoded on first preview/export
             self.loading_label.destroy()
         except Exception as error:
             logger.error(f"Error while converting images! Error: {error}")
@@ -770,7 +823,6 @@ class EAManGui:
                 self._execute_new_shape_tab_logic()
 
         self.tree_view.tree_man.add_object(ea_img)
-        in_file.close()
 
     def show_about_window(self):
         if not any(isinstance(x, tk.Toplevel) for x in self.master.winfo_children()):
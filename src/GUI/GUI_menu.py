@@ -41,6 +41,41 @@ class GuiMenu(tk.Frame):
             label="Lanczos", variable=gui_main.current_mipmaps_resampling, value="lanczos"
         )
 
+        self.palettequantizermenu = tk.Menu(self.optionsmenu, tearoff=0)
+        self.optionsmenu.add_cascade(label="Palette Quantizer", menu=self.palettequantizermenu)
+        self.palettequantizermenu.add_radiobutton(
+            label="K-means", variable=gui_main.current_palette_quantizer, value="kmeans"
+        )
+        self.palettequantizermenu.add_radiobutton(
+            label="Median Cut (Fast)", variable=gui_main.current_palette_quantizer, value="median_cut"
+        )
+        self.palettequantizermenu.add_checkbutton(label="Dithering", variable=gui_main.current_palette_dithering)
+
+        self.dxtqualitymenu = tk.Menu(self.optionsmenu, tearoff=0)
+        self.optionsmenu.add_cascade(label="DXT Compression Quality", menu=self.dxtqualitymenu)
+        self.dxtqualitymenu.add_radiobutton(label="Fast", variable=gui_main.current_bc_encode_preset, value="fast")
+        self.dxtqualitymenu.add_radiobutton(label="Normal", variable=gui_main.current_bc_encode_preset, value="normal")
+        self.dxtqualitymenu.add_radiobutton(label="Best", variable=gui_main.current_bc_encode_preset, value="best")
+
+        self.refpackcompressionmenu = tk.Menu(self.optionsmenu, tearoff=0)
+        self.optionsmenu.add_cascade(label="Refpack Compression", menu=self.refpackcompressionmenu)
+        self.refpackcompressionmenu.add_radiobutton(
+            label="Fast", variable=gui_main.current_refpack_compression_level, value="fast"
+        )
+        self.refpackcompressionmenu.add_radiobutton(
+            label="Normal", variable=gui_main.current_refpack_compression_level, value="normal"
+        )
+        self.refpackcompressionmenu.add_radiobutton(
+            label="Best (Slow)", variable=gui_main.current_refpack_compression_level, value="best"
+        )
+
+        self.optionsmenu.add_checkbutton(
+            label="Memory-mapped File Loading", variable=gui_main.current_memory_mapped_loading
+        )
+        self.optionsmenu.add_checkbutton(
+            label="Allow Bigger Imported Data (Rebuild File)", variable=gui_main.current_allow_data_growth
+        )
+
         # help submenu
         self.helpmenu = tk.Menu(self.menubar, tearoff=0)
         self.helpmenu.add_command(label="About...", command=lambda: gui_main.show_about_window())
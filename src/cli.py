@@ -0,0 +1,214 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from reversebox.common.logger import get_logger
+from reversebox.image.pillow_wrapper import PillowWrapper
+
+from src.EA_Image.common import get_safe_file_name
+from src.EA_Image.disk_cache import DiskDecodeCache, get_disk_decode_cache
+from src.EA_Image.ea_image_main import EAImage
+
+logger = get_logger("cli")
+
+EXPORT_FORMATS: List[str] = ["png", "dds", "bmp"]
+
+
+def expand_input_paths(input_patterns: List[str]) -> List[str]:
+    """
+    Expands globs (e.g. "data/**/*.fsh") into list of existing files.
+    Order of the input patterns is kept and duplicates are removed.
+    """
+    file_paths: List[str] = []
+    for input_pattern in input_patterns:
+        matched_paths: List[str] = sorted(glob.glob(input_pattern, recursive=True))
+        if not matched_paths and os.path.isfile(input_pattern):
+            matched_paths = [input_pattern]
+        if not matched_paths:
+            logger.warning(f'Warning! No files matched "{input_pattern}"!')
+        for matched_path in matched_paths:
+            if os.path.isfile(matched_path) and matched_path not in file_paths:
+                file_paths.append(matched_path)
+    return file_paths
+
+
+def open_ea_image(
+    in_file_path: str, ea_image_id: int = 1, disk_cache: Optional[DiskDecodeCache] = None
+) -> Optional[EAImage]:
+    ea_img = EAImage()
+    ea_img.set_ea_image_id(ea_image_id)
+    ea_img.disk_cache = disk_cache
+    check_result: tuple = ea_img.load_file(in_file_path)
+    if check_result[0] != "OK":
+        logger.error(f'Error while opening "{in_file_path}": {check_result[1]}')
+        ea_img.close()
+        return None
+    return ea_img
+
+
+def export_file(
+    in_file_path: str, out_directory_path: str, export_format: str, disk_cache_directory_path: Optional[str] = None
+) -> tuple:
+    """
+    Exports all supported images from one EA file.
+    Runs in worker process, so it returns plain tuple (file_path, exported_count, failed_count).
+    """
+    # disk cache is shared by all files exported in this (worker) process
+    disk_cache: Optional[DiskDecodeCache] = (
+        get_disk_decode_cache(disk_cache_directory_path) if disk_cache_directory_path else None
+    )
+    ea_img: Optional[EAImage] = open_ea_image(in_file_path, disk_cache=disk_cache)
+    if not ea_img:
+        return in_file_path, 0, 1
+
+    exported_count: int = 0
+    failed_count: int = 0
+    try:
+        ea_img.convert_images(None, lazy=True)
+        os.makedirs(out_directory_path, exist_ok=True)
+        pillow_wrapper = PillowWrapper()
+        decode_buffer: bytearray = bytearray()  # one buffer is reused for all images of the file
+        for entry_number, ea_dir in enumerate(ea_img.dir_entry_list):
+            if not ea_dir.is_img_convert_supported:
+                continue
+            img_data_size: int = ea_dir.h_width * ea_dir.h_height * 4
+            if len(decode_buffer) < img_data_size:
+                decode_buffer = bytearray(img_data_size)
+            out_data: Optional[bytes] = None
+            if img_data_size and ea_img.decode_image_data_into(ea_dir, decode_buffer) == img_data_size:
+                out_data = pillow_wrapper.get_pil_image_file_data_for_export(
+                    memoryview(decode_buffer)[:img_data_size],
+                    ea_dir.h_width,
+                    ea_dir.h_height,
+                    pillow_format=export_format.upper(),
+                )
+            if not out_data:
+                logger.error(f'Failed to export image "{ea_dir.tag}" from "{in_file_path}"!')
+                failed_count += 1
+                continue
+
+            out_file_name: str = (
+                f"{ea_img.f_name}_{entry_number + 1}_{get_safe_file_name(ea_dir.tag)}.{export_format.lower()}"
+            )
+            with open(os.path.join(out_directory_path, out_file_name), "wb") as out_file:
+                out_file.write(out_data)
+            exported_count += 1
+    except Exception as error:
+        logger.error(f'Error while exporting "{in_file_path}": {error}')
+        failed_count += 1
+    finally:
+        ea_img.close()
+
+    return in_file_path, exported_count, failed_count
+
+
+def run_export(args) -> int:
+    file_paths: List[str] = expand_input_paths(args.inputs)
+    if not file_paths:
+        logger.error("No input files to export!")
+        return 1
+
+    def _get_out_directory_path(in_file_path: str) -> str:
+        if args.output_dir is None:
+            return os.path.dirname(os.path.abspath(in_file_path))
+        return args.output_dir
+
+    total_exported_count: int = 0
+    total_failed_count: int = 0
+    jobs: int = max(1, min(args.jobs, len(file_paths)))
+    executor: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        results = (executor.map if executor else map)(
+            export_file,
+            file_paths,
+            [_get_out_directory_path(file_path) for file_path in file_paths],
+            [args.format] * len(file_paths),
+            [args.cache_dir] * len(file_paths),
+        )
+        for file_path, exported_count, failed_count in results:
+            logger.info(f'Exported {exported_count} image(s) from "{file_path}"')
+            total_exported_count += exported_count
+            total_failed_count += failed_count
+    finally:
+        if executor:
+            executor.shutdown()
+
+    logger.info(
+        f"Export finished. Files: {len(file_paths)}, exported images: {total_exported_count}, "
+        f"failures: {total_failed_count}"
+    )
+    return 0 if total_failed_count == 0 else 2
+
+
+def run_info(args) -> int:
+    file_paths: List[str] = expand_input_paths(args.inputs)
+    if not file_paths:
+        logger.error("No input files to show info for!")
+        return 1
+
+    return_code: int = 0
+    for file_path in file_paths:
+        ea_img = EAImage()
+        check_result: tuple = ea_img.scan_toc(file_path)  # only headers are read
+        if check_result[0] != "OK":
+            logger.error(f'Error while opening "{file_path}": {check_result[1]}')
+            return_code = 2
+            continue
+        print(
+            f"{file_path}: signature={ea_img.sign}, size={ea_img.total_f_size}, entries={ea_img.num_of_entries}, "
+            f"version={ea_img.format_version}, compressed={ea_img.is_total_f_data_compressed}"
+        )
+        for entry_number, toc_entry in enumerate(ea_img.toc_entry_list):
+            print(
+                f"  {entry_number + 1}. tag={toc_entry.tag}, type={toc_entry.record_id}, "
+                f"offset={toc_entry.entry_offset}, entry_size={toc_entry.entry_size}, "
+                f"size={toc_entry.img_width}x{toc_entry.img_height}, mipmaps={toc_entry.mipmaps_count}, "
+                f"compressed={toc_entry.is_compressed}"
+            )
+    return return_code
+
+
+def get_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="ea-gfx", description="Command line interface of EA Graphics Manager (no GUI required)"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="export all images from EA files")
+    export_parser.add_argument("inputs", nargs="+", help="input files or glob patterns (e.g. data/**/*.fsh)")
+    export_parser.add_argument(
+        "-o", "--output-dir", default=None, help="output directory (default: directory of each input file)"
+    )
+    export_parser.add_argument("-f", "--format", choices=EXPORT_FORMATS, default="png", help="output image format")
+    export_parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1, help="number of files processed in parallel"
+    )
+    export_parser.add_argument(
+        "--cache-dir", default=None, help="directory of persistent decode cache (makes repeated exports faster)"
+    )
+    export_parser.set_defaults(func=run_export)
+
+    info_parser = subparsers.add_parser("info", help="show header and entries of EA files")
+    info_parser.add_argument("inputs", nargs="+", help="input files or glob patterns")
+    info_parser.set_defaults(func=run_info)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = get_argument_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()  # needed for worker processes in frozen executable
+    sys.exit(main())
@@ -5,6 +5,7 @@ License: GPL-3.0 License
 
 # Program tested on Python 3.11.6
 
+import multiprocessing
 import os
 import sys
 import tkinter as tk
@@ -50,4 +51,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # needed for worker processes in frozen executable
     main()
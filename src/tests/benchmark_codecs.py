@@ -0,0 +1,296 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import PIL.Image
+from reversebox.common.logger import get_logger
+from reversebox.image.decoders.gst_decoder_encoder import GSTImageDecoderEncoder
+
+from src.EA_Image.codec_registry import DECODE_GST, get_codec_info
+from src.EA_Image.common import (
+    get_bpp_for_image_type,
+    get_indexed_image_format,
+    get_indexed_palette_format,
+)
+from src.EA_Image.common_ea_dir import handle_image_swizzle_logic, is_image_compressed
+from src.EA_Image.constants import (
+    CONVERT_IMAGES_SUPPORTED_TYPES,
+    IMPORT_IMAGES_SUPPORTED_TYPES,
+    NEW_SHAPE_ALLOWED_SIGNATURES,
+    OLD_SHAPE_ALLOWED_SIGNATURES,
+)
+from src.EA_Image.dto import PaletteInfoDTO
+from src.EA_Image.ea_image_decoder import decode_image_data_by_entry_type
+from src.EA_Image.ea_image_encoder import encode_image_data_by_entry_type
+from src.EA_Image.psp_padding import is_psp_padding_used, remove_psp_padding
+from src.EA_Image.refpack_decoder import decompress_refpack_data
+from src.EA_Image.refpack_encoder import compress_refpack_data
+
+# Benchmark of decode/encode round trip for all supported entry types.
+# Usage: python -m src.tests.benchmark_codecs -o results.json [--baseline old_results.json]
+
+logger = get_logger("benchmark")
+
+BENCHMARK_SIZES: List[int] = [64, 256]
+BENCHMARK_PALETTE_ENTRY_ID = 33  # RGBA8888 palette is used for all indexed types
+BENCHMARK_STAGES: Tuple[str, ...] = (
+    "decompress",
+    "unswizzle",
+    "remove_padding",
+    "decode",
+    "encode",
+    "reswizzle",
+    "compress",
+)
+GST_SWIZZLE_MIN_SIZE = 32  # swizzled GST detail data is stored in 32x32 tiles
+
+
+def get_benchmark_entry_types() -> List[int]:
+    return sorted(set(CONVERT_IMAGES_SUPPORTED_TYPES) | set(IMPORT_IMAGES_SUPPORTED_TYPES))
+
+
+def get_benchmark_signatures() -> List[str]:
+    return list(dict.fromkeys(OLD_SHAPE_ALLOWED_SIGNATURES + NEW_SHAPE_ALLOWED_SIGNATURES))
+
+
+def get_synthetic_gst_image_data(entry_type: int, img_width: int, img_height: int) -> bytes:
+    # GST data is base (one value per block) and detail (added to base value), detail starts at 16 bytes boundary
+    codec_info = get_codec_info(entry_type)
+    block_width, block_height, detail_bpp = GSTImageDecoderEncoder().get_gst_params(codec_info.image_format)
+    base_size: int = (img_width // block_width) * (img_height // block_height)
+    detail_offset: int = (base_size + 15) & ~15
+    detail_size: int = img_width * img_height * detail_bpp // 8
+    random_generator = np.random.default_rng(entry_type * 65536 + img_width)
+    max_base_value: int = 256 - (1 << detail_bpp) + 1  # base + detail can't be bigger than palette index
+    base_data: bytes = random_generator.integers(0, max_base_value, size=base_size, dtype=np.uint8).tobytes()
+    detail_data: bytes = random_generator.integers(0, 256, size=detail_size, dtype=np.uint8).tobytes()
+    return base_data + bytes(detail_offset - base_size) + detail_data
+
+
+def get_synthetic_image_data(entry_type: int, img_width: int, img_height: int) -> bytes:
+    # short random runs, so data is not uniform, but can still be compressed
+    codec_info = get_codec_info(entry_type)
+    if codec_info and codec_info.decode_kind == DECODE_GST:
+        return get_synthetic_gst_image_data(entry_type, img_width, img_height)
+    data_size: int = img_width * img_height * get_bpp_for_image_type(entry_type) // 8
+    data_size += codec_info.inline_palette_size if codec_info else 0
+    random_generator = np.random.default_rng(entry_type * 65536 + img_width)
+    random_values: np.ndarray = random_generator.integers(0, 256, size=data_size // 4 + 1, dtype=np.uint8)
+    return np.repeat(random_values, 4)[:data_size].tobytes()
+
+
+def _time_stage(stage_function: Callable, repeat: int) -> tuple:
+    # best time of all runs is used, it is the least affected by other processes
+    best_time: float = float("inf")
+    result = None
+    for _ in range(repeat):
+        start_time: float = time.perf_counter()
+        result = stage_function()
+        best_time = min(best_time, time.perf_counter() - start_time)
+    return best_time, result
+
+
+def run_benchmark_case(entry_type: int, ea_img_signature: str, img_size: int, repeat: int) -> dict:
+    """
+    Times all stages of decode/encode round trip for one synthetic entry (the same stages as in
+    decode_ea_image_job and encode_ea_image_job). Stages which are not used for given type
+    or signature (e.g. decompress for not compressed types) are not in results.
+    """
+    stage_times: Dict[str, float] = {}
+    benchmark_result: dict = {
+        "entry_type": entry_type,
+        "signature": ea_img_signature,
+        "width": img_size,
+        "height": img_size,
+        "stages": stage_times,
+        "error": None,
+    }
+    palette_info_dto = PaletteInfoDTO(
+        entry_id=BENCHMARK_PALETTE_ENTRY_ID, data=bytes(range(256)) * 4, swizzle_flag=False
+    )
+    is_compressed: bool = is_image_compressed(entry_type)
+    entry_type = entry_type & 0x7F
+    codec_info = get_codec_info(entry_type)
+    is_swizzled: bool = not (codec_info and codec_info.decode_kind == DECODE_GST and img_size < GST_SWIZZLE_MIN_SIZE)
+    try:
+        image_data: bytes = get_synthetic_image_data(entry_type, img_size, img_size)
+        if is_compressed:
+            compressed_data: bytes = compress_refpack_data(image_data, "fast")
+            stage_times["decompress"], image_data = _time_stage(
+                lambda: bytes(decompress_refpack_data(compressed_data)), repeat
+            )
+
+        stage_times["unswizzle"], image_data = _time_stage(
+            lambda: handle_image_swizzle_logic(image_data, entry_type, img_size, img_size, ea_img_signature, False),
+            repeat,
+        )
+        if is_psp_padding_used(ea_img_signature, entry_type):
+            bpp: int = get_bpp_for_image_type(entry_type)
+            stage_times["remove_padding"], image_data = _time_stage(
+                lambda: remove_psp_padding(image_data, img_size, img_size, bpp), repeat
+            )
+        stage_times["decode"], rgba8888_data = _time_stage(
+            lambda: decode_image_data_by_entry_type(
+                entry_type, image_data, palette_info_dto, img_size, img_size, is_swizzled
+            ),
+            repeat,
+        )
+        if not rgba8888_data:
+            raise Exception("Decoded image data is empty!")
+
+        if benchmark_result["entry_type"] in IMPORT_IMAGES_SUPPORTED_TYPES:
+            stage_times["encode"], partial_encode_info = _time_stage(
+                lambda: encode_image_data_by_entry_type(
+                    entry_type,
+                    rgba8888_data,
+                    img_size,
+                    img_size,
+                    get_indexed_image_format(get_bpp_for_image_type(entry_type)),
+                    get_indexed_palette_format(BENCHMARK_PALETTE_ENTRY_ID, len(palette_info_dto.data)),
+                    0,
+                    PIL.Image.Resampling.NEAREST,
+                    palette_info_dto,
+                ),
+                repeat,
+            )
+            encoded_image_data: bytes = partial_encode_info.encoded_image_data
+            stage_times["reswizzle"], encoded_image_data = _time_stage(
+                lambda: handle_image_swizzle_logic(
+                    encoded_image_data, entry_type, img_size, img_size, ea_img_signature, True
+                ),
+                repeat,
+            )
+            if is_compressed:
+                stage_times["compress"], _ = _time_stage(lambda: compress_refpack_data(encoded_image_data), repeat)
+    except Exception as error:
+        benchmark_result["error"] = str(error)
+    return benchmark_result
+
+
+def run_benchmark(entry_types: List[int], signatures: List[str], img_sizes: List[int], repeat: int) -> List[dict]:
+    benchmark_results: List[dict] = []
+    for entry_type in entry_types:
+        for img_size in img_sizes:
+            for ea_img_signature in signatures:
+                benchmark_result: dict = run_benchmark_case(entry_type, ea_img_signature, img_size, repeat)
+                if benchmark_result["error"]:
+                    logger.warning(
+                        f"Type {entry_type}, {ea_img_signature}, {img_size}x{img_size}: {benchmark_result['error']}"
+                    )
+                benchmark_results.append(benchmark_result)
+    return benchmark_results
+
+
+def _get_result_key(benchmark_result: dict) -> tuple:
+    return (
+        benchmark_result["entry_type"],
+        benchmark_result["signature"],
+        benchmark_result["width"],
+        benchmark_result["height"],
+    )
+
+
+def compare_benchmark_results(
+    benchmark_results: List[dict], baseline_results: List[dict], threshold: float
+) -> Tuple[Dict[str, tuple], List[tuple]]:
+    """
+    Compares results with baseline run.
+    Returns total times of each stage (baseline, current) for cases measured in both runs
+    and list of (entry_type, signature, width, height, stage, baseline_time, current_time) for stages
+    which are slower than baseline more than "threshold" times.
+    """
+    baseline_times: Dict[tuple, dict] = {
+        _get_result_key(baseline_result): baseline_result["stages"] for baseline_result in baseline_results
+    }
+    stage_totals: Dict[str, tuple] = {}
+    regressions: List[tuple] = []
+    for benchmark_result in benchmark_results:
+        result_key: tuple = _get_result_key(benchmark_result)
+        baseline_stages: Optional[dict] = baseline_times.get(result_key)
+        if not baseline_stages:
+            continue
+        for stage_name, current_time in benchmark_result["stages"].items():
+            baseline_time: Optional[float] = baseline_stages.get(stage_name)
+            if baseline_time is None:
+                continue
+            total_baseline_time, total_current_time = stage_totals.get(stage_name, (0.0, 0.0))
+            stage_totals[stage_name] = (total_baseline_time + baseline_time, total_current_time + current_time)
+            if current_time > baseline_time * threshold:
+                regressions.append(result_key + (stage_name, baseline_time, current_time))
+    return stage_totals, regressions
+
+
+def get_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="benchmark_codecs", description="Benchmark of decode/encode round trip for all supported entry types"
+    )
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="output JSON file")
+    parser.add_argument("--baseline", default=None, help="JSON file of previous run to compare with")
+    parser.add_argument("--types", type=int, nargs="+", default=None, help="entry types (default: all supported)")
+    parser.add_argument("--signatures", nargs="+", default=None, help="signatures (default: all supported)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=BENCHMARK_SIZES, help="image sizes (square)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs of each stage (best time is used)")
+    parser.add_argument(
+        "--threshold", type=float, default=1.2, help="stage is reported as slower if time ratio is above this value"
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = get_argument_parser().parse_args(argv)
+    benchmark_results: List[dict] = run_benchmark(
+        args.types or get_benchmark_entry_types(),
+        args.signatures or get_benchmark_signatures(),
+        args.sizes,
+        max(1, args.repeat),
+    )
+    with open(args.output, "wt", encoding="utf-8") as output_file:
+        json.dump(
+            {
+                "metadata": {
+                    "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "platform": platform.platform(),
+                    "repeat": args.repeat,
+                },
+                "results": benchmark_results,
+            },
+            output_file,
+            indent=2,
+        )
+    failed_count: int = sum(1 for benchmark_result in benchmark_results if benchmark_result["error"])
+    print(f"Benchmark finished. Cases: {len(benchmark_results)}, failed: {failed_count}, saved to {args.output}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, "rt", encoding="utf-8") as baseline_file:
+        baseline_results: List[dict] = json.load(baseline_file)["results"]
+    stage_totals, regressions = compare_benchmark_results(benchmark_results, baseline_results, args.threshold)
+    for stage_name in BENCHMARK_STAGES:
+        if stage_name in stage_totals:
+            total_baseline_time, total_current_time = stage_totals[stage_name]
+            print(
+                f"  {stage_name}: baseline {total_baseline_time:.4f}s, current {total_current_time:.4f}s "
+                f"({total_current_time / max(total_baseline_time, 1e-9):.2f}x)"
+            )
+    for entry_type, signature, img_width, img_height, stage_name, baseline_time, current_time in regressions:
+        print(
+            f"  SLOWER: type {entry_type}, {signature}, {img_width}x{img_height}, {stage_name}: "
+            f"{baseline_time:.5f}s -> {current_time:.5f}s"
+        )
+    return 2 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
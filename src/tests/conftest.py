@@ -0,0 +1,134 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import struct
+from typing import Callable
+
+import pytest
+
+from src.EA_Image.ea_image_main import EAImage
+
+
+def build_old_shape_file() -> bytes:
+    # "SHPI" file with one RGBA8888 image and one PAL8 image with palette attachment
+    rgba_data: bytes = bytes(range(256))
+    pal8_data: bytes = bytes(range(64))
+    palette_data: bytes = bytes(255 - (i % 256) for i in range(1024))
+
+    file_data = bytearray(b"SHPI" + struct.pack("<LL", 0, 2) + b"G354")
+    file_data += b"\x00" * 16  # directory
+    file_data += b"Buy ERTS"
+
+    entry_offsets: list = []
+    entry_offsets.append(len(file_data))
+    file_data += struct.pack("<I", (16 + len(rgba_data)) << 8 | 5) + struct.pack("<HHhhHH", 8, 8, 0, 0, 0, 0)
+    file_data += rgba_data
+    entry_offsets.append(len(file_data))
+    file_data += struct.pack("<I", (16 + len(pal8_data)) << 8 | 2) + struct.pack("<HHhhHH", 8, 8, 0, 0, 0, 0)
+    file_data += pal8_data
+    file_data += struct.pack("<I", 33) + struct.pack("<HHHHHH", 256, 1, 0, 0, 0, 0)
+    file_data += palette_data
+
+    struct.pack_into("<4sL4sL", file_data, 16, b"img0", entry_offsets[0], b"img1", entry_offsets[1])
+    struct.pack_into("<L", file_data, 4, len(file_data))
+    return bytes(file_data)
+
+
+def build_new_shape_file() -> bytes:
+    # "ShpF" file (big endian TOC, little endian entries) with one RGBA8888 image
+    # and one PAL8 image with palette attachment, entries are aligned to 16 bytes
+    rgba_data: bytes = bytes(range(256))
+    pal8_data: bytes = bytes(range(64))
+    palette_data: bytes = bytes(255 - (i % 256) for i in range(1024))
+    entry_tags: list = [b"img0", b"img1"]
+    header_and_toc_size: int = 16 + sum(8 + len(entry_tag) + 1 for entry_tag in entry_tags)
+
+    file_data = bytearray(b"ShpF" + struct.pack("<L", 0) + struct.pack(">LL", len(entry_tags), header_and_toc_size))
+    file_data += b"\x00" * (header_and_toc_size - 16)  # directory
+    file_data += b"\x00" * (-len(file_data) % 16)
+
+    # 32 bytes headers: record ID and flags, size of the block, data offset, data size, x, y, width, height
+    entry_offsets: list = [len(file_data)]
+    file_data += struct.pack("<8I", 5, 0, 32, len(rgba_data), 0, 0, 8, 8) + rgba_data
+    entry_offsets.append(len(file_data))
+    file_data += struct.pack("<8I", 2, 32 + len(pal8_data), 32, len(pal8_data), 0, 0, 8, 8) + pal8_data
+    file_data += struct.pack("<8I", 33, 0, 32, len(palette_data), 0, 0, 256, 1) + palette_data
+    entry_offsets.append(len(file_data))
+
+    toc_offset: int = 16
+    for i, entry_tag in enumerate(entry_tags):
+        entry_size: int = entry_offsets[i + 1] - entry_offsets[i]
+        struct.pack_into(f">LL{len(entry_tag)}s", file_data, toc_offset, entry_offsets[i], entry_size, entry_tag)
+        toc_offset += 8 + len(entry_tag) + 1  # tag is null terminated
+    struct.pack_into("<L", file_data, 4, len(file_data))
+    return bytes(file_data)
+
+
+def build_shared_palette_file(num_of_images: int) -> bytes:
+    # "SHPI" file with many PAL8 images and one palette stored as separate dir entry
+    palette_data: bytes = bytes(i % 256 for i in range(1024))
+    entries: list = [(b"!pal", 33, 256, 1, palette_data)]
+    for i in range(num_of_images):
+        entries.append((b"i%03d" % i, 2, 8, 8, bytes([i % 256]) * 64))
+
+    file_data = bytearray(b"SHPI" + struct.pack("<LL", 0, len(entries)) + b"G354")
+    toc_offset: int = len(file_data)
+    file_data += b"\x00" * 8 * len(entries)
+    for i, (entry_tag, record_id, width, height, raw_data) in enumerate(entries):
+        struct.pack_into("<4sL", file_data, toc_offset + i * 8, entry_tag, len(file_data))
+        file_data += struct.pack("<I", record_id) + struct.pack("<HHhhHH", width, height, 0, 0, 0, 0)
+        file_data += raw_data
+    struct.pack_into("<L", file_data, 4, len(file_data))
+    return bytes(file_data)
+
+
+@pytest.fixture
+def old_shape_file_data() -> bytes:
+    return build_old_shape_file()
+
+
+@pytest.fixture
+def old_shape_file_path(tmp_path, old_shape_file_data):
+    file_path = tmp_path / "test.fsh"
+    file_path.write_bytes(old_shape_file_data)
+    return file_path
+
+
+@pytest.fixture
+def old_shape_ea_image(old_shape_file_path):
+    ea_img = EAImage()
+    assert ea_img.load_file(str(old_shape_file_path))[0] == "OK"
+    yield ea_img
+    ea_img.close()
+
+
+@pytest.fixture
+def new_shape_file_data() -> bytes:
+    return build_new_shape_file()
+
+
+@pytest.fixture
+def new_shape_file_path(tmp_path, new_shape_file_data):
+    file_path = tmp_path / "test_new.fsh"
+    file_path.write_bytes(new_shape_file_data)
+    return file_path
+
+
+@pytest.fixture
+def shared_palette_ea_image_factory(tmp_path) -> Callable:
+    # returns function which loads shared palette file with given number of images
+    ea_images: list = []
+
+    def _load_shared_palette_ea_image(num_of_images: int) -> EAImage:
+        file_path = tmp_path / "shared_palette.fsh"
+        file_path.write_bytes(build_shared_palette_file(num_of_images))
+        ea_img = EAImage()
+        assert ea_img.load_file(str(file_path))[0] == "OK"
+        ea_images.append(ea_img)
+        return ea_img
+
+    yield _load_shared_palette_ea_image
+    for ea_img in ea_images:
+        ea_img.close()
@@ -0,0 +1,75 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import json
+
+from PIL import Image
+
+from src.EA_Image.batch_import import (
+    get_import_mapping_from_directory,
+    get_import_mapping_from_manifest,
+    import_images,
+)
+from src.EA_Image.ea_image_main import EAImage
+
+
+def save_rgba_image(file_path, rgba_data: bytes, img_width: int, img_height: int) -> None:
+    Image.frombytes("RGBA", (img_width, img_height), rgba_data).save(str(file_path))
+
+
+def test_batch_import_from_directory(tmp_path, old_shape_ea_image):
+    images_path = tmp_path / "images"
+    images_path.mkdir()
+    rgba_data: bytes = bytes((i * 7) % 256 for i in range(256))
+    save_rgba_image(images_path / "img0.png", rgba_data, 8, 8)
+    save_rgba_image(images_path / "test.fsh_2_img1.png", bytes(256), 8, 8)  # name of exported file
+    save_rgba_image(images_path / "unknown.png", bytes(256), 8, 8)
+
+    ea_img: EAImage = old_shape_ea_image
+    import_mapping = get_import_mapping_from_directory(ea_img, str(images_path))
+    assert [(ea_dir.tag, image_path.split("/")[-1]) for ea_dir, image_path in import_mapping] == [
+        ("img0", "img0.png"),
+        ("img1", "test.fsh_2_img1.png"),
+    ]
+
+    import_results = import_images(ea_img, import_mapping, max_workers=2)
+    assert [import_result.is_imported for import_result in import_results] == [True, True]
+    assert ea_img.dir_entry_list[0].raw_data == rgba_data
+    assert ea_img.dir_entry_list[0].entry_import_flag
+    assert ea_img.dir_entry_list[1].bin_attachments_list[0].import_flag
+    assert ea_img.get_img_convert_data(ea_img.dir_entry_list[0]) == rgba_data
+
+
+def test_batch_import_reports_failures_without_stopping(tmp_path, old_shape_ea_image):
+    save_rgba_image(tmp_path / "wrong_size.png", bytes(16 * 16 * 4), 16, 16)
+    save_rgba_image(tmp_path / "ok.png", bytes(range(256)), 8, 8)
+    (tmp_path / "manifest.json").write_text(json.dumps({"img0": "wrong_size.png", "img1": "ok.png"}))
+
+    ea_img: EAImage = old_shape_ea_image
+    original_raw_data: bytes = bytes(ea_img.dir_entry_list[0].raw_data)
+    import_mapping = get_import_mapping_from_manifest(ea_img, str(tmp_path / "manifest.json"))
+    import_results = import_images(ea_img, import_mapping)
+
+    assert [import_result.is_imported for import_result in import_results] == [False, True]
+    assert "Wrong image size" in import_results[0].error_message
+    assert ea_img.dir_entry_list[0].raw_data == original_raw_data
+    assert not ea_img.dir_entry_list[0].entry_import_flag
+    assert ea_img.dir_entry_list[1].entry_import_flag
+
+
+def test_batch_import_results_are_in_mapping_order(tmp_path, old_shape_ea_image):
+    save_rgba_image(tmp_path / "img0.png", bytes(range(256)), 8, 8)
+    save_rgba_image(tmp_path / "img1.png", bytes(256), 8, 8)
+
+    ea_img: EAImage = old_shape_ea_image
+    ea_img.dir_entry_list[1].h_record_id = 0x6F  # type not supported for import
+    import_mapping = get_import_mapping_from_directory(ea_img, str(tmp_path))
+    import_results = import_images(ea_img, import_mapping)
+
+    assert [(import_result.entry_id, import_result.is_imported) for import_result in import_results] == [
+        (ea_img.dir_entry_list[0].id, True),
+        (ea_img.dir_entry_list[1].id, False),
+    ]
+    assert "not supported" in import_results[1].error_message
@@ -0,0 +1,83 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import io
+import struct
+
+import numpy as np
+import PIL.Image
+from reversebox.image.image_formats import ImageFormats
+
+from src.EA_Image.bc_encoder import encode_bc_image_level
+from src.EA_Image.dto import EncodeJobDTO, EncodeOptionsDTO, PaletteInfoDTO
+from src.EA_Image.ea_image_encoder import encode_ea_image_job
+
+
+def _decode_with_pillow(image_data: bytes, img_width: int, img_height: int, four_cc: bytes) -> np.ndarray:
+    dds_header: bytes = struct.pack(
+        "<4s7I44s2I4s20s5I",
+        b"DDS ",
+        124,
+        0x81007,
+        img_height,
+        img_width,
+        len(image_data),
+        0,
+        0,
+        b"",
+        32,
+        0x4,
+        four_cc,
+        b"",
+        0x1000,
+        0,
+        0,
+        0,
+        0,
+    )
+    return np.asarray(PIL.Image.open(io.BytesIO(dds_header + image_data)).convert("RGBA"))
+
+
+def test_bc_encoded_data_is_close_to_source_image():
+    y_values, x_values = np.mgrid[0:32, 0:24]
+    gradient_values: np.ndarray = (x_values + y_values) * 4  # colors in each block are on one line
+    pixels: np.ndarray = np.stack(
+        [gradient_values, 255 - gradient_values, gradient_values // 2, np.where(x_values < 12, 255, y_values * 8)],
+        axis=-1,
+    ).astype(np.uint8)
+
+    for image_format, four_cc in (
+        (ImageFormats.BC1_DXT1, b"DXT1"),
+        (ImageFormats.BC2_DXT3, b"DXT3"),
+        (ImageFormats.BC3_DXT5, b"DXT5"),
+    ):
+        for preset in ("fast", "normal", "best"):
+            image_data: bytes = encode_bc_image_level(pixels.tobytes(), 24, 32, image_format, preset, max_workers=2)
+            decoded_pixels: np.ndarray = _decode_with_pillow(image_data, 24, 32, four_cc).astype(int)
+            is_compared: np.ndarray = pixels[..., 3] >= 128 if image_format == ImageFormats.BC1_DXT1 else True
+            assert np.abs(decoded_pixels[..., :3] - pixels[..., :3])[is_compared].mean() < 3
+            if image_format == ImageFormats.BC1_DXT1:
+                assert (decoded_pixels[..., 3] == np.where(pixels[..., 3] < 128, 0, 255)).all()
+            else:
+                assert np.abs(decoded_pixels[..., 3] - pixels[..., 3]).max() <= 17
+
+
+def test_bc_encode_generates_all_mipmaps():
+    rgba8888_data: bytes = bytes(np.random.default_rng(0).integers(0, 256, size=16 * 8 * 4, dtype=np.uint8))
+    encode_job = EncodeJobDTO(
+        entry_type=98,  # DXT5
+        img_width=16,
+        img_height=8,
+        img_bpp=8,
+        mipmaps_count=3,
+        is_swizzled=False,
+        ea_img_signature="SHPI",
+        palette_info_dto=PaletteInfoDTO(entry_id=0, data=b"", swizzle_flag=False),
+        raw_data_size=(8 + 2 + 1 + 1) * 16,
+        encode_options=EncodeOptionsDTO(mipmaps_resampling_type_str="box"),
+    )
+    image_data: bytes = encode_ea_image_job(rgba8888_data, encode_job).encoded_img_data
+    assert len(image_data) == (8 + 2 + 1 + 1) * 16
+    assert image_data[:128] == encode_bc_image_level(rgba8888_data, 16, 8, ImageFormats.BC3_DXT5)
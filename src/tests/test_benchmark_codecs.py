@@ -0,0 +1,49 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import json
+import os
+
+from src.tests.benchmark_codecs import compare_benchmark_results, main
+
+
+def test_benchmark_saves_stage_times(tmp_path):
+    output_file_path: str = os.path.join(tmp_path, "benchmark.json")
+    args: list = ["--types", "2", "8", "130", "--signatures", "SHPI", "SHPM", "--sizes", "16", "--repeat", "1"]
+    assert main(args + ["-o", output_file_path]) == 0
+    with open(output_file_path, "rt", encoding="utf-8") as output_file:
+        benchmark_results: list = json.load(output_file)["results"]
+
+    assert [(result["entry_type"], result["signature"]) for result in benchmark_results] == [
+        (2, "SHPI"),
+        (2, "SHPM"),
+        (8, "SHPI"),
+        (8, "SHPM"),
+        (130, "SHPI"),
+        (130, "SHPM"),
+    ]
+    assert all(result["error"] is None for result in benchmark_results)
+    assert list(benchmark_results[0]["stages"]) == ["unswizzle", "decode", "encode", "reswizzle"]
+    assert "remove_padding" in benchmark_results[1]["stages"]
+    assert list(benchmark_results[2]["stages"]) == ["unswizzle", "decode"]  # GST import is not supported
+    assert {"decompress", "compress"} <= set(benchmark_results[4]["stages"])
+
+    # comparing run with itself doesn't report anything
+    baseline_args: list = ["-o", os.path.join(tmp_path, "current.json"), "--baseline", output_file_path]
+    assert main(args + baseline_args + ["--threshold", "1000"]) == 0
+
+
+def test_compare_benchmark_results():
+    baseline_results: list = [
+        {"entry_type": 2, "signature": "SHPI", "width": 64, "height": 64, "stages": {"decode": 1.0, "encode": 2.0}},
+        {"entry_type": 5, "signature": "SHPI", "width": 64, "height": 64, "stages": {"decode": 1.0}},
+    ]
+    benchmark_results: list = [
+        {"entry_type": 2, "signature": "SHPI", "width": 64, "height": 64, "stages": {"decode": 1.5, "encode": 1.0}},
+        {"entry_type": 8, "signature": "SHPI", "width": 64, "height": 64, "stages": {"decode": 9.0}},
+    ]
+    stage_totals, regressions = compare_benchmark_results(benchmark_results, baseline_results, 1.2)
+    assert stage_totals == {"decode": (1.0, 1.5), "encode": (2.0, 1.0)}
+    assert regressions == [(2, "SHPI", 64, 64, "decode", 1.0, 1.5)]
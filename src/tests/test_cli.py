@@ -0,0 +1,51 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from src.cli import main
+from src.EA_Image import disk_cache
+from src.EA_Image.disk_cache import DiskDecodeCache
+
+
+def test_export_all_images_from_glob(tmp_path, old_shape_file_data):
+    for file_name in ("first.fsh", "second.fsh"):
+        (tmp_path / file_name).write_bytes(old_shape_file_data)
+    out_directory_path = tmp_path / "out"
+
+    return_code: int = main(
+        ["export", str(tmp_path / "*.fsh"), "-o", str(out_directory_path), "-f", "png", "--jobs", "2"]
+    )
+
+    assert return_code == 0
+    assert sorted(path.name for path in out_directory_path.iterdir()) == [
+        "first.fsh_1_img0.png",
+        "first.fsh_2_img1.png",
+        "second.fsh_1_img0.png",
+        "second.fsh_2_img1.png",
+    ]
+
+
+def test_export_scans_disk_cache_once_per_process(tmp_path, old_shape_file_data, monkeypatch):
+    file_data = bytearray(old_shape_file_data)
+    for file_name in ("first.fsh", "second.fsh", "third.fsh"):
+        file_data[56] += 1  # different pixels, so each file is decoded and stored in disk cache
+        (tmp_path / file_name).write_bytes(file_data)
+
+    scan_calls: list = []
+    get_cache_files = DiskDecodeCache._get_cache_files
+
+    def _counting_get_cache_files(self):
+        scan_calls.append(1)
+        return get_cache_files(self)
+
+    monkeypatch.setattr(disk_cache, "disk_decode_caches", {})
+    monkeypatch.setattr(DiskDecodeCache, "_get_cache_files", _counting_get_cache_files)
+    cache_directory_path = tmp_path / "cache"
+    return_code: int = main(
+        ["export", str(tmp_path / "*.fsh"), "-o", str(tmp_path / "out"), "--cache-dir", str(cache_directory_path)]
+    )
+
+    assert return_code == 0
+    assert len(list(cache_directory_path.rglob("*.rgba.z"))) == 4  # one image is the same in all files
+    assert len(scan_calls) == 1  # only when the cache directory is initialized
@@ -0,0 +1,51 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from reversebox.image.image_formats import ImageFormats
+
+from src.EA_Image import codec_registry
+from src.EA_Image.codec_registry import (
+    DECODE_PIXEL,
+    ENCODE_PIXEL,
+    CodecInfo,
+    register_codec,
+)
+from src.EA_Image.common import get_bpp_for_image_type
+from src.EA_Image.constants import (
+    CONVERT_IMAGES_SUPPORTED_TYPES,
+    IMPORT_IMAGES_SUPPORTED_TYPES,
+)
+from src.EA_Image.dto import PaletteInfoDTO
+from src.EA_Image.ea_image_decoder import decode_image_data_by_entry_type
+
+
+def test_supported_types_are_generated_from_registry():
+    assert CONVERT_IMAGES_SUPPORTED_TYPES == [1, 2, 3, 4, 5, 8, 9, 10, 11, 12, 13, 14, 15, 20, 21, 22, 24, 25, 30, 33, 34,
+                                              35, 36, 42, 59, 64, 65, 66, 67, 69, 70, 71, 88, 89, 90, 91, 92, 93, 96, 97,
+                                              98, 100, 101, 104, 109, 115, 119, 120, 121, 122, 123, 125, 126, 127, 130,
+                                              131, 192, 193, 194, 237, 248, 251]  # fmt: skip
+    assert IMPORT_IMAGES_SUPPORTED_TYPES == [1, 2, 3, 4, 5, 21, 22, 24, 25, 30, 64, 65, 66, 88, 89, 90, 91, 92, 93, 96,
+                                             97, 98, 109, 115, 119, 120, 121, 123, 125, 126, 127, 130, 131, 192, 193,
+                                             194, 237, 248, 251, 255]  # fmt: skip
+    assert get_bpp_for_image_type(2) == 8
+    assert get_bpp_for_image_type(0x44) == 1  # type without codec
+
+
+def test_registered_codec_is_used_by_decoder(monkeypatch):
+    # registry and lists are restored after the test
+    monkeypatch.setattr(codec_registry, "codec_registry", dict(codec_registry.codec_registry))
+    original_convert_types: list = list(CONVERT_IMAGES_SUPPORTED_TYPES)
+    original_import_types: list = list(IMPORT_IMAGES_SUPPORTED_TYPES)
+    try:
+        register_codec(CodecInfo(0x2C, 32, DECODE_PIXEL, ImageFormats.ABGR8888, encode_kind=ENCODE_PIXEL))
+        assert 0x2C in CONVERT_IMAGES_SUPPORTED_TYPES
+        assert 0x2C in IMPORT_IMAGES_SUPPORTED_TYPES
+
+        palette_info_dto = PaletteInfoDTO(entry_id=0, data=b"", swizzle_flag=False)
+        decoded_data = decode_image_data_by_entry_type(0x2C, b"\x01\x02\x03\x04", palette_info_dto, 1, 1, False)
+        assert decoded_data == b"\x04\x03\x02\x01"
+    finally:
+        CONVERT_IMAGES_SUPPORTED_TYPES[:] = original_convert_types
+        IMPORT_IMAGES_SUPPORTED_TYPES[:] = original_import_types
@@ -0,0 +1,33 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import io
+
+from src.EA_Image.data_read import (
+    get_new_shape_uint24_flags,
+    get_null_terminated_string,
+    get_struct_layouts,
+    read_struct,
+    split_uint8_uint24,
+    split_uint12_and_flags,
+    split_uint12_uint4,
+)
+from src.EA_Image.memory_file import MemoryFile
+
+
+def test_split_bit_fields():
+    assert split_uint8_uint24(0x00123405, "<") == (0x05, 0x001234)
+    assert split_uint8_uint24(0x05001234, ">") == (0x05, 0x001234)
+    assert split_uint12_and_flags(0xA123) == (0x123, 0, 1, 0, 1)
+    assert split_uint12_uint4(0x7FFF) == (0xFFF, 0x7)
+    assert get_new_shape_uint24_flags(0x304003) == [1, 1, 1, 3]
+
+
+def test_read_struct_and_null_terminated_string():
+    data: bytes = b"\x05\x34\x12\x00\x08\x00tag_name\x00rest"
+    for in_file in (io.BytesIO(data), MemoryFile(data)):
+        assert read_struct(in_file, get_struct_layouts("IH"), "<") == (0x123405, 8)
+        assert get_null_terminated_string(in_file, chunk_size=4) == "tag_name"
+        assert bytes(in_file.read()) == b"rest"
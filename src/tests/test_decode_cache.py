@@ -0,0 +1,30 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from src.EA_Image.decode_cache import DecodeCache
+
+
+def test_decode_cache_evicts_least_recently_used_entries():
+    cache = DecodeCache(byte_budget=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234"  # "a" is now most recently used
+    cache.put("c", b"1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.get("c") == b"1234"
+    assert cache.current_size == 8
+
+
+def test_decode_cache_skips_data_bigger_than_budget():
+    cache = DecodeCache(byte_budget=4)
+    cache.put("a", b"12345")
+    assert cache.get("a") is None
+    assert cache.current_size == 0
+
+    cache.put("b", b"12")
+    cache.set_byte_budget(1)
+    assert cache.get("b") is None
@@ -0,0 +1,70 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import numpy as np
+import pytest
+
+from src.EA_Image import ea_image_main
+from src.EA_Image.disk_cache import DiskDecodeCache
+from src.EA_Image.ea_image_decoder import get_rgba8888_data_from_buffer
+from src.EA_Image.ea_image_main import EAImage
+
+
+def test_decode_into_matches_decoded_data(old_shape_ea_image):
+    ea_img: EAImage = old_shape_ea_image
+    ea_img.convert_images(None, lazy=True)
+
+    for ea_dir in ea_img.dir_entry_list[:2]:  # RGBA8888 image and PAL8 image
+        output_buffer: bytearray = bytearray(1024)
+        output_array: np.ndarray = np.zeros((8, 8, 4), dtype=np.uint8)
+        assert ea_img.decode_image_data_into(ea_dir, output_buffer) == 256
+        assert ea_img.decode_image_data_into(ea_dir, output_array, pixel_order="BGRA") == 256
+
+        expected_data: bytes = ea_img.get_img_convert_data(ea_dir)
+        assert bytes(output_buffer[:256]) == expected_data
+        assert (
+            output_array.tobytes()
+            == np.frombuffer(expected_data, np.uint8).reshape(8, 8, 4)[..., [2, 1, 0, 3]].tobytes()
+        )
+
+        output_array[:] = 0  # cached image is copied into the buffer
+        assert ea_img.decode_image_data_into(ea_dir, output_array, pixel_order="BGRA") == 256
+        assert (
+            output_array.tobytes()
+            == np.frombuffer(expected_data, np.uint8).reshape(8, 8, 4)[..., [2, 1, 0, 3]].tobytes()
+        )
+
+    with pytest.raises(Exception, match="too small"):
+        ea_img.decode_image_data_into(ea_img.dir_entry_list[0], bytearray(100))
+    with pytest.raises(Exception, match="read-only"):
+        ea_img.decode_image_data_into(ea_img.dir_entry_list[0], bytes(256))
+    ea_img.close()
+
+
+def test_decode_into_uses_disk_cache(tmp_path, old_shape_file_path, monkeypatch):
+    cache_directory_path = str(tmp_path / "cache")
+    expected_data: list = []
+    for pixel_order in ("BGRA", "RGBA"):  # first pass fills the cache, second one reads from it
+        ea_img = EAImage()
+        ea_img.disk_cache = DiskDecodeCache(cache_directory_path)
+        ea_img.keep_index_planes = True
+        ea_img.load_file(str(old_shape_file_path))
+        ea_img.convert_images(None, lazy=True)
+
+        def _decode_not_expected(*args):
+            raise AssertionError("Image should be decoded straight into the buffer!")
+
+        monkeypatch.setattr(ea_img, "decode_image_data", _decode_not_expected)
+        if pixel_order == "RGBA":
+            monkeypatch.setattr(ea_image_main, "decode_ea_image_job_into", _decode_not_expected)
+        for i, ea_dir in enumerate(ea_img.dir_entry_list[:2]):
+            output_buffer: bytearray = bytearray(256)
+            assert ea_img.decode_image_data_into(ea_dir, output_buffer, pixel_order=pixel_order) == 256
+            assert ea_dir.index_plane is None
+            rgba_data: bytes = get_rgba8888_data_from_buffer(output_buffer, 256, pixel_order)
+            if pixel_order == "BGRA":
+                expected_data.append(rgba_data)
+            assert rgba_data == expected_data[i]
+        ea_img.close()
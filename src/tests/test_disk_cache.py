@@ -0,0 +1,43 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import os
+import time
+
+from src.EA_Image import ea_image_main
+from src.EA_Image.disk_cache import DiskDecodeCache
+from src.EA_Image.ea_image_main import EAImage
+
+
+def test_disk_cache_lru_eviction_and_version_stamp(tmp_path):
+    disk_cache = DiskDecodeCache(str(tmp_path), byte_budget=2048)
+    for i in range(3):
+        disk_cache.put(f"key{i}", os.urandom(700))  # random data can't be compressed
+        time.sleep(0.01)
+    assert disk_cache.get("key0") is None  # evicted
+    assert len(disk_cache.get("key2")) == 700
+
+    (tmp_path / "version.txt").write_text("0-old-decoders")
+    assert DiskDecodeCache(str(tmp_path)).get("key2") is None  # cache created by other version is cleared
+
+
+def test_disk_cache_is_used_on_reopen(tmp_path, old_shape_file_path, monkeypatch):
+    cache_directory_path = str(tmp_path / "cache")
+
+    ea_img = EAImage()
+    ea_img.disk_cache = DiskDecodeCache(cache_directory_path)
+    ea_img.load_file(str(old_shape_file_path))
+    ea_img.convert_images(None)
+    expected_results: list = [ea_dir.img_convert_data for ea_dir in ea_img.dir_entry_list]
+
+    def _decode_not_expected(decode_job):
+        raise AssertionError("Image should be read from disk cache!")
+
+    monkeypatch.setattr(ea_image_main, "decode_ea_image_job", _decode_not_expected)
+    reopened_img = EAImage()
+    reopened_img.disk_cache = DiskDecodeCache(cache_directory_path)
+    reopened_img.load_file(str(old_shape_file_path))
+    reopened_img.convert_images(None)
+    assert [ea_dir.img_convert_data for ea_dir in reopened_img.dir_entry_list] == expected_results
@@ -0,0 +1,79 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from src.EA_Image.ea_image_main import EAImage
+
+
+def test_memory_mapped_loading_matches_in_memory_loading(old_shape_file_path):
+    results: list = []
+    for memory_mapped in (False, True):
+        ea_img = EAImage()
+        check_result = ea_img.load_file(str(old_shape_file_path), memory_mapped=memory_mapped)
+        assert check_result[0] == "OK"
+        ea_img.convert_images(None)
+        results.append(
+            [
+                (
+                    ea_dir.tag,
+                    ea_dir.h_record_id,
+                    bytes(ea_dir.raw_data),
+                    ea_dir.img_convert_data,
+                    [bytes(bin_attach.raw_data) for bin_attach in ea_dir.bin_attachments_list],
+                )
+                for ea_dir in ea_img.dir_entry_list
+            ]
+        )
+        if memory_mapped:
+            assert isinstance(ea_img.dir_entry_list[0].raw_data, memoryview)
+        ea_img.close()
+
+    assert results[0] == results[1]
+    assert results[0][1][4] == [bytes(255 - (i % 256) for i in range(1024))]
+
+
+def test_lazy_decoding_matches_eager_decoding(old_shape_file_path):
+    eager_img = EAImage()
+    eager_img.load_file(str(old_shape_file_path))
+    eager_img.convert_images(None)
+
+    lazy_img = EAImage()
+    lazy_img.load_file(str(old_shape_file_path))
+    lazy_img.convert_images(None, lazy=True)
+
+    for eager_dir, lazy_dir in zip(eager_img.dir_entry_list, lazy_img.dir_entry_list):
+        assert lazy_dir.is_img_convert_supported
+        assert lazy_dir.img_convert_data is None
+        assert lazy_img.get_img_convert_data(lazy_dir) == eager_dir.img_convert_data
+
+
+def test_parallel_decoding_matches_serial_decoding(old_shape_file_path):
+    serial_img = EAImage()
+    serial_img.load_file(str(old_shape_file_path))
+    serial_img.convert_images(None)
+
+    parallel_img = EAImage()
+    parallel_img.load_file(str(old_shape_file_path))
+    parallel_img.convert_images(None, max_workers=2)
+
+    assert [ea_dir.img_convert_data for ea_dir in parallel_img.dir_entry_list] == [
+        ea_dir.img_convert_data for ea_dir in serial_img.dir_entry_list
+    ]
+    assert all(ea_dir.img_convert_data for ea_dir in parallel_img.dir_entry_list)
+
+
+def test_toc_scan_matches_full_parsing(old_shape_file_path, old_shape_ea_image):
+    ea_img: EAImage = old_shape_ea_image
+    scanned_img = EAImage()
+    assert scanned_img.scan_toc(str(old_shape_file_path))[0] == "OK"
+    assert scanned_img.dir_entry_list == []
+
+    assert [
+        (toc_entry.tag, toc_entry.entry_offset, toc_entry.record_id, toc_entry.img_width, toc_entry.img_height)
+        for toc_entry in scanned_img.toc_entry_list
+    ] == [
+        (ea_dir.tag, ea_dir.start_offset, ea_dir.h_record_id, ea_dir.h_width, ea_dir.h_height)
+        for ea_dir in ea_img.dir_entry_list
+    ]
+    assert scanned_img.toc_entry_list[1].entry_size == ea_img.total_f_size - ea_img.dir_entry_list[1].start_offset
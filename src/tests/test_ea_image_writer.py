@@ -0,0 +1,151 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import os
+import struct
+
+import pytest
+
+from src.EA_Image.ea_image_main import EAImage
+from src.EA_Image.ea_image_writer import (
+    get_dirty_ranges,
+    is_rebuild_needed,
+    save_ea_image,
+    save_ea_image_patched,
+)
+
+
+def test_patched_save_writes_imported_ranges(tmp_path, old_shape_file_data, old_shape_file_path):
+    for memory_mapped in (False, True):
+        ea_img = EAImage()
+        ea_img.load_file(str(old_shape_file_path), memory_mapped=memory_mapped)
+        ea_dir = ea_img.dir_entry_list[1]
+        ea_dir.raw_data = b"\xAA" * len(ea_dir.raw_data)
+        ea_dir.entry_import_flag = True
+        palette_entry = ea_dir.bin_attachments_list[0]
+        palette_entry.raw_data = b"\xBB" * len(palette_entry.raw_data)
+        palette_entry.import_flag = True
+        assert [offset for offset, _ in get_dirty_ranges(ea_img)] == [
+            ea_dir.raw_data_offset,
+            palette_entry.raw_data_offset,
+        ]
+
+        expected_data = bytearray(old_shape_file_data)
+        image_offset, image_end_offset = ea_dir.raw_data_offset, ea_dir.raw_data_offset + 64
+        expected_data[image_offset:image_end_offset] = b"\xAA" * 64
+        palette_offset, palette_end_offset = palette_entry.raw_data_offset, palette_entry.raw_data_offset + 1024
+        expected_data[palette_offset:palette_end_offset] = b"\xBB" * 1024
+
+        out_file_path = tmp_path / f"out_{memory_mapped}.fsh"
+        assert save_ea_image_patched(ea_img, str(out_file_path)) == 64 + 1024
+        assert out_file_path.read_bytes() == expected_data
+        ea_img.close()
+
+    assert sorted(os.listdir(tmp_path)) == ["out_False.fsh", "out_True.fsh", "test.fsh"]
+
+
+def test_failed_save_keeps_output_file(tmp_path, old_shape_file_data, old_shape_file_path, old_shape_ea_image):
+    ea_img: EAImage = old_shape_ea_image
+    ea_dir = ea_img.dir_entry_list[1]
+    ea_dir.raw_data = b"\xAA" * 4096  # doesn't fit in file
+    ea_dir.entry_import_flag = True
+
+    with pytest.raises(Exception):
+        save_ea_image_patched(ea_img, str(old_shape_file_path))
+    assert old_shape_file_path.read_bytes() == old_shape_file_data
+    assert os.listdir(tmp_path) == ["test.fsh"]
+
+
+def test_rebuilt_save_moves_entries_after_bigger_data(
+    tmp_path, old_shape_file_data, old_shape_file_path, old_shape_ea_image
+):
+    ea_img: EAImage = old_shape_ea_image
+    bigger_data: bytes = bytes(range(256)) * 2 + b"\xCC" * 100
+    ea_img.dir_entry_list[0].raw_data = bigger_data
+    ea_img.dir_entry_list[0].entry_import_flag = True
+    palette_entry = ea_img.dir_entry_list[1].bin_attachments_list[0]
+    palette_entry.raw_data = b"\xBB" * 1024
+    palette_entry.import_flag = True
+    assert is_rebuild_needed(ea_img)
+
+    out_file_path = tmp_path / "out.fsh"
+    rebuilt_size: int = save_ea_image(ea_img, str(out_file_path))
+    ea_img.close()
+
+    # 356 bytes are added and 4 bytes of padding keep 8-byte alignment of the next entry
+    assert rebuilt_size == len(old_shape_file_data) + 360
+    rebuilt_img = EAImage()
+    assert rebuilt_img.load_file(str(out_file_path))[0] == "OK"
+    assert rebuilt_img.total_f_size == rebuilt_size
+    assert [ea_dir.start_offset for ea_dir in rebuilt_img.dir_entry_list] == [40, 312 + 360]
+    assert bytes(rebuilt_img.dir_entry_list[0].raw_data)[: len(bigger_data)] == bigger_data
+    assert bytes(rebuilt_img.dir_entry_list[1].raw_data) == bytes(range(64))
+    assert bytes(rebuilt_img.dir_entry_list[1].bin_attachments_list[0].raw_data) == b"\xBB" * 1024
+    rebuilt_img.close()
+
+
+def test_rebuilt_new_shape_save_updates_sizes(tmp_path, new_shape_file_data, new_shape_file_path):
+    ea_img = EAImage()
+    assert ea_img.load_file(str(new_shape_file_path))[0] == "OK"
+    assert [ea_dir.start_offset for ea_dir in ea_img.dir_entry_list] == [48, 336]
+    ea_img.dir_entry_list[0].raw_data = bytes(range(256)) + b"\xCC" * 100
+    ea_img.dir_entry_list[0].entry_import_flag = True
+    ea_img.dir_entry_list[1].raw_data = bytes(range(64)) + b"\xDD" * 40
+    ea_img.dir_entry_list[1].entry_import_flag = True
+
+    out_file_path = tmp_path / "out.fsh"
+    rebuilt_size: int = save_ea_image(ea_img, str(out_file_path))
+    ea_img.close()
+
+    # 100 + 12 bytes of padding after first entry and 40 + 8 bytes of padding at the end keep 16-byte alignment
+    assert rebuilt_size == len(new_shape_file_data) + 160
+    rebuilt_data: bytes = out_file_path.read_bytes()
+    assert len(rebuilt_data) == rebuilt_size
+    assert struct.unpack_from("<L", rebuilt_data, 4)[0] == rebuilt_size
+    assert struct.unpack_from(">LL", rebuilt_data, 16) == (48, 288 + 112)  # TOC entry: offset, size
+    assert struct.unpack_from(">LL", rebuilt_data, 29) == (448, 1152 + 48)
+    assert struct.unpack_from("<4I", rebuilt_data, 48) == (5, 0, 32, 356)  # no next block, data size
+    assert struct.unpack_from("<4I", rebuilt_data, 448) == (2, 32 + 104, 32, 104)
+    assert struct.unpack_from("<4I", rebuilt_data, 448 + 136) == (33, 0, 32, 1024)
+    assert rebuilt_data[436:448] == bytes(12)
+    assert rebuilt_data[-8:] == bytes(8)
+
+    rebuilt_img = EAImage()
+    assert rebuilt_img.load_file(str(out_file_path))[0] == "OK"
+    assert bytes(rebuilt_img.dir_entry_list[0].raw_data)[:356] == bytes(range(256)) + b"\xCC" * 100
+    assert bytes(rebuilt_img.dir_entry_list[1].raw_data) == bytes(range(64)) + b"\xDD" * 40
+    palette_entry = rebuilt_img.dir_entry_list[1].bin_attachments_list[0]
+    assert bytes(palette_entry.raw_data)[:1024] == bytes(255 - (i % 256) for i in range(1024))
+    rebuilt_img.close()
+
+
+def test_save_over_memory_mapped_source_file(old_shape_file_path, monkeypatch):
+    ea_img = EAImage()
+    ea_img.load_file(str(old_shape_file_path), memory_mapped=True)
+    rgba_data: bytes = bytes(ea_img.get_img_convert_data(ea_img.dir_entry_list[0]))
+    ea_dir = ea_img.dir_entry_list[1]
+    ea_dir.raw_data = b"\xAA" * len(ea_dir.raw_data)
+    ea_dir.entry_import_flag = True
+
+    replace_file = os.replace
+
+    def _windows_replace(source_path, target_path):
+        if ea_img.file_mapping is not None:  # like on Windows, mapped file can't be replaced
+            raise PermissionError(f"File is mapped: {target_path}")
+        replace_file(source_path, target_path)
+
+    monkeypatch.setattr("src.EA_Image.ea_image_writer.os.replace", _windows_replace)
+    save_ea_image(ea_img, str(old_shape_file_path))
+    assert ea_img.file_mapping is None and not ea_img.is_memory_mapped
+    assert ea_img.get_img_convert_data(ea_img.dir_entry_list[0]) == rgba_data
+
+    ea_img.invalidate_img_convert_data(ea_img.dir_entry_list[0])
+    assert ea_img.get_img_convert_data(ea_img.dir_entry_list[0]) == rgba_data  # data is still readable
+    assert bytes(ea_img.dir_entry_list[1].raw_data) == b"\xAA" * 64
+    ea_img.close()
+
+    saved_ea_img = EAImage()
+    saved_ea_img.load_file(str(old_shape_file_path))
+    assert bytes(saved_ea_img.dir_entry_list[1].raw_data) == b"\xAA" * 64
@@ -0,0 +1,83 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import struct
+
+import numpy as np
+
+from src.EA_Image.dto import PaletteInfoDTO
+from src.EA_Image.ea_image_decoder import decode_image_data_by_entry_type
+from src.EA_Image.ea_image_main import EAImage
+from src.EA_Image.mip_levels import (
+    get_mip_level_layout,
+    get_smallest_mip_level_for_size,
+)
+
+
+def _get_level_ranges(mip_levels: list) -> list:
+    return [
+        (mip_level.img_width, mip_level.img_height, mip_level.data_offset, mip_level.data_size)
+        for mip_level in mip_levels
+    ]
+
+
+def test_mip_level_layout():
+    # BC1 blocks (levels smaller than 4x4 still use one block)
+    assert _get_level_ranges(get_mip_level_layout(96 | 0x80, 16, 8, 3, "SHPX", False)) == [
+        (16, 8, 0, 64),
+        (8, 4, 64, 16),
+        (4, 2, 80, 8),
+        (2, 1, 88, 8),
+    ]
+    # inline palette is stored before the first level
+    assert _get_level_ranges(get_mip_level_layout(115, 16, 16, 1, "SHPI", False)) == [
+        (16, 16, 1024, 256),
+        (8, 8, 1280, 64),
+    ]
+    # PSP rows are aligned to 16 bytes
+    assert _get_level_ranges(get_mip_level_layout(2, 24, 8, 1, "SHPM", False)) == [
+        (24, 8, 0, 256),
+        (12, 4, 256, 64),
+    ]
+    # type without mipmaps support and header with too many mipmaps
+    assert len(get_mip_level_layout(30, 64, 64, 4, "SHPG", False)) == 1
+    assert len(get_mip_level_layout(5, 4, 4, 5, "SHPI", False)) == 3
+
+    mip_levels: list = get_mip_level_layout(5, 2048, 1024, 4, "SHPI", False)
+    assert get_smallest_mip_level_for_size(mip_levels, 420, 420) == 2  # 512x256 is the smallest level >= 420x210
+    assert get_smallest_mip_level_for_size(mip_levels, 4096, 4096) == 0
+
+
+def test_mip_levels_are_decoded_lazily(tmp_path):
+    levels_data: list = [np.random.default_rng(i).bytes(size * size * 4) for i, size in enumerate((16, 8, 4))]
+    file_data = bytearray(b"SHPI" + struct.pack("<LL", 0, 1) + b"G354" + struct.pack("<4sL", b"img0", 24))
+    file_data += struct.pack("<I", (16 + 1344) << 8 | 5) + struct.pack("<HHhhHH", 16, 16, 0, 0, 0, 2 << 12)
+    file_data += b"".join(levels_data)
+    struct.pack_into("<L", file_data, 4, len(file_data))
+    file_path = tmp_path / "test.fsh"
+    file_path.write_bytes(file_data)
+
+    ea_img = EAImage()
+    ea_img.load_file(str(file_path), memory_mapped=True)
+    ea_dir = ea_img.dir_entry_list[0]
+    assert [mip_level.data_offset for mip_level in ea_dir.get_mip_levels(ea_img.sign)] == [0, 1024, 1280]
+
+    palette_info_dto = PaletteInfoDTO(entry_id=0, data=b"", swizzle_flag=False)
+    for level, size in ((2, 4), (1, 8)):
+        expected_data: bytes = decode_image_data_by_entry_type(
+            5, levels_data[level], palette_info_dto, size, size, False
+        )
+        assert ea_img.get_mip_level_data(ea_dir, level) == expected_data
+        assert ea_img.decode_cache.get((ea_dir, level)) == expected_data
+    assert ea_img.get_mip_level_data(ea_dir, 3) is None
+    assert ea_dir.img_convert_data is None and ea_img.decode_cache.get(ea_dir) is None  # main image is not decoded
+
+    preview_data, preview_width, preview_height = ea_img.get_preview_image_data(ea_dir, 8, 8)
+    assert (preview_width, preview_height) == (8, 8)
+    assert preview_data == ea_img.get_mip_level_data(ea_dir, 1)
+
+    ea_img.invalidate_img_convert_data(ea_dir)
+    assert ea_img.decode_cache.get((ea_dir, 1)) is None
+    ea_img.close()
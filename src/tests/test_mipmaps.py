@@ -0,0 +1,60 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import numpy as np
+import PIL.Image
+from reversebox.image.swizzling.swizzle_morton import swizzle_morton
+
+from src.EA_Image.dto import EncodeJobDTO, EncodeOptionsDTO, PaletteInfoDTO
+from src.EA_Image.ea_image_encoder import encode_ea_image_job
+from src.EA_Image.mipmaps import generate_mipmap_pyramid, get_mipmap_sizes
+
+
+def test_mipmap_pyramid_matches_pillow():
+    pixels: np.ndarray = np.random.default_rng(0).integers(0, 256, size=(16, 32, 4), dtype=np.uint8)
+    pixels[..., 3] = 255
+    base_image = PIL.Image.fromarray(pixels, "RGBA")
+    assert get_mipmap_sizes(32, 16, 2) == [(32, 16), (16, 8), (8, 4)]
+
+    # nearest neighbour is the same as in Pillow, box filter is the same up to rounding
+    mipmaps_data: list = generate_mipmap_pyramid(pixels.tobytes(), 32, 16, 2, PIL.Image.Resampling.NEAREST)
+    assert [bytes(mipmap_data) for mipmap_data in mipmaps_data] == [
+        base_image.resize((16, 8), PIL.Image.Resampling.NEAREST).tobytes(),
+        base_image.resize((8, 4), PIL.Image.Resampling.NEAREST).tobytes(),
+    ]
+    mipmaps_data = generate_mipmap_pyramid(pixels.tobytes(), 32, 16, 2, PIL.Image.Resampling.BOX)
+    for mipmap_data, mipmap_size in zip(mipmaps_data, ((16, 8), (8, 4))):
+        expected_data: bytes = base_image.resize(mipmap_size, PIL.Image.Resampling.BOX).tobytes()
+        difference: np.ndarray = np.frombuffer(mipmap_data, np.uint8).astype(int) - np.frombuffer(
+            expected_data, np.uint8
+        )
+        assert np.abs(difference).max() <= 1
+
+
+def test_all_mipmap_levels_are_swizzled():
+    rgba8888_data: bytes = bytes(np.random.default_rng(1).integers(0, 256, size=32 * 32 * 4, dtype=np.uint8))
+    encode_job = EncodeJobDTO(
+        entry_type=125,  # BGRA8888
+        img_width=32,
+        img_height=32,
+        img_bpp=32,
+        mipmaps_count=2,
+        is_swizzled=False,
+        ea_img_signature="ShpX",
+        palette_info_dto=PaletteInfoDTO(entry_id=0, data=b"", swizzle_flag=False),
+        raw_data_size=(32 * 32 + 16 * 16 + 8 * 8) * 4,
+        encode_options=EncodeOptionsDTO(mipmaps_resampling_type_str="box"),
+    )
+    linear_data: bytes = encode_ea_image_job(rgba8888_data, encode_job).encoded_img_data
+
+    encode_job.is_swizzled = True
+    swizzled_data: bytes = encode_ea_image_job(rgba8888_data, encode_job).encoded_img_data
+    expected_data: bytes = b""
+    level_offset: int = 0
+    for mip_width, mip_height in get_mipmap_sizes(32, 32, 2):
+        level_end_offset: int = level_offset + mip_width * mip_height * 4
+        expected_data += swizzle_morton(linear_data[level_offset:level_end_offset], mip_width, mip_height, 32)
+        level_offset = level_end_offset
+    assert swizzled_data == expected_data
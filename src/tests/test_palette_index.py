@@ -0,0 +1,29 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from src.EA_Image import common_ea_dir
+from src.EA_Image.ea_image_main import EAImage
+
+
+def test_shared_palette_is_resolved_once(shared_palette_ea_image_factory, monkeypatch):
+    ea_img: EAImage = shared_palette_ea_image_factory(50)
+
+    resolve_calls: list = []
+    get_shared_palette_info_dto = common_ea_dir.get_shared_palette_info_dto
+
+    def _counting_get_shared_palette_info_dto(dir_entry_list):
+        resolve_calls.append(1)
+        return get_shared_palette_info_dto(dir_entry_list)
+
+    monkeypatch.setattr("src.EA_Image.ea_image_main.get_shared_palette_info_dto", _counting_get_shared_palette_info_dto)
+    palettes: list = [ea_img.get_palette_info_dto(ea_dir) for ea_dir in ea_img.dir_entry_list[1:]]
+    assert len(resolve_calls) == 1
+    assert all(palette_info_dto is palettes[0] for palette_info_dto in palettes)
+    assert palettes[0].data == bytes(i % 256 for i in range(1024))
+
+    ea_img.dir_entry_list[0].raw_data = b"\x01" * 1024  # e.g. palette import
+    ea_img.invalidate_palette_index()
+    assert ea_img.get_palette_info_dto(ea_img.dir_entry_list[1]).data == b"\x01" * 1024
+    assert len(resolve_calls) == 2
@@ -0,0 +1,112 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import numpy as np
+from reversebox.image.image_decoder import ImageDecoder
+from reversebox.image.image_formats import ImageFormats
+
+from src.EA_Image import palette_lut
+from src.EA_Image.dto import PaletteInfoDTO
+from src.EA_Image.ea_image_decoder import (
+    decode_ea_image_job,
+    decode_image_data_by_entry_type,
+)
+from src.EA_Image.ea_image_main import EAImage
+from src.EA_Image.palette_lut import (
+    decode_indexed_image_with_lut,
+    get_palette_rgba8888_lut,
+)
+
+
+def test_palette_lut_decode_matches_reversebox():
+    random_generator = np.random.default_rng(0)
+    image_decoder = ImageDecoder()
+    for palette_format, palette_size in (
+        (ImageFormats.RGBA8888, 1024),
+        (ImageFormats.RGB565, 512),
+        (ImageFormats.N64_BGR5A3, 512),
+        (ImageFormats.IA_X2_ARGB, 1024),
+    ):
+        palette_info_dto = PaletteInfoDTO(entry_id=0, data=random_generator.bytes(palette_size), swizzle_flag=False)
+        for image_format, image_endianess in (
+            (ImageFormats.PAL8, "little"),
+            (ImageFormats.PAL4, "little"),
+            (ImageFormats.PAL4, "big"),
+        ):
+            for palette_endianess in ("little", "big"):
+                image_data: bytes = random_generator.bytes(24 * 10)
+                expected_data: bytes = image_decoder.decode_indexed_image(
+                    image_data,
+                    palette_info_dto.data,
+                    24,
+                    10,
+                    image_format,
+                    palette_format,
+                    image_endianess,
+                    palette_endianess,
+                )
+                lut: np.ndarray = get_palette_rgba8888_lut(palette_info_dto, palette_format, palette_endianess)
+                converted_data: bytes = decode_indexed_image_with_lut(
+                    image_data, lut, 24, 10, image_format, image_endianess
+                )
+                assert converted_data == bytes(expected_data), (palette_format, image_format, image_endianess)
+
+
+def test_gst_and_inline_palette_types_use_lut():
+    random_generator = np.random.default_rng(1)
+    image_decoder = ImageDecoder()
+    palette_info_dto = PaletteInfoDTO(entry_id=33, data=random_generator.bytes(1024), swizzle_flag=False)
+    image_data: bytes = random_generator.bytes(32 * 32)
+    expected_data: bytes = image_decoder.decode_gst_image(
+        image_data, palette_info_dto.data, 32, 32, ImageFormats.GST121, ImageFormats.PAL8, ImageFormats.RGBA8888, True
+    )
+    assert decode_image_data_by_entry_type(8, image_data, palette_info_dto, 32, 32, True) == bytes(expected_data)
+
+    image_data = random_generator.bytes(64 + 16 * 16 // 2)  # type 119: PAL4 with 16 colors palette before image
+    expected_data = image_decoder.decode_indexed_image(
+        image_data[64:], image_data[:64], 16, 16, ImageFormats.PAL4, ImageFormats.RGBA8888, "big"
+    )
+    assert decode_image_data_by_entry_type(119, image_data, palette_info_dto, 16, 16, False) == bytes(expected_data)
+
+
+def test_shared_palette_is_converted_once(shared_palette_ea_image_factory, monkeypatch):
+    ea_img: EAImage = shared_palette_ea_image_factory(20)
+
+    conversion_calls: list = []
+    decode_palette_to_rgba8888 = palette_lut.decode_palette_to_rgba8888
+
+    def _counting_decode_palette_to_rgba8888(*args):
+        conversion_calls.append(1)
+        return decode_palette_to_rgba8888(*args)
+
+    monkeypatch.setattr(palette_lut, "decode_palette_to_rgba8888", _counting_decode_palette_to_rgba8888)
+    for i, ea_dir in enumerate(ea_img.dir_entry_list[1:]):
+        img_convert_data: bytes = decode_ea_image_job(ea_img.get_decode_job(ea_dir, ea_dir.h_record_id))
+        assert img_convert_data == bytes(i % 256 for i in range(i * 4, i * 4 + 4)) * 64
+    assert len(conversion_calls) == 1
+
+
+def test_palette_change_is_rendered_from_index_plane(shared_palette_ea_image_factory, monkeypatch):
+    ea_img: EAImage = shared_palette_ea_image_factory(3)
+    ea_img.keep_index_planes = True
+    ea_dir = ea_img.dir_entry_list[2]
+
+    def _failing_decode(*args):
+        raise Exception("Image shouldn't be decoded again!")
+
+    # RGBA data is rendered from index plane, indices are not unpacked again by decoder
+    monkeypatch.setattr("src.EA_Image.ea_image_decoder.decode_image_data_by_entry_type", _failing_decode)
+    assert ea_img.get_img_convert_data(ea_dir) == bytes([4, 5, 6, 7]) * 64
+    assert ea_dir.index_plane == bytes([1]) * 64
+
+    monkeypatch.setattr("src.EA_Image.ea_image_main.decode_ea_image_job", _failing_decode)
+    monkeypatch.setattr("src.EA_Image.ea_image_main.decode_ea_image_job_with_index_plane", _failing_decode)
+    ea_img.dir_entry_list[0].raw_data = bytes(range(255, -1, -1)) * 4  # palette change
+    ea_img.invalidate_palette_index()
+    ea_img.invalidate_img_convert_data(ea_dir, keep_index_plane=True)
+    assert ea_img.get_img_convert_data(ea_dir) == bytes([251, 250, 249, 248]) * 64
+
+    team_palette_info_dto = PaletteInfoDTO(entry_id=33, data=bytes([9, 8, 7, 6]) * 256, swizzle_flag=False)
+    assert ea_img.render_image_with_palette(ea_dir, team_palette_info_dto) == bytes([9, 8, 7, 6]) * 64
@@ -0,0 +1,92 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from reversebox.image.image_decoder import ImageDecoder
+from reversebox.image.image_formats import ImageFormats
+
+from src.EA_Image import palette_quantizer
+from src.EA_Image.dto import EncodeJobDTO, EncodeOptionsDTO, PaletteInfoDTO
+from src.EA_Image.ea_image_encoder import encode_ea_image_job
+from src.EA_Image.palette_quantizer import (
+    clear_quantize_cache,
+    encode_indexed_image,
+    quantize_rgba8888_data,
+)
+
+
+def test_existing_palette_is_reused_and_result_is_cached(monkeypatch):
+    clear_quantize_cache()
+    palette_data: bytes = bytes(range(256)) * 4  # RGBA8888 palette with 256 colors
+    rgba8888_data: bytes = palette_data[40:44] * 8 + palette_data[200:204] * 8  # 16 pixels, colors 10 and 50
+
+    image_data, encoded_palette_data = encode_indexed_image(
+        rgba8888_data, 4, 4, ImageFormats.PAL8, ImageFormats.RGBA8888, 256, existing_palette_data=palette_data
+    )
+    assert encoded_palette_data == palette_data
+    assert image_data == bytes([10] * 8 + [50] * 8)
+
+    # without existing palette image is still lossless, but palette contains only used colors
+    image_data, encoded_palette_data = encode_indexed_image(
+        rgba8888_data, 4, 4, ImageFormats.PAL4, ImageFormats.RGBA8888, 16, number_of_mipmaps=1
+    )
+    assert len(image_data) == 8 + 2 and len(encoded_palette_data) == 64
+    decoded_data: bytes = ImageDecoder().decode_indexed_image(
+        image_data[:8], encoded_palette_data, 4, 4, ImageFormats.PAL4, ImageFormats.RGBA8888
+    )
+    assert decoded_data == rgba8888_data
+
+    def _histogram_not_expected(rgba8888_data):
+        raise AssertionError("Cached result should be used!")
+
+    monkeypatch.setattr(palette_quantizer, "get_color_histogram", _histogram_not_expected)
+    assert quantize_rgba8888_data(rgba8888_data, 16)[1] == encoded_palette_data[:8]
+
+
+def test_quantized_palette_is_close_to_image_colors():
+    clear_quantize_cache()
+    random_generator = np.random.default_rng(0)
+    color_groups: np.ndarray = random_generator.integers(0, 256, size=(8, 4))
+    pixels: np.ndarray = color_groups[random_generator.integers(0, 8, size=64 * 64)]
+    pixels = np.clip(pixels + random_generator.integers(-3, 4, size=pixels.shape), 0, 255).astype(np.uint8)
+
+    palette_indices, palette_rgba8888_data = quantize_rgba8888_data(pixels.tobytes(), 16)
+    palette: np.ndarray = np.frombuffer(palette_rgba8888_data, dtype=np.uint8).reshape(-1, 4)
+    assert len(palette) <= 16
+    assert np.abs(palette[palette_indices].astype(int) - pixels).max() <= 6
+
+
+def test_encode_options_are_used_in_worker_process():
+    clear_quantize_cache()
+    gradient_values: np.ndarray = np.tile(np.arange(0, 256, 4, dtype=np.uint8), (16, 1))  # 64x16 gray gradient
+    pixels: np.ndarray = np.stack([gradient_values] * 3 + [np.full_like(gradient_values, 255)], axis=-1)
+    encode_job = EncodeJobDTO(
+        entry_type=1,  # PAL4
+        img_width=64,
+        img_height=16,
+        img_bpp=4,
+        mipmaps_count=0,
+        is_swizzled=False,
+        ea_img_signature="SHPI",
+        palette_info_dto=PaletteInfoDTO(entry_id=33, data=b"", swizzle_flag=False),
+        raw_data_size=64 * 16 // 2,
+    )
+    column_errors: list = []
+    for palette_dithering in (False, True):
+        encode_job.encode_options = EncodeOptionsDTO(
+            palette_quantizer="median_cut", palette_dithering=palette_dithering
+        )
+        with ProcessPoolExecutor(max_workers=1) as executor:  # job and options can be sent to worker process
+            encode_info_dto = executor.submit(encode_ea_image_job, pixels.tobytes(), encode_job).result()
+
+        # with 16 colors, dithering keeps average color of each column closer to the original
+        palette: np.ndarray = np.frombuffer(encode_info_dto.encoded_palette_data, dtype=np.uint8).reshape(-1, 4)
+        packed_indices: np.ndarray = np.frombuffer(encode_info_dto.encoded_img_data, dtype=np.uint8)
+        decoded_pixels: np.ndarray = palette[np.stack([packed_indices & 0x0F, packed_indices >> 4], axis=1).reshape(-1)]
+        column_means: np.ndarray = decoded_pixels[:, 0].reshape(16, 64).mean(axis=0)
+        column_errors.append(np.abs(column_means - gradient_values[0]).mean())
+    assert column_errors[1] < column_errors[0]
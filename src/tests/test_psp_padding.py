@@ -0,0 +1,52 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import numpy as np
+from reversebox.image.image_padding import psp_image_padding
+
+from src.EA_Image.dto import EncodeJobDTO, PaletteInfoDTO
+from src.EA_Image.ea_image_encoder import encode_ea_image_job
+from src.EA_Image.psp_padding import (
+    add_psp_padding,
+    get_psp_row_layout,
+    remove_psp_padding,
+)
+
+
+def test_psp_padding_removal_matches_reversebox():
+    random_generator = np.random.default_rng(0)
+    for bpp in (4, 8, 16, 32):
+        for img_width, img_height in ((64, 16), (20, 9), (6, 3)):
+            _, padded_row_size = get_psp_row_layout(img_width, bpp)
+            padded_data: bytes = random_generator.bytes(padded_row_size * img_height)
+            image_data: bytes = remove_psp_padding(padded_data, img_width, img_height, bpp)
+            assert image_data == bytes(psp_image_padding(padded_data, img_width, img_height, bpp))
+            assert (
+                remove_psp_padding(add_psp_padding(image_data, img_width, img_height, bpp), img_width, img_height, bpp)
+                == image_data
+            )
+
+
+def test_psp_padding_is_added_on_import():
+    rgba8888_data: bytes = bytes(range(6 * 3 * 4))
+    encode_job = EncodeJobDTO(
+        entry_type=5,  # RGBA8888, one row is 24 bytes (padded to 32)
+        img_width=6,
+        img_height=3,
+        img_bpp=32,
+        mipmaps_count=0,
+        is_swizzled=False,
+        ea_img_signature="SHPM",
+        palette_info_dto=PaletteInfoDTO(entry_id=0, data=b"", swizzle_flag=False),
+        raw_data_size=32 * 3,
+    )
+    image_data: bytes = encode_ea_image_job(rgba8888_data, encode_job).encoded_img_data
+    encode_job.ea_img_signature = "SHPI"
+    expected_rows: np.ndarray = np.frombuffer(
+        encode_ea_image_job(rgba8888_data, encode_job).encoded_img_data, dtype=np.uint8, count=24 * 3
+    ).reshape(3, 24)
+    padded_rows: np.ndarray = np.frombuffer(image_data, dtype=np.uint8).reshape(3, 32)
+    assert (padded_rows[:, :24] == expected_rows).all()
+    assert not padded_rows[:, 24:].any()
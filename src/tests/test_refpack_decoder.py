@@ -0,0 +1,53 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import pytest
+
+from src.EA_Image.ea_image_main import EAImage
+from src.EA_Image.refpack_decoder import decompress_refpack_data
+
+
+def encode_refpack_literals(in_data: bytes) -> bytes:
+    # simplest valid refpack stream, literal commands only
+    out_data = bytearray(b"\x10\xFB" + len(in_data).to_bytes(3, "big"))
+    position: int = 0
+    while len(in_data) - position >= 4:
+        literal_length: int = min(112, (len(in_data) - position) // 4 * 4)
+        end_position: int = position + literal_length
+        out_data.append(0xE0 + (literal_length - 4) // 4)
+        out_data += in_data[position:end_position]
+        position = end_position
+    out_data.append(0xFC + len(in_data) - position)
+    out_data += in_data[position:]
+    return bytes(out_data)
+
+
+def test_decompress_all_command_types():
+    compressed_data: bytes = (
+        b"\x10\xFB\x00\x00\x16"  # header, uncompressed size = 22
+        + b"\xE0abcd"  # 4 literal bytes
+        + b"\x09\x03x"  # 2-byte command: 1 literal byte, copy 5 bytes from offset 4 (overlapping)
+        + b"\x81\x40\x00z"  # 3-byte command: 1 literal byte, copy 5 bytes from offset 1 (overlapping)
+        + b"\xC0\x00\x09\x00"  # 4-byte command: copy 5 bytes from offset 10
+        + b"\xFD!"  # end of stream with 1 literal byte
+    )
+    assert bytes(decompress_refpack_data(compressed_data)) == b"abcdx" + b"bcdxb" + b"z" + b"zzzzz" + b"cdxbz" + b"!"
+
+
+def test_corrupted_data_raises_error():
+    with pytest.raises(Exception):
+        decompress_refpack_data(b"\x10\xFB\x00\x00\x10\xE0ab")
+
+
+def test_compressed_file_loading(tmp_path, old_shape_file_data):
+    file_path = tmp_path / "test.qfs"
+    file_path.write_bytes(encode_refpack_literals(old_shape_file_data))
+
+    ea_img = EAImage()
+    assert ea_img.load_file(str(file_path))[0] == "OK"
+    assert ea_img.is_total_f_data_compressed
+    assert bytes(ea_img.total_f_data) == old_shape_file_data
+    assert [ea_dir.tag for ea_dir in ea_img.dir_entry_list] == ["img0", "img1"]
+    ea_img.close()
@@ -0,0 +1,40 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import numpy as np
+
+from src.EA_Image import refpack_encoder
+from src.EA_Image.refpack_decoder import decompress_refpack_data
+from src.EA_Image.refpack_encoder import compress_refpack_data
+
+
+def _get_test_data() -> bytes:
+    random_generator = np.random.default_rng(0)
+    image_rows: bytes = np.repeat(random_generator.integers(0, 8, size=(64, 32), dtype=np.uint8), 4, axis=1).tobytes()
+    return b"SHPS" + bytes(5000) + image_rows * 3 + random_generator.bytes(3000) + b"end"
+
+
+def test_refpack_compression_levels():
+    data: bytes = _get_test_data()
+    compressed_sizes: list = []
+    for compression_level in ("fast", "normal", "best"):
+        compressed_data: bytes = compress_refpack_data(data, compression_level)
+        assert compressed_data[:5] == b"\x10\xFB" + len(data).to_bytes(3, "big")
+        assert bytes(decompress_refpack_data(compressed_data)) == data
+        compressed_sizes.append(len(compressed_data))
+    assert compressed_sizes[0] >= compressed_sizes[1] >= compressed_sizes[2]
+    assert bytes(decompress_refpack_data(compress_refpack_data(b"ab"))) == b"ab"
+
+
+def test_refpack_chunks_reference_previous_data(monkeypatch):
+    monkeypatch.setattr(refpack_encoder, "REFPACK_COMPRESSION_CHUNK_SIZE", 4096)
+    data: bytes = _get_test_data()
+    compressed_data: bytes = compress_refpack_data(data, "normal")
+    assert bytes(decompress_refpack_data(compressed_data)) == data
+    assert compress_refpack_data(data, "normal", max_workers=2) == compressed_data
+
+    # repeated part of data is found in previous chunks
+    monkeypatch.setattr(refpack_encoder, "REFPACK_COMPRESSION_CHUNK_SIZE", 1024 * 1024)
+    assert len(compressed_data) <= len(compress_refpack_data(data, "normal")) + 64
@@ -0,0 +1,58 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import numpy as np
+from reversebox.image.common import get_stride_value_psp
+
+from src.EA_Image import swizzle_plan
+from src.EA_Image.swizzle_plan import (
+    SwizzlePlanCache,
+    convert_swizzle,
+    reversebox_swizzle_functions,
+)
+
+
+def _get_image_data_length(swizzle_kind: str, img_width: int, img_height: int, bpp: int, swizzle_flag: bool) -> int:
+    if swizzle_kind == "psp" and not swizzle_flag:
+        return get_stride_value_psp(img_width, bpp) * ((img_height + 7) & ~7)
+    return img_width * img_height * bpp // 8
+
+
+def test_swizzle_plans_match_reversebox(monkeypatch):
+    monkeypatch.setattr(swizzle_plan, "swizzle_plan_cache", SwizzlePlanCache())
+    random_generator = np.random.default_rng(0)
+    for swizzle_kind, bpps in (
+        ("morton", (4, 8, 16, 24, 32)),
+        ("psp", (4, 8, 16, 32)),
+        ("ps2", (4, 8, 16)),
+        ("gamecube", (4, 8, 16, 32)),
+    ):
+        for bpp in bpps:
+            for img_width, img_height in ((32, 32), (128, 64), (256, 128), (24, 20), (1, 1)):
+                for swizzle_flag in (False, True):
+                    data_length: int = _get_image_data_length(swizzle_kind, img_width, img_height, bpp, swizzle_flag)
+                    image_data: bytes = random_generator.bytes(data_length)
+                    reversebox_function = reversebox_swizzle_functions[swizzle_kind][int(swizzle_flag)]
+                    try:
+                        expected_data = bytes(reversebox_function(image_data, img_width, img_height, bpp))
+                    except Exception:
+                        continue  # e.g. PS2 4-bit swizzle of small images
+                    for _ in range(3):  # next calls use cached plan
+                        converted_data: bytes = convert_swizzle(
+                            image_data, swizzle_kind, img_width, img_height, bpp, swizzle_flag
+                        )
+                        assert converted_data == expected_data, (swizzle_kind, bpp, img_width, img_height)
+
+
+def test_swizzle_plan_cache_evicts_least_recently_used_plans(monkeypatch):
+    swizzle_plan_cache = SwizzlePlanCache(byte_budget=2 * 64 * 64 * 4)  # two 64x64 8-bit plans
+    monkeypatch.setattr(swizzle_plan, "swizzle_plan_cache", swizzle_plan_cache)
+    image_data: bytes = bytes(64 * 64)
+    convert_swizzle(image_data, "ps2", 64, 64, 8, False)
+    convert_swizzle(image_data, "ps2", 64, 64, 8, True)
+    convert_swizzle(image_data, "ps2", 64, 64, 8, False)
+    convert_swizzle(image_data, "gamecube", 64, 64, 8, False)
+    assert list(swizzle_plan_cache.entries) == [("ps2", 64, 64, 8, 4096, False), ("gamecube", 64, 64, 8, 4096, False)]
+    assert swizzle_plan_cache.current_size == 2 * 64 * 64 * 4